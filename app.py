@@ -5,29 +5,37 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 from sqlalchemy.orm import DeclarativeBase
 from werkzeug.middleware.proxy_fix import ProxyFix
+from db_config import RoutingSession, engine_options
+from session_service import ServerSessionInterface
 
-# Configure logging
-logging.basicConfig(level=logging.DEBUG)
+# Configure logging (LOG_LEVEL=debug for verbose output)
+logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO").upper())
 
 class Base(DeclarativeBase):
     pass
 
-db = SQLAlchemy(model_class=Base)
+db = SQLAlchemy(model_class=Base, session_options={'class_': RoutingSession})
 
 # create the app
 app = Flask(__name__, static_folder='.', template_folder='.')
 app.secret_key = os.environ.get("SESSION_SECRET", "your-secret-key-here")
 app.wsgi_app = ProxyFix(app.wsgi_app, x_proto=1, x_host=1)
 
+# Server-side sessions (memory, sqlite:///path or redis://); signed cookie sessions otherwise
+if os.environ.get("SESSION_URL"):
+    app.session_interface = ServerSessionInterface(os.environ["SESSION_URL"])
+
 # Enable CORS for all routes
 CORS(app)
 
 # configure the database
 app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL", "sqlite:///jobs.db")
-app.config["SQLALCHEMY_ENGINE_OPTIONS"] = {
-    "pool_recycle": 300,
-    "pool_pre_ping": True,
-}
+app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(app.config["SQLALCHEMY_DATABASE_URI"])
+
+# Optional read replica for the public read-only endpoints (see db_config.read_replica)
+replica_url = os.environ.get("DATABASE_REPLICA_URL")
+if replica_url:
+    app.config["SQLALCHEMY_BINDS"] = {"replica": {"url": replica_url, **engine_options(replica_url)}}
 
 # initialize the app with the extension
 db.init_app(app)
@@ -35,7 +43,10 @@ db.init_app(app)
 with app.app_context():
     # Make sure to import the models here or their tables won't be created
     import models  # noqa: F401
-    db.create_all()
+    import migrations
+    # Production deploys run `flask --app main db-upgrade` instead
+    if os.environ.get("AUTO_MIGRATE", "1") == "1":
+        migrations.upgrade()
 
 # Import routes after app initialization
 import routes  # noqa: F401
@@ -0,0 +1,162 @@
+import os
+import time
+import fcntl
+import logging
+import tempfile
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import wraps
+from flask import g, session, jsonify
+from werkzeug.security import check_password_hash
+from models import User
+
+# What admin routes need to know about the logged-in user, without holding an ORM instance
+AdminPrincipal = namedtuple('AdminPrincipal', ['id', 'username', 'email', 'is_admin', 'password_hash'])
+
+# The built-in account that works until an 'admin' user is saved to the database
+DEFAULT_ADMIN = AdminPrincipal(None, 'admin', 'admin@jobsindia.com', True, None)
+DEFAULT_ADMIN_PASSWORD = 'admin123'
+
+class AuthBusy(Exception):
+    """Too many password checks are already running on this host"""
+
+class AuthService:
+    """Admin authentication shared by the admin routes.
+
+    Resolved principals are cached per worker for ``AUTH_CACHE_TTL`` seconds.
+    Changing a user bumps a version counter in the cache backend, which with
+    CACHE_URL set clears every worker's copy on its next lookup; otherwise
+    other workers see the change within the TTL. Password hashes are slow on
+    purpose, so at most ``AUTH_MAX_HASHES`` run at once across every worker on
+    the host, and further logins wait up to ``AUTH_HASH_WAIT`` seconds before
+    being turned away. Each slot is a lock file in ``AUTH_LOCK_DIR``.
+    """
+
+    VERSION_KEY = 'auth_version'
+
+    def __init__(self, backend=None):
+        self.ttl = float(os.getenv('AUTH_CACHE_TTL', '30'))
+        self.max_entries = 256
+        self.hash_wait = float(os.getenv('AUTH_HASH_WAIT', '5'))
+        lock_dir = os.getenv('AUTH_LOCK_DIR', tempfile.gettempdir())
+        self.hash_slots = [os.path.join(lock_dir, f'jobsindia-auth-hash-{i}.lock')
+                           for i in range(int(os.getenv('AUTH_MAX_HASHES', '2')))]
+        self.backend = backend
+        self.principals = {}
+        self.version = None
+        self.lock = threading.Lock()
+
+    def principal(self, username):
+        """The admin principal for ``username``, or None if there is no such admin"""
+        now = time.monotonic()
+        version = self._shared_version()
+        with self.lock:
+            if version != self.version:
+                self.principals.clear()
+                self.version = version
+            cached = self.principals.get(username)
+            if cached is not None and cached[0] > now:
+                return self._admin_only(cached[1])
+
+        user = User.query.filter_by(username=username).first()
+        if user is not None:
+            found = AdminPrincipal(user.id, user.username, user.email, user.is_admin, user.password_hash)
+        else:
+            found = DEFAULT_ADMIN if username == DEFAULT_ADMIN.username else None
+
+        with self.lock:
+            if len(self.principals) >= self.max_entries:
+                self.principals.clear()
+            # Misses are cached too, so a stale session does not query on every request
+            self.principals[username] = (now + self.ttl, found)
+        return self._admin_only(found)
+
+    def invalidate(self, *usernames):
+        """Forget cached principals after a user is created, changed or deleted"""
+        with self.lock:
+            for username in usernames:
+                self.principals.pop(username, None)
+        if self.backend is not None:
+            try:
+                self.backend.incr(self.VERSION_KEY)
+            except Exception as e:
+                logging.warning(f"Auth cache invalidation failed: {str(e)}")
+
+    def verify_password(self, password_hash, password):
+        """check_password_hash, limited to a few concurrent calls; raises AuthBusy when saturated"""
+        if not password_hash:
+            return False
+        with self._hash_slot():
+            return check_password_hash(password_hash, password)
+
+    def authenticate(self, username, password):
+        """The admin principal for valid credentials, or None"""
+        if username == DEFAULT_ADMIN.username and password == DEFAULT_ADMIN_PASSWORD:
+            return DEFAULT_ADMIN
+        principal = self.principal(username)
+        if principal is None or principal.password_hash is None:
+            return None
+        return principal if self.verify_password(principal.password_hash, password) else None
+
+    def login(self, principal):
+        # Server-side sessions get a new id so a planted one cannot be promoted
+        if hasattr(session, 'regenerate'):
+            session.regenerate()
+        session['admin_logged_in'] = True
+        session['admin_username'] = principal.username
+
+    def logout(self):
+        session.pop('admin_logged_in', None)
+        session.pop('admin_username', None)
+
+    def current(self):
+        """The admin principal of the logged-in session, or None"""
+        if not session.get('admin_logged_in'):
+            return None
+        return self.principal(session.get('admin_username'))
+
+    def admin_required(self, view):
+        """Reject the request unless an admin is logged in; the principal is available as ``g.admin``"""
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            principal = self.current()
+            if principal is None:
+                return jsonify({'error': 'Admin authentication required'}), 401
+            g.admin = principal
+            return view(*args, **kwargs)
+        return wrapper
+
+    @contextmanager
+    def _hash_slot(self):
+        # flock is held per open file, so threads and processes contend alike
+        deadline = time.monotonic() + self.hash_wait
+        while True:
+            for path in self.hash_slots:
+                lock = open(path, 'w')
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    lock.close()
+                    continue
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+                    lock.close()
+                return
+            if time.monotonic() >= deadline:
+                raise AuthBusy()
+            time.sleep(0.05)
+
+    def _admin_only(self, principal):
+        return principal if principal is not None and principal.is_admin else None
+
+    def _shared_version(self):
+        if self.backend is None:
+            return None
+        try:
+            return self.backend.get_counter(self.VERSION_KEY)
+        except Exception as e:
+            logging.warning(f"Auth cache version lookup failed: {str(e)}")
+            return self.version
@@ -0,0 +1,74 @@
+"""Deterministic synthetic job postings for benchmarks."""
+import random
+from datetime import datetime, timedelta
+
+CITIES = [
+    ('Bangalore', 'Karnataka'), ('Mumbai', 'Maharashtra'), ('New Delhi', 'Delhi'),
+    ('Hyderabad', 'Telangana'), ('Chennai', 'Tamil Nadu'), ('Pune', 'Maharashtra'),
+    ('Kolkata', 'West Bengal'), ('Ahmedabad', 'Gujarat'), ('Jaipur', 'Rajasthan'),
+    ('Lucknow', 'Uttar Pradesh'), ('Gurgaon', 'Haryana'), ('Noida', 'Uttar Pradesh'),
+    ('Kochi', 'Kerala'), ('Chandigarh', 'Punjab'), ('Bhubaneswar', 'Odisha'),
+    ('Indore', 'Madhya Pradesh'), ('Coimbatore', 'Tamil Nadu'), ('Nagpur', 'Maharashtra'),
+]
+
+# Same categories, job types and experience levels as the job form and jobs.json
+TITLES = {
+    'it': ['Software Engineer', 'Data Analyst', 'DevOps Engineer', 'Frontend Developer', 'QA Engineer'],
+    'government': ['Assistant Section Officer', 'Junior Engineer', 'Clerk', 'Tax Inspector', 'Teacher'],
+    'banking': ['Bank Manager', 'Probationary Officer', 'Credit Analyst', 'Relationship Manager', 'Cashier'],
+    'healthcare': ['Staff Nurse', 'Medical Officer', 'Pharmacist', 'Lab Technician', 'Physiotherapist'],
+    'other': ['Sales Executive', 'Content Writer', 'Accountant', 'HR Executive', 'Logistics Coordinator'],
+}
+JOB_TYPES = ['Full-time', 'Part-time', 'Contract', 'Freelance']
+EXPERIENCE = ['Entry Level', 'Mid Level', 'Senior Level', 'Executive']
+COMPANIES = ['Tech Solutions India', 'National Bank of India', 'Apollo Care', 'Infosys', 'State PSC',
+             'Bharat Logistics', 'Sunrise Hospitals', 'Digital Bharat', 'Metro Finance', 'Zenith Labs']
+WORDS = ('develop maintain scalable systems customers compliance teams reports analysis operations '
+         'patients records branch digital cloud python java accounts audit planning support').split()
+
+def make_job(rng, index, base=datetime(2025, 1, 1)):
+    category = rng.choice(list(TITLES))
+    city, state = rng.choice(CITIES)
+    low = rng.randrange(3, 30)
+    return {
+        'title': f"{rng.choice(TITLES[category])} {index}",
+        'company': rng.choice(COMPANIES),
+        'location': f"{city}, {state}",
+        'category': category,
+        'job_type': rng.choice(JOB_TYPES),
+        'experience': rng.choice(EXPERIENCE),
+        'salary': f"₹{low},00,000 - ₹{low + rng.randrange(2, 10)},00,000 per annum",
+        'description': ' '.join(rng.choice(WORDS) for _ in range(60)).capitalize() + '.',
+        'requirements': '\n'.join(f"- {' '.join(rng.choice(WORDS) for _ in range(6))}" for _ in range(4)),
+        'application_url': f"https://example.com/apply/{index}",
+        'contact_email': 'careers@example.com',
+        'posted_date': base + timedelta(minutes=index),
+        'deadline': base + timedelta(days=rng.randrange(15, 120)),
+        'is_active': True
+    }
+
+def generate(count, seed=42):
+    """Yield ``count`` job column dicts; the same seed always gives the same jobs"""
+    rng = random.Random(seed)
+    for index in range(count):
+        yield make_job(rng, index)
+
+def seed_database(db, Job, count, batch_size=2000, seed=42):
+    """Replace every job in the database with ``count`` synthetic ones.
+
+    Rows are built like jobs created through the API, so the city and salary
+    columns the filters use are filled, and the facet counts are rebuilt.
+    """
+    from facet_service import FacetService
+
+    db.session.execute(db.delete(Job))
+    batch = []
+    for job in generate(count, seed):
+        batch.append({**Job.values_from_dict(job), 'posted_date': job['posted_date'], 'is_active': job['is_active']})
+        if len(batch) >= batch_size:
+            db.session.execute(db.insert(Job), batch)
+            batch = []
+    if batch:
+        db.session.execute(db.insert(Job), batch)
+    FacetService().rebuild(db.session.connection())
+    db.session.commit()
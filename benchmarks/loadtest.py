@@ -0,0 +1,107 @@
+"""Closed-loop HTTP load generator for a running JobsIndia server.
+
+Each of --concurrency threads keeps one keep-alive connection open and sends
+requests back to back for --duration seconds, then the script reports
+throughput and latency percentiles.
+
+Usage:
+    python benchmarks/loadtest.py http://127.0.0.1:5000/api/jobs?limit=20 \
+        --concurrency 16 --duration 20 [--json]
+"""
+import sys
+import json
+import time
+import argparse
+import threading
+import http.client
+from urllib.parse import urlsplit
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+def worker(url, deadline, latencies, errors, lock, headers):
+    parts = urlsplit(url)
+    path = parts.path + (f'?{parts.query}' if parts.query else '')
+    conn_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+    conn = conn_class(parts.netloc, timeout=30)
+    local_latencies = []
+    local_errors = 0
+
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        # A keep-alive connection may be closed by the server at any time (for
+        # example when a worker is recycled), so retry once on a fresh one
+        for attempt in range(2):
+            try:
+                conn.request('GET', path, headers=headers)
+                response = conn.getresponse()
+                response.read()
+                if response.status >= 400:
+                    local_errors += 1
+                else:
+                    local_latencies.append(time.perf_counter() - started)
+                break
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = conn_class(parts.netloc, timeout=30)
+                if attempt:
+                    local_errors += 1
+
+    conn.close()
+    with lock:
+        latencies.extend(local_latencies)
+        errors.append(local_errors)
+
+def run(url, concurrency, duration, headers=None):
+    """Load ``url`` and return a result dict (requests/sec and latency percentiles in ms)"""
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    started = time.perf_counter()
+    deadline = started + duration
+
+    threads = [threading.Thread(target=worker, args=(url, deadline, latencies, errors, lock, headers or {}))
+               for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    elapsed = time.perf_counter() - started
+    to_ms = lambda value: round(value * 1000, 2) if value is not None else None
+    return {
+        'url': url,
+        'concurrency': concurrency,
+        'duration_seconds': round(elapsed, 2),
+        'requests': len(latencies),
+        'errors': sum(errors),
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'p50_ms': to_ms(percentile(latencies, 0.50)),
+        'p95_ms': to_ms(percentile(latencies, 0.95)),
+        'p99_ms': to_ms(percentile(latencies, 0.99)),
+        'max_ms': to_ms(max(latencies) if latencies else None)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('url')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--json', action='store_true', help='print the result as JSON')
+    args = parser.parse_args()
+
+    result = run(args.url, args.concurrency, args.duration)
+    if args.json:
+        print(json.dumps(result))
+    else:
+        print(f"{result['requests_per_second']} req/s over {result['requests']} requests "
+              f"({result['errors']} errors), p50 {result['p50_ms']} ms, "
+              f"p95 {result['p95_ms']} ms, p99 {result['p99_ms']} ms")
+    return 0 if result['requests'] else 1
+
+if __name__ == '__main__':
+    sys.exit(main())
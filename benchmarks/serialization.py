@@ -0,0 +1,70 @@
+"""Compare the /api/jobs serialisation paths at different table sizes.
+
+Old path: ORM objects -> Job.to_dict() -> flask.jsonify
+New path: column tuples (Query.with_entities) -> serializer.dumps
+
+Usage:
+    python benchmarks/serialization.py [--sizes 1000,10000,100000] [--repeat 5]
+    JSON_BACKEND=json python benchmarks/serialization.py   # stdlib encoder
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='1000,10000,100000')
+    parser.add_argument('--repeat', type=int, default=5)
+    return parser.parse_args()
+
+def measure(fn, repeat):
+    timings = []
+    size = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        size = len(fn())
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), size
+
+def main():
+    args = parse_args()
+    workdir = tempfile.mkdtemp(prefix='jobsindia-bench-')
+    os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ.setdefault('OUTBOX_WORKER', 'off')
+
+    from flask import jsonify
+    from app import app, db
+    from models import Job
+    import routes
+    import serializer
+    import datagen
+
+    fields = list(Job.FIELDS)
+
+    def old_path():
+        jobs = Job.query.filter_by(is_active=True).order_by(Job.posted_date.desc()).all()
+        body = jsonify([job.to_dict() for job in jobs]).get_data()
+        db.session.expunge_all()
+        return body
+
+    def new_path():
+        return serializer.dumps(serializer.rows_to_dicts(routes.listing_query('all', '', None, fields), fields))
+
+    print(f"JSON backend: {serializer.BACKEND}")
+    print(f"{'rows':>8} {'old ms':>10} {'new ms':>10} {'speedup':>8} {'bytes':>12}")
+    with app.test_request_context():
+        for count in [int(size) for size in args.sizes.split(',')]:
+            datagen.seed_database(db, Job, count)
+            old_time, old_size = measure(old_path, args.repeat)
+            new_time, new_size = measure(new_path, args.repeat)
+            print(f"{count:>8} {old_time * 1000:>10.1f} {new_time * 1000:>10.1f} "
+                  f"{old_time / new_time:>7.1f}x {new_size:>12}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""Per-request session overhead: signed cookies vs the server-side stores.
+
+Each backend serves a minimal Flask app holding admin session state padded
+to ``--payload`` bytes. Two routes are timed: one that only reads the
+session (the common admin request) and one that writes to it. The time of
+the same route requested without a session cookie is subtracted, so the
+numbers are the session handling alone (Flask loads the session on every
+request, whether or not the view reads it).
+
+Usage:
+    python benchmarks/sessions.py [--requests 2000] [--payload 0,2000]
+    python benchmarks/sessions.py --redis-url redis://localhost:6379/15
+"""
+import os
+import sys
+import time
+import argparse
+import secrets
+import tempfile
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--payload', default='0,2000', help='Extra bytes of session state to carry')
+    parser.add_argument('--redis-url', default=None)
+    return parser.parse_args()
+
+def make_app(interface, payload):
+    from flask import Flask, session
+
+    app = Flask(__name__)
+    app.secret_key = 'benchmark'
+    if interface is not None:
+        app.session_interface = interface
+
+    @app.route('/login')
+    def login():
+        session['admin_logged_in'] = True
+        session['admin_username'] = 'admin'
+        session['state'] = secrets.token_hex(payload // 2)
+        return 'ok'
+
+    @app.route('/read')
+    def read():
+        return 'ok' if session.get('admin_logged_in') else 'no'
+
+    @app.route('/write')
+    def write():
+        session['hits'] = session.get('hits', 0) + 1
+        return 'ok'
+
+    return app
+
+def measure(calls, requests):
+    """Median microseconds per (client, path), interleaved so drift affects them equally"""
+    timings = [[] for _ in calls]
+    for _ in range(requests):
+        for timing, (client, path) in zip(timings, calls):
+            started = time.perf_counter()
+            client.get(path)
+            timing.append(time.perf_counter() - started)
+    return [statistics.median(timing) * 1e6 for timing in timings]
+
+def backends(args, workdir):
+    from session_service import ServerSessionInterface
+
+    yield 'cookie', lambda: None
+    yield 'memory', lambda: ServerSessionInterface('memory')
+    yield 'sqlite', lambda: ServerSessionInterface(f"sqlite:///{os.path.join(workdir, 'sessions.db')}")
+    if args.redis_url:
+        yield 'redis', lambda: ServerSessionInterface(args.redis_url)
+
+def main():
+    args = parse_args()
+    workdir = tempfile.mkdtemp(prefix='jobsindia-bench-')
+
+    print(f"{'backend':<8} {'payload':>8} {'cookie B':>9} {'read us':>9} {'write us':>9}")
+    for payload in [int(size) for size in args.payload.split(',')]:
+        for name, create in backends(args, workdir):
+            app = make_app(create(), payload)
+            client = app.test_client()
+            client.get('/login')
+            cookie = client.get_cookie(app.config['SESSION_COOKIE_NAME'])
+            anonymous = app.test_client(use_cookies=False)
+            calls = [(anonymous, '/read'), (client, '/read'), (client, '/write')]
+
+            # Warm up connections and caches before timing
+            measure(calls, 50)
+            baseline, read, write = measure(calls, args.requests)
+            read -= baseline
+            write -= baseline
+            print(f"{name:<8} {payload:>8} {len(cookie.value):>9} {read:>9.1f} {write:>9.1f}")
+
+if __name__ == '__main__':
+    main()
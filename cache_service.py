@@ -0,0 +1,153 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from flask import Response, request
+import serializer
+from metrics_service import phase
+
+class MemoryCacheBackend:
+    """In-process LRU cache with per-entry TTL.
+
+    Each gunicorn worker has its own copy, so an invalidation only reaches the
+    worker that handled the admin write; the TTL bounds how stale the others get.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def get_counter(self, name):
+        with self.lock:
+            return self.counters.get(name, 0)
+
+    def incr(self, name):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + 1
+            return self.counters[name]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+class RedisCacheBackend:
+    """Cache shared by every worker through a Redis-compatible server"""
+
+    def __init__(self, url, prefix='jobsindia:'):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key):
+        return self.client.get(self.prefix + key)
+
+    def set(self, key, value, ttl):
+        self.client.setex(self.prefix + key, ttl, value)
+
+    def get_counter(self, name):
+        return int(self.client.get(self.prefix + name) or 0)
+
+    def incr(self, name):
+        return self.client.incr(self.prefix + name)
+
+    def clear(self):
+        # Other workers share these entries; stale versions expire with their TTL
+        pass
+
+class ResponseCache:
+    """Caches serialised JSON responses for the public job endpoints.
+
+    Keys embed a version counter that the admin write routes bump, so every
+    cached listing becomes unreachable as soon as a job changes.
+    """
+
+    VERSION_KEY = 'jobs_version'
+
+    def __init__(self):
+        self.ttl = int(os.getenv('CACHE_TTL', '60'))
+        self.enabled = os.getenv('CACHE_ENABLED', '1') == '1'
+        self.backend = self._create_backend(os.getenv('CACHE_URL', ''))
+
+    def _create_backend(self, url):
+        if url.startswith(('redis://', 'rediss://', 'unix://')):
+            try:
+                return RedisCacheBackend(url)
+            except ImportError:
+                logging.warning("redis package not installed, using in-process cache")
+        return MemoryCacheBackend(int(os.getenv('CACHE_MAX_ENTRIES', '1024')))
+
+    def make_key(self, namespace, params):
+        version = self.backend.get_counter(self.VERSION_KEY)
+        normalised = json.dumps(params, sort_keys=True, separators=(',', ':'), default=str)
+        digest = hashlib.sha1(normalised.encode('utf-8')).hexdigest()
+        return f"{namespace}:v{version}:{digest}"
+
+    def invalidate(self):
+        """Drop every cached job response (called after admin writes)"""
+        try:
+            self.backend.incr(self.VERSION_KEY)
+            # Entries keyed on the old version can never be hit again. Other counters
+            # (the auth cache's) share the backend, so only this one frees them
+            self.backend.clear()
+        except Exception as e:
+            logging.warning(f"Cache invalidation failed: {str(e)}")
+
+    def json_response(self, namespace, params, build):
+        """Return a conditional JSON response for ``build()``, served from cache when possible.
+
+        Exceptions raised by ``build`` propagate and nothing is cached.
+        """
+        cached = None
+        key = None
+
+        if self.enabled:
+            try:
+                key = self.make_key(namespace, params)
+                cached = self.backend.get(key)
+            except Exception as e:
+                logging.warning(f"Cache lookup failed: {str(e)}")
+
+        if cached is not None:
+            etag, body = cached.split(b'\n', 1)
+            etag = etag.decode('ascii')
+        else:
+            with phase('build'):
+                data = build()
+            with phase('encode'):
+                body = serializer.dumps(data)
+            etag = hashlib.sha1(body).hexdigest()
+            if key is not None:
+                try:
+                    self.backend.set(key, etag.encode('ascii') + b'\n' + body, self.ttl)
+                except Exception as e:
+                    logging.warning(f"Cache store failed: {str(e)}")
+
+        response = Response(body, mimetype='application/json')
+        response.set_etag(etag)
+        # Let browsers keep the body but revalidate it with If-None-Match every time
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
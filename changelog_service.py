@@ -0,0 +1,182 @@
+import os
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import text, select, delete, func
+from models import Job, JobChange
+
+class ChangeLog:
+    """Incremental sync over the job table.
+
+    Database triggers append a ``job_change`` row for every insert, update and
+    delete, including bulk statements that bypass the ORM. A client keeps the
+    id of the last change it applied and asks for everything after it, so
+    staying current costs O(changes) rather than re-reading every job.
+    """
+
+    SQLITE_SETUP = [
+        """
+        CREATE TRIGGER IF NOT EXISTS job_change_ai AFTER INSERT ON job BEGIN
+            INSERT INTO job_change(job_id, op, changed_at) VALUES (new.id, 'upsert', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS job_change_au AFTER UPDATE ON job BEGIN
+            INSERT INTO job_change(job_id, op, changed_at) VALUES (new.id, 'upsert', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS job_change_ad AFTER DELETE ON job BEGIN
+            INSERT INTO job_change(job_id, op, changed_at) VALUES (old.id, 'delete', strftime('%Y-%m-%d %H:%M:%f', 'now'));
+        END
+        """
+    ]
+
+    POSTGRES_SETUP = [
+        """
+        CREATE OR REPLACE FUNCTION job_change_log() RETURNS trigger AS $$
+        BEGIN
+            -- Serialise job writers so change ids become visible in commit order;
+            -- otherwise a reader could skip an id whose transaction commits late
+            PERFORM pg_advisory_xact_lock(7316002);
+            IF TG_OP = 'DELETE' THEN
+                INSERT INTO job_change(job_id, op, changed_at) VALUES (OLD.id, 'delete', now() AT TIME ZONE 'utc');
+                RETURN OLD;
+            END IF;
+            INSERT INTO job_change(job_id, op, changed_at) VALUES (NEW.id, 'upsert', now() AT TIME ZONE 'utc');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        "DROP TRIGGER IF EXISTS job_change_log ON job",
+        """
+        CREATE TRIGGER job_change_log AFTER INSERT OR UPDATE OR DELETE ON job
+        FOR EACH ROW EXECUTE FUNCTION job_change_log()
+        """
+    ]
+
+    DEFAULT_LIMIT = 500
+    MAX_LIMIT = 5000
+
+    def __init__(self):
+        self.retention = timedelta(days=int(os.getenv('CHANGELOG_RETENTION_DAYS', '30')))
+
+    def create_triggers(self, conn):
+        """Install the change-log triggers (run by migrations)"""
+        dialect = conn.dialect.name
+        if dialect == 'sqlite':
+            statements = self.SQLITE_SETUP
+        elif dialect == 'postgresql':
+            statements = self.POSTGRES_SETUP
+        else:
+            logging.warning(f"No change-log triggers for {dialect}, /api/jobs/changes will stay empty")
+            return
+        for statement in statements:
+            conn.execute(text(statement))
+
+    def latest(self, session):
+        return session.execute(select(func.max(JobChange.id))).scalar() or 0
+
+    def cursor_at(self, session, moment):
+        """The cursor just before the first change at or after ``moment`` (UTC)"""
+        oldest = session.execute(select(func.min(JobChange.changed_at))).scalar()
+        if oldest is not None and moment < oldest:
+            # Changes from before the oldest one kept may have been pruned
+            return -1
+        first = session.execute(select(func.min(JobChange.id)).where(JobChange.changed_at >= moment)).scalar()
+        return first - 1 if first is not None else self.latest(session)
+
+    def changes(self, session, since, limit=None):
+        """Net changes after cursor ``since``: the current row of each changed active job, ids of removed ones.
+
+        ``reset`` is true when changes after ``since`` may already have been pruned;
+        the client must then reload everything and continue from ``next``.
+        """
+        limit = min(max(limit or self.DEFAULT_LIMIT, 1), self.MAX_LIMIT)
+        oldest = session.execute(select(func.min(JobChange.id))).scalar()
+
+        if since is None or (oldest is not None and since < oldest - 1):
+            return {'reset': True, 'next': self.latest(session), 'has_more': False, 'upserts': [], 'deletes': []}
+
+        rows = session.execute(
+            select(JobChange.id, JobChange.job_id)
+            .where(JobChange.id > since)
+            .order_by(JobChange.id)
+            .limit(limit + 1)
+        ).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        job_ids = {row.job_id for row in rows}
+        current = {}
+        if job_ids:
+            for row in session.execute(select(*Job.columns(Job.FIELDS)).where(Job.id.in_(job_ids))):
+                current[row.id] = row._asdict()
+
+        # Only the latest state matters, so several changes to one job collapse into one entry
+        upserts = [job for job_id, job in sorted(current.items()) if job['is_active']]
+        deletes = sorted(job_id for job_id in job_ids if job_id not in current or not current[job_id]['is_active'])
+
+        return {
+            'reset': False,
+            'next': rows[-1].id if rows else since,
+            'has_more': has_more,
+            'upserts': upserts,
+            'deletes': deletes
+        }
+
+    def prune(self, session, now=None):
+        """Delete changes older than the retention period, always keeping the newest one"""
+        cutoff = (now or datetime.utcnow()) - self.retention
+        latest = self.latest(session)
+        result = session.execute(
+            delete(JobChange)
+            .where(JobChange.changed_at < cutoff, JobChange.id < latest)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+class JobMirror:
+    """An in-memory copy of the active jobs kept current through a ChangeLog.
+
+    The first ``sync`` loads every active job; later calls only read the
+    changes since the previous one.
+    """
+
+    def __init__(self, changelog):
+        self.changelog = changelog
+        self.jobs = {}
+        self.cursor = None
+
+    def sync(self, session):
+        """Bring the mirror up to date and return how many jobs were (re)loaded or removed"""
+        if self.cursor is None:
+            return self._reload(session)
+
+        touched = 0
+        while True:
+            page = self.changelog.changes(session, self.cursor)
+            if page['reset']:
+                return self._reload(session)
+            for job in page['upserts']:
+                self.jobs[job['id']] = job
+            for job_id in page['deletes']:
+                self.jobs.pop(job_id, None)
+            touched += len(page['upserts']) + len(page['deletes'])
+            self.cursor = page['next']
+            if not page['has_more']:
+                return touched
+
+    def active_jobs(self):
+        """Mirrored jobs as JSON-ready dicts, newest first like the public listing"""
+        ordered = sorted(self.jobs.values(), key=lambda job: (job['posted_date'] or datetime.min, job['id']), reverse=True)
+        return [
+            {name: value.isoformat() if isinstance(value, datetime) else value for name, value in job.items()}
+            for job in ordered
+        ]
+
+    def _reload(self, session):
+        # Read the cursor first: changes committed during the load are re-applied next time
+        self.cursor = self.changelog.latest(session)
+        rows = session.execute(select(*Job.columns(Job.FIELDS)).where(Job.is_active == True))  # noqa: E712
+        self.jobs = {row.id: row._asdict() for row in rows}
+        return len(self.jobs)
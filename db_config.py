@@ -0,0 +1,89 @@
+import os
+import sqlite3
+import logging
+from functools import wraps
+from flask import g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine, make_url
+
+def engine_options(url):
+    """SQLAlchemy engine options tuned for the database behind ``url``"""
+    backend = make_url(url).get_backend_name()
+
+    if backend == 'sqlite':
+        # pysqlite's timeout is SQLite's busy timeout: wait for the writer instead of failing
+        return {'connect_args': {'timeout': float(os.environ.get('SQLITE_BUSY_TIMEOUT', '5'))}}
+
+    if backend == 'postgresql':
+        options = {
+            'pool_size': int(os.environ.get('DB_POOL_SIZE', '5')),
+            'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', '10')),
+            'pool_timeout': float(os.environ.get('DB_POOL_TIMEOUT', '10')),
+            'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', '1800')),
+            # Pre-ping costs a round trip per checkout; recycling usually suffices
+            'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', '0') == '1',
+            # Reuse the most recent connection so surplus ones idle out and get recycled
+            'pool_use_lifo': True,
+            'connect_args': {'application_name': 'jobsindia'}
+        }
+        statement_timeout = int(os.environ.get('DB_STATEMENT_TIMEOUT_MS', '15000'))
+        if statement_timeout:
+            options['connect_args']['options'] = f"-c statement_timeout={statement_timeout}"
+        return options
+
+    return {
+        'pool_recycle': 300,
+        'pool_pre_ping': True,
+    }
+
+def lift_statement_timeout(conn):
+    """Turn off DB_STATEMENT_TIMEOUT_MS for the rest of ``conn``'s transaction.
+
+    For migrations and maintenance batches, which are expected to run long;
+    the web requests' limit is restored when the transaction ends.
+    """
+    if conn.dialect.name == 'postgresql':
+        conn.execute(text("SET LOCAL statement_timeout = 0"))
+
+@event.listens_for(Engine, 'connect')
+def configure_sqlite_connection(dbapi_connection, connection_record):
+    """WAL lets public reads continue while an admin write commits"""
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+    cursor = dbapi_connection.cursor()
+    try:
+        if os.environ.get('SQLITE_WAL', '1') == '1':
+            mode = cursor.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+            if mode != 'wal':
+                logging.debug(f"SQLite journal mode is {mode} (in-memory or read-only database)")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        busy_timeout = int(float(os.environ.get('SQLITE_BUSY_TIMEOUT', '5')) * 1000)
+        cursor.execute(f"PRAGMA busy_timeout={busy_timeout}")
+    finally:
+        cursor.close()
+
+class RoutingSession(Session):
+    """Sends queries made inside ``@read_replica`` views to the replica bind.
+
+    Flushes, and any view that is not marked, keep using the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_app_context() and g.get('use_read_replica'):
+            replica = self._db.engines.get('replica')
+            if replica is not None:
+                return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+def read_replica(view):
+    """Mark a read-only view whose queries may be served by DATABASE_REPLICA_URL.
+
+    The flag lives on ``g`` for the rest of the request, so streamed bodies
+    generated after the view returns read from the replica too.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        g.use_read_replica = True
+        return view(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,171 @@
+import os
+import time
+import json
+import logging
+import threading
+from collections import deque
+
+class MemoryEventBackend:
+    """Recent events kept in a ring buffer in this process.
+
+    Only clients connected to the same gunicorn worker that handled the write
+    see its events; use the Redis backend when running several workers. Ids
+    carry a per-process epoch so a client resuming across a restart gets a
+    reset instead of silently missing events.
+    """
+
+    shared = False
+
+    def __init__(self, size=1000):
+        self.epoch = str(int(time.time() * 1000))
+        self.events = deque(maxlen=size)
+        self.sequence = 0
+        self.condition = threading.Condition()
+
+    def publish(self, kind, data):
+        with self.condition:
+            self.sequence += 1
+            event_id = f"{self.epoch}-{self.sequence}"
+            self.events.append((self.sequence, event_id, kind, data))
+            self.condition.notify_all()
+            return event_id
+
+    def latest(self):
+        with self.condition:
+            return f"{self.epoch}-{self.sequence}"
+
+    def read(self, after, timeout):
+        """Events newer than ``after``, waiting up to ``timeout`` seconds; returns (events, reset)"""
+        epoch, _, sequence = (after or '').partition('-')
+        if epoch != self.epoch or not sequence.isdigit():
+            return [], True
+        sequence = int(sequence)
+
+        with self.condition:
+            if self.events and sequence < self.events[0][0] - 1:
+                return [], True
+            self.condition.wait_for(lambda: self.sequence > sequence, timeout)
+            return [(event_id, kind, data) for seq, event_id, kind, data in self.events if seq > sequence], False
+
+class RedisEventBackend:
+    """Events in a capped Redis stream, shared by every worker"""
+
+    shared = True
+
+    def __init__(self, url, size=1000, key='jobsindia:events'):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.size = size
+        self.key = key
+
+    def publish(self, kind, data):
+        event_id = self.client.xadd(self.key, {'kind': kind, 'data': json.dumps(data)},
+                                    maxlen=self.size, approximate=True)
+        return event_id.decode('ascii')
+
+    def latest(self):
+        entries = self.client.xrevrange(self.key, count=1)
+        return entries[0][0].decode('ascii') if entries else '0-0'
+
+    def read(self, after, timeout):
+        after_key = self._parse(after)
+        if after_key is None:
+            return [], True
+        oldest = self.client.xrange(self.key, count=1)
+        if oldest and after_key < self._parse(oldest[0][0].decode('ascii')) and after_key != (0, 0):
+            return [], True
+
+        response = self.client.xread({self.key: after}, block=max(int(timeout * 1000), 1), count=100)
+        events = []
+        for _, entries in response or []:
+            for event_id, fields in entries:
+                events.append((event_id.decode('ascii'), fields[b'kind'].decode('utf-8'),
+                               json.loads(fields[b'data'])))
+        return events, False
+
+    def _parse(self, event_id):
+        try:
+            milliseconds, sequence = (event_id or '').split('-')
+            return int(milliseconds), int(sequence)
+        except ValueError:
+            return None
+
+class EventBroker:
+    """Publishes job change events and serves them as SSE streams or long polls.
+
+    The admin write routes publish after committing. Each event carries just
+    enough to update a listing (or only the id for deletions), so open pages
+    apply deltas instead of re-fetching whole lists.
+    """
+
+    def __init__(self):
+        size = int(os.getenv('EVENTS_BUFFER', '1000'))
+        self.heartbeat = float(os.getenv('EVENTS_HEARTBEAT', '15'))
+        self.stream_seconds = float(os.getenv('EVENTS_STREAM_SECONDS', '300'))
+        # Every open stream holds a worker thread (or greenlet under gevent)
+        self.max_streams = int(os.getenv('EVENTS_MAX_STREAMS', '2'))
+        self.streams = threading.BoundedSemaphore(self.max_streams) if self.max_streams > 0 else None
+        self.backend = self._create_backend(os.getenv('EVENTS_URL', os.getenv('CACHE_URL', '')), size)
+
+    def _create_backend(self, url, size):
+        if url.startswith(('redis://', 'rediss://', 'unix://')):
+            try:
+                return RedisEventBackend(url, size)
+            except ImportError:
+                logging.warning("redis package not installed, using in-process events")
+        return MemoryEventBackend(size)
+
+    def publish(self, kind, data):
+        """Publish an event; failures are logged, never raised into the write route"""
+        try:
+            return self.backend.publish(kind, data)
+        except Exception as e:
+            logging.warning(f"Event publish failed: {str(e)}")
+            return None
+
+    def poll(self, after, wait=0):
+        """Events after ``after`` as a dict for the long-poll endpoint"""
+        if not after:
+            return {'events': [], 'last_event_id': self.backend.latest(), 'reset': False}
+
+        events, reset = self.backend.read(after, wait)
+        last_event_id = self.backend.latest() if reset else (events[-1][0] if events else after)
+        return {
+            'events': [{'id': event_id, 'type': kind, 'data': data} for event_id, kind, data in events],
+            'last_event_id': last_event_id,
+            'reset': reset
+        }
+
+    def open_stream(self):
+        """Reserve a stream slot; returns False when this process is at EVENTS_MAX_STREAMS"""
+        return self.streams is not None and self.streams.acquire(blocking=False)
+
+    def close_stream(self):
+        """Release a slot taken by ``open_stream()``"""
+        self.streams.release()
+
+    def stream(self, last_event_id=None):
+        """Yield SSE frames until ``stream_seconds`` pass; the browser then reconnects with Last-Event-ID.
+
+        Call only after ``open_stream()`` returned True, and ``close_stream()`` once the response
+        is closed; that also covers HEAD requests and clients gone before the first frame.
+        """
+        try:
+            deadline = time.monotonic() + self.stream_seconds
+            after = last_event_id or self.backend.latest()
+            yield f"retry: 5000\nid: {after}\n\n"
+
+            while time.monotonic() < deadline:
+                events, reset = self.backend.read(after, min(self.heartbeat, max(deadline - time.monotonic(), 0)))
+                if reset:
+                    after = self.backend.latest()
+                    yield f"id: {after}\nevent: reset\ndata: {{}}\n\n"
+                    continue
+                if not events:
+                    yield ": keepalive\n\n"
+                    continue
+                for event_id, kind, data in events:
+                    yield f"id: {event_id}\nevent: {kind}\ndata: {json.dumps(data)}\n\n"
+                after = events[-1][0]
+        except Exception as e:
+            logging.warning(f"Event stream ended: {str(e)}")
@@ -1,199 +1,257 @@
 import os
 import json
+import fcntl
 import logging
+from contextlib import contextmanager
 from datetime import datetime
-from openpyxl import Workbook, load_workbook
+from itertools import islice, chain
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.utils import get_column_letter
 
 class ExcelService:
+    """Keeps jobs.json/jobs.xlsx backups and builds Excel exports.
+    
+    New jobs are appended to a JSONL journal, which is O(1) per job. Once the
+    journal holds ``compact_threshold`` entries it is folded into the JSON and
+    XLSX snapshots, each written to a temp file and renamed into place so readers
+    never see a half-written file.
+    """
+    
+    SNAPSHOT_HEADERS = [
+        'ID', 'Title', 'Company', 'Location', 'Category', 'Job Type',
+        'Experience', 'Salary', 'Description', 'Requirements',
+        'Application URL', 'Contact Email', 'Posted Date', 'Deadline'
+    ]
+    EXPORT_HEADERS = SNAPSHOT_HEADERS + ['Status']
+    
     def __init__(self):
         self.excel_file = 'jobs.xlsx'
         self.json_file = 'jobs.json'
+        self.journal_file = 'jobs.jsonl'
+        self.lock_file = 'jobs.jsonl.lock'
+        self.compact_threshold = int(os.getenv('EXCEL_COMPACT_EVERY', '50'))
+        # Rows inspected to size columns before streaming the rest
+        self.width_sample_size = 500
     
     def save_job(self, job_data):
-        """Save a single job to both JSON and Excel"""
+        """Record a single job in the journal, compacting the snapshots when it is due"""
         try:
-            # Save to JSON first
-            self.save_to_json(job_data)
+            if 'posted_date' not in job_data:
+                job_data['posted_date'] = datetime.utcnow().isoformat()
             
-            # Save to Excel
-            self.save_to_excel(job_data)
+            with self._locked():
+                pending = self.append_to_journal(job_data)
+                if pending >= self.compact_threshold:
+                    self._compact()
             
-            logging.info("Job successfully saved to Excel and JSON")
+            logging.info("Job saved to journal")
             return True
         
         except Exception as e:
             logging.error(f"Error saving job to Excel: {str(e)}")
             return False
     
-    def save_to_json(self, job_data):
-        """Save job to JSON file"""
+    def save_jobs(self, jobs_data):
+        """Record several jobs with a single journal write"""
         try:
-            # Load existing jobs
-            if os.path.exists(self.json_file):
-                with open(self.json_file, 'r', encoding='utf-8') as f:
-                    jobs = json.load(f)
-            else:
-                jobs = []
-            
-            # Add new job
-            job_data['id'] = len(jobs) + 1
-            if 'posted_date' not in job_data:
-                job_data['posted_date'] = datetime.utcnow().isoformat()
-            
-            jobs.append(job_data)
-            
-            # Save back to file
-            with open(self.json_file, 'w', encoding='utf-8') as f:
-                json.dump(jobs, f, indent=2, ensure_ascii=False)
+            with self._locked():
+                pending = self.append_to_journal(*jobs_data)
+                if pending >= self.compact_threshold:
+                    self._compact()
             
-            logging.info("Job saved to JSON file")
+            logging.info(f"{len(jobs_data)} jobs saved to journal")
+            return True
         
         except Exception as e:
-            logging.error(f"Error saving to JSON: {str(e)}")
-            raise
+            logging.error(f"Error saving jobs to Excel: {str(e)}")
+            return False
     
-    def save_to_excel(self, job_data):
-        """Save job to Excel file"""
-        try:
-            if os.path.exists(self.excel_file):
-                workbook = load_workbook(self.excel_file)
-                worksheet = workbook.active
-            else:
-                workbook = Workbook()
-                worksheet = workbook.active
-                worksheet.title = "Jobs"
-                
-                # Create headers
-                headers = [
-                    'ID', 'Title', 'Company', 'Location', 'Category', 'Job Type',
-                    'Experience', 'Salary', 'Description', 'Requirements',
-                    'Application URL', 'Contact Email', 'Posted Date', 'Deadline'
-                ]
-                
-                for col, header in enumerate(headers, 1):
-                    cell = worksheet.cell(row=1, column=col, value=header)
-                    cell.font = Font(bold=True)
-                    cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-                    cell.alignment = Alignment(horizontal="center")
-            
-            # Add new job row
-            next_row = worksheet.max_row + 1
-            
-            job_row = [
-                job_data.get('id', next_row - 1),
-                job_data.get('title', ''),
-                job_data.get('company', ''),
-                job_data.get('location', ''),
-                job_data.get('category', ''),
-                job_data.get('job_type', ''),
-                job_data.get('experience', ''),
-                job_data.get('salary', ''),
-                job_data.get('description', ''),
-                job_data.get('requirements', ''),
-                job_data.get('application_url', ''),
-                job_data.get('contact_email', ''),
-                job_data.get('posted_date', datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')),
-                job_data.get('deadline', '')
-            ]
-            
-            for col, value in enumerate(job_row, 1):
-                worksheet.cell(row=next_row, column=col, value=value)
-            
-            # Auto-adjust column widths
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-            
-            workbook.save(self.excel_file)
-            logging.info("Job saved to Excel file")
+    def append_to_journal(self, *jobs_data):
+        """Append jobs to the journal and return how many entries it now holds"""
+        lines = ''.join(json.dumps(job_data, ensure_ascii=False, default=str) + '\n' for job_data in jobs_data)
+        with open(self.journal_file, 'a+', encoding='utf-8') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+            f.seek(0)
+            return sum(1 for _ in f)
+    
+    def compact(self):
+        """Fold the journal into the JSON and Excel snapshots and truncate it"""
+        with self._locked():
+            return self._compact()
+    
+    def _compact(self):
+        journal = self._read_journal()
+        if not journal and os.path.exists(self.excel_file):
+            return 0
         
-        except Exception as e:
-            logging.error(f"Error saving to Excel: {str(e)}")
-            raise
+        jobs = self._merge(self._read_snapshot(), journal)
+        
+        self._atomic_write(self.json_file, 'w', lambda f: json.dump(jobs, f, indent=2, ensure_ascii=False))
+        self._atomic_write(self.excel_file, 'wb', lambda f: self._write_workbook(
+            f, "Jobs", self.SNAPSHOT_HEADERS, (self._snapshot_row(job) for job in jobs)
+        ))
+        
+        # Only drop the journal once both snapshots are safely in place
+        open(self.journal_file, 'w').close()
+        logging.info(f"Compacted {len(journal)} journal entries into {len(jobs)} jobs")
+        return len(journal)
     
     def get_all_jobs(self):
-        """Get all jobs from JSON file"""
+        """Get all jobs from the JSON snapshot plus anything still in the journal"""
         try:
-            if os.path.exists(self.json_file):
-                with open(self.json_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return []
+            return self._merge(self._read_snapshot(), self._read_journal())
         
         except Exception as e:
             logging.error(f"Error reading jobs from JSON: {str(e)}")
             return []
     
+    def _read_snapshot(self):
+        if os.path.exists(self.json_file):
+            with open(self.json_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        return []
+    
+    def _read_journal(self):
+        if not os.path.exists(self.journal_file):
+            return []
+        
+        entries = []
+        with open(self.journal_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # A crash mid-append can leave a torn last line
+                    logging.warning("Skipping unreadable journal entry")
+        return entries
+    
+    def _merge(self, jobs, journal):
+        """Apply journal entries on top of the snapshot.
+        
+        Journal entries are database jobs, so a repeated id replaces the older copy.
+        Snapshot entries from before the journal were numbered by position, which
+        overlaps the database ids; they are different jobs and are never replaced.
+        """
+        merged = {}
+        for position, job in enumerate(jobs):
+            if job.get('source') == 'database':
+                merged[('database', job['id'])] = job
+            else:
+                merged[('legacy', position)] = job
+        for job in journal:
+            job['source'] = 'database'
+            merged[('database', job.get('id'))] = job
+        return list(merged.values())
+    
+    def _atomic_write(self, path, mode, write):
+        tmp_path = f"{path}.tmp.{os.getpid()}"
+        try:
+            with open(tmp_path, mode, **({} if 'b' in mode else {'encoding': 'utf-8'})) as f:
+                write(f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+    
+    @contextmanager
+    def _locked(self):
+        # Serialises appends and compaction across gunicorn workers
+        with open(self.lock_file, 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+    
     def export_all_jobs(self, jobs_data):
         """Export all jobs to a new Excel file"""
         try:
             export_file = f'jobs_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
             
-            workbook = Workbook()
-            worksheet = workbook.active
-            worksheet.title = "All Jobs"
-            
-            # Create headers
-            headers = [
-                'ID', 'Title', 'Company', 'Location', 'Category', 'Job Type',
-                'Experience', 'Salary', 'Description', 'Requirements',
-                'Application URL', 'Contact Email', 'Posted Date', 'Deadline', 'Status'
-            ]
+            with open(export_file, 'wb') as f:
+                self.write_export(jobs_data, f)
             
-            for col, header in enumerate(headers, 1):
-                cell = worksheet.cell(row=1, column=col, value=header)
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
-                cell.alignment = Alignment(horizontal="center")
-            
-            # Add job data
-            for row_idx, job in enumerate(jobs_data, 2):
-                job_row = [
-                    job.get('id', ''),
-                    job.get('title', ''),
-                    job.get('company', ''),
-                    job.get('location', ''),
-                    job.get('category', ''),
-                    job.get('job_type', ''),
-                    job.get('experience', ''),
-                    job.get('salary', ''),
-                    job.get('description', ''),
-                    job.get('requirements', ''),
-                    job.get('application_url', ''),
-                    job.get('contact_email', ''),
-                    job.get('posted_date', ''),
-                    job.get('deadline', ''),
-                    'Active' if job.get('is_active', True) else 'Inactive'
-                ]
-                
-                for col, value in enumerate(job_row, 1):
-                    worksheet.cell(row=row_idx, column=col, value=value)
-            
-            # Auto-adjust column widths
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-            
-            workbook.save(export_file)
             logging.info(f"All jobs exported to {export_file}")
             return export_file
         
         except Exception as e:
             logging.error(f"Error exporting to Excel: {str(e)}")
             raise
+    
+    def write_export(self, jobs_data, file_obj):
+        """Stream jobs into an export workbook; ``jobs_data`` may be any iterable of job dicts"""
+        rows = (self._snapshot_row(job) + ['Active' if job.get('is_active', True) else 'Inactive']
+                for job in jobs_data)
+        return self._write_workbook(file_obj, "All Jobs", self.EXPORT_HEADERS, rows)
+    
+    def _write_workbook(self, file_obj, title, headers, rows):
+        """Write rows through a write-only worksheet.
+        
+        Only the first ``width_sample_size`` rows are held in memory, to size
+        the columns before any row is written.
+        """
+        rows = iter(rows)
+        sample = list(islice(rows, self.width_sample_size))
+        
+        workbook = Workbook(write_only=True)
+        worksheet = workbook.create_sheet(title)
+        
+        # Column widths must be set before the first row in write-only mode
+        for col, width in enumerate(self._column_widths(headers, sample), 1):
+            worksheet.column_dimensions[get_column_letter(col)].width = width
+        
+        header_font = Font(bold=True)
+        header_fill = PatternFill(start_color="CCCCCC", end_color="CCCCCC", fill_type="solid")
+        header_alignment = Alignment(horizontal="center")
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(worksheet, value=header)
+            cell.font = header_font
+            cell.fill = header_fill
+            cell.alignment = header_alignment
+            header_cells.append(cell)
+        worksheet.append(header_cells)
+        
+        count = 0
+        for job_row in chain(sample, rows):
+            worksheet.append(job_row)
+            count += 1
+        
+        workbook.save(file_obj)
+        return count
+    
+    def _snapshot_row(self, job):
+        return [
+            job.get('id', ''),
+            job.get('title', ''),
+            job.get('company', ''),
+            job.get('location', ''),
+            job.get('category', ''),
+            job.get('job_type', ''),
+            job.get('experience', ''),
+            job.get('salary', ''),
+            job.get('description', ''),
+            job.get('requirements', ''),
+            job.get('application_url', ''),
+            job.get('contact_email', ''),
+            job.get('posted_date', ''),
+            job.get('deadline', '')
+        ]
+    
+    def _column_widths(self, headers, rows):
+        widths = [len(header) for header in headers]
+        for row in rows:
+            for col, value in enumerate(row):
+                if value is not None:
+                    widths[col] = max(widths[col], len(str(value)))
+        return [min(width + 2, 50) for width in widths]
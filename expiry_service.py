@@ -0,0 +1,104 @@
+import os
+import time
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy import select, insert, update, delete, literal
+from app import db
+from db_config import lift_statement_timeout
+from models import Job, JobArchive
+
+class ExpiryService:
+    """Deactivates jobs whose deadline has passed and archives long-expired ones.
+
+    Both steps work in bounded batches of ids, each committed on its own, so a
+    large backlog never holds one long write transaction over the job table.
+    Runs are scheduled as a recurring outbox event (see routes.py), which gives
+    them the outbox's lease so only one worker sweeps at a time.
+    """
+
+    # Archive columns copied from the job column of the same name; job_id takes the job's id
+    ARCHIVED_COLUMNS = [column.key for column in JobArchive.__table__.columns
+                        if column.key not in ('id', 'job_id', 'archived_at')]
+
+    def __init__(self, facets=None):
+        self.interval = int(os.getenv('EXPIRY_INTERVAL', '3600'))
+        self.batch_size = int(os.getenv('EXPIRY_BATCH_SIZE', '500'))
+        # 0 keeps expired jobs in the job table forever
+        self.archive_after = timedelta(days=int(os.getenv('ARCHIVE_AFTER_DAYS', '90')))
+        self.facets = facets
+
+    def run(self, now=None):
+        """Run one sweep and return how many jobs were expired and archived"""
+        started = time.perf_counter()
+        # Deadlines are dates (stored as midnight) and applications are open all
+        # of that day, so a job expires once its deadline day is over
+        today = (now or datetime.utcnow()).replace(hour=0, minute=0, second=0, microsecond=0)
+        result = {'expired': 0, 'archived': 0, 'batches': 0}
+
+        while True:
+            expired = self.expire_batch(today)
+            if not expired:
+                break
+            result['expired'] += expired
+            result['batches'] += 1
+
+        if self.archive_after:
+            while True:
+                archived = self.archive_batch(today - self.archive_after)
+                if not archived:
+                    break
+                result['archived'] += archived
+                result['batches'] += 1
+
+        result['elapsed_seconds'] = round(time.perf_counter() - started, 3)
+        if result['batches']:
+            logging.info(f"Expiry run: {result['expired']} jobs expired, {result['archived']} archived "
+                         f"in {result['batches']} batches ({result['elapsed_seconds']}s)")
+        return result
+
+    def expire_batch(self, cutoff):
+        """Deactivate up to ``batch_size`` active jobs whose deadline is before ``cutoff``"""
+        lift_statement_timeout(db.session.connection())
+        rows = db.session.execute(
+            select(*Job.columns(['id', 'category', 'job_type', 'experience', 'location']))
+            .where(Job.is_active == True, Job.deadline < cutoff)  # noqa: E712
+            .order_by(Job.deadline)
+            .limit(self.batch_size)
+        ).all()
+        if not rows:
+            return 0
+
+        ids = [row.id for row in rows]
+        db.session.execute(
+            update(Job)
+            .where(Job.id.in_(ids), Job.is_active == True)  # noqa: E712
+            .values(is_active=False)
+            .execution_options(synchronize_session=False)
+        )
+        if self.facets is not None:
+            self.facets.update(db.session, removed=[pair for row in rows for pair in self.facets.pairs(row._asdict())])
+        db.session.commit()
+        return len(ids)
+
+    def archive_batch(self, cutoff):
+        """Move up to ``batch_size`` inactive jobs whose deadline is before ``cutoff`` to job_archive"""
+        lift_statement_timeout(db.session.connection())
+        ids = db.session.scalars(
+            select(Job.id)
+            .where(Job.is_active == False, Job.deadline < cutoff)  # noqa: E712
+            .order_by(Job.deadline)
+            .limit(self.batch_size)
+        ).all()
+        if not ids:
+            return 0
+
+        columns = [Job.__table__.c[name] for name in self.ARCHIVED_COLUMNS]
+        db.session.execute(
+            insert(JobArchive).from_select(
+                ['job_id'] + self.ARCHIVED_COLUMNS + ['archived_at'],
+                select(Job.id, *columns, literal(datetime.utcnow())).where(Job.id.in_(ids))
+            )
+        )
+        db.session.execute(delete(Job).where(Job.id.in_(ids)).execution_options(synchronize_session=False))
+        db.session.commit()
+        return len(ids)
@@ -0,0 +1,122 @@
+import logging
+from collections import Counter
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from models import Job, JobFacet
+from location_service import locations, LOCATION_SEPARATORS
+
+def normalise_city(location):
+    """The city of a free-text location: "bangalore, Karnataka" -> "Bengaluru".
+
+    Gazetteer cities get their canonical name; anything else falls back to
+    the title-cased first part of the location.
+    """
+    city = locations.gazetteer.match(location)
+    if city is not None:
+        return city.name
+    name = ' '.join(LOCATION_SEPARATORS.split(location or '', 1)[0].split())
+    return name.title() if name else 'Unknown'
+
+class FacetService:
+    """Counts of active jobs per category, job type, experience level and city.
+
+    The counts live in the ``job_facet`` table and are adjusted by the write
+    routes in the same transaction as the job change, so the unfiltered facets
+    are a single small read. Facets for a search are grouped over the matching
+    jobs instead; both are cached by the response cache.
+    """
+
+    COLUMN_FACETS = ('category', 'job_type', 'experience')
+    FACETS = COLUMN_FACETS + ('city',)
+
+    def pairs(self, job):
+        """(facet, value) pairs a job contributes; inactive jobs contribute none.
+
+        ``job`` is a Job or a dict of column values (as used by the bulk importer).
+        """
+        get = job.get if isinstance(job, dict) else lambda name: getattr(job, name)
+        active = get('is_active')
+        if active is not None and not active:
+            return []
+        pairs = [(facet, get(facet)) for facet in self.COLUMN_FACETS if get(facet)]
+        pairs.append(('city', normalise_city(get('location'))))
+        return pairs
+
+    def update(self, session, removed=(), added=()):
+        """Apply the difference between two sets of pairs to the stored counts"""
+        deltas = Counter(added)
+        deltas.subtract(Counter(removed))
+        params = [
+            {'facet': facet, 'value': value, 'count': delta}
+            for (facet, value), delta in deltas.items() if delta
+        ]
+        if not params:
+            return
+
+        dialect = session.get_bind().dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            insert = (sqlite if dialect == 'sqlite' else postgresql).insert(JobFacet)
+            statement = insert.on_conflict_do_update(
+                index_elements=[JobFacet.facet, JobFacet.value],
+                set_={'count': JobFacet.count + insert.excluded['count']}
+            )
+            session.execute(statement, params)
+            return
+
+        for row in params:
+            updated = session.execute(
+                JobFacet.__table__.update()
+                .where(JobFacet.facet == row['facet'], JobFacet.value == row['value'])
+                .values(count=JobFacet.count + row['count'])
+            )
+            if updated.rowcount == 0:
+                session.execute(JobFacet.__table__.insert().values(**row))
+
+    def rebuild(self, conn):
+        """Recompute every count from the job table (migration and repair)"""
+        conn.execute(JobFacet.__table__.delete())
+        counts = self._group(conn, lambda column: select(column, func.count())
+                             .where(Job.is_active == True)  # noqa: E712
+                             .group_by(column))
+        rows = [
+            {'facet': facet, 'value': value, 'count': count}
+            for facet, values in counts.items() for value, count in values.items()
+        ]
+        if rows:
+            conn.execute(JobFacet.__table__.insert(), rows)
+        logging.info(f"Rebuilt {len(rows)} facet counts")
+        return len(rows)
+
+    def counts(self, session, query=None):
+        """Facet counts for all active jobs, or for the jobs matched by ``query``"""
+        if query is None:
+            counts = {facet: {} for facet in self.FACETS}
+            rows = session.execute(
+                JobFacet.__table__.select().where(JobFacet.count > 0)
+            )
+            for row in rows:
+                counts[row.facet][row.value] = row.count
+        else:
+            query = query.order_by(None)
+            counts = self._group(session, lambda column: query.with_entities(column, func.count())
+                                                                  .group_by(column).statement)
+
+        result = {facet: self._sorted(values) for facet, values in counts.items()}
+        result['total'] = sum(result['category'].values())
+        return result
+
+    def _group(self, conn, grouped):
+        """Run ``grouped(column)`` (a GROUP BY select) per facet; cities are merged after normalising"""
+        counts = {}
+        for facet in self.COLUMN_FACETS:
+            column = getattr(Job, facet)
+            counts[facet] = {value: count for value, count in conn.execute(grouped(column)) if value}
+
+        cities = Counter()
+        for location, count in conn.execute(grouped(Job.location)):
+            cities[normalise_city(location)] += count
+        counts['city'] = dict(cities)
+        return counts
+
+    def _sorted(self, values):
+        return dict(sorted(values.items(), key=lambda item: (-item[1], item[0])))
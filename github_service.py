@@ -1,9 +1,16 @@
 import os
 import json
+import time
+import hashlib
 import requests
 import base64
 import logging
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+class GitHubRateLimited(Exception):
+    """The API rate limit is exhausted for longer than we are willing to wait"""
 
 class GitHubService:
     def __init__(self):
@@ -11,36 +18,129 @@ class GitHubService:
         self.repo_owner = os.getenv('GITHUB_REPO_OWNER', '')
         self.repo_name = os.getenv('GITHUB_REPO_NAME', '')
         self.file_path = os.getenv('GITHUB_FILE_PATH', 'jobs.json')
-        self.base_url = 'https://api.github.com'
-        
+        self.base_url = os.getenv('GITHUB_API_URL', 'https://api.github.com').rstrip('/')
+        self.branch = os.getenv('GITHUB_BRANCH', 'main')
+        # Seconds of job changes coalesced into a single commit
+        self.publish_window = int(os.getenv('GITHUB_PUBLISH_WINDOW', '30'))
+        self.max_conflict_retries = 3
+        # (connect, read) seconds; requests waits forever without one
+        self.timeout = (3.05, float(os.getenv('GITHUB_TIMEOUT', '10')))
+        # Longest we sleep for the rate limit to reset before giving up (the outbox retries later)
+        self.max_rate_limit_wait = float(os.getenv('GITHUB_MAX_RATE_LIMIT_WAIT', '60'))
+        self.rate_limited_until = 0
+        # Last state we know the remote file to be in, to skip redundant calls
+        self.last_sha = None
+        self.last_content_hash = None
+        # ETag and body of the last contents GET, for conditional requests
+        self.contents_etag = None
+        self.contents_cache = None
+        self.session = self._create_session()
+    
+    def _create_session(self):
+        """One pooled keep-alive session, so calls reuse the TLS connection"""
+        session = requests.Session()
+        session.headers.update({
+            'Authorization': f'token {self.token}',
+            'Accept': 'application/vnd.github.v3+json',
+            'X-GitHub-Api-Version': '2022-11-28',
+            'User-Agent': 'jobsindia-publisher'
+        })
+        # Transient failures on reads are retried here; writes are retried by the caller
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        session.mount(self.base_url, HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry))
+        return session
+    
     def is_configured(self):
         return bool(self.token and self.repo_owner and self.repo_name)
     
+    def contents_url(self):
+        return f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}/contents/{self.file_path}"
+    
+    def request(self, method, url, **kwargs):
+        """Send an API request, waiting out (or reporting) rate limits from the response headers"""
+        kwargs.setdefault('timeout', self.timeout)
+        
+        for attempt in range(2):
+            wait = self.rate_limited_until - time.time()
+            if wait > self.max_rate_limit_wait:
+                raise GitHubRateLimited(f"GitHub rate limit resets in {wait:.0f}s")
+            if wait > 0:
+                logging.warning(f"GitHub rate limit exhausted, waiting {wait:.0f}s")
+                time.sleep(wait)
+            
+            response = self.session.request(method, url, **kwargs)
+            
+            if response.status_code in (403, 429) and self._note_rate_limit(response):
+                # One wait-and-retry; a second limit hit is left to the caller's retry policy
+                continue
+            
+            if response.headers.get('X-RateLimit-Remaining') == '0':
+                self.rate_limited_until = self._reset_time(response)
+            return response
+        
+        return response
+    
+    def _note_rate_limit(self, response):
+        """Record when a rate-limited request may be retried; False if the 403 is not a rate limit"""
+        retry_after = response.headers.get('Retry-After')
+        if retry_after is not None:
+            # Secondary (abuse) limits say how long to back off directly
+            self.rate_limited_until = time.time() + float(retry_after)
+            return True
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            self.rate_limited_until = self._reset_time(response)
+            return True
+        return False
+    
+    def _reset_time(self, response):
+        # The reset header has whole-second resolution; one more second covers rounding and clock skew
+        reset = response.headers.get('X-RateLimit-Reset')
+        return float(reset) + 1 if reset else time.time() + 60
+    
+    def get_contents(self):
+        """Fetch the jobs file's contents API entry, or None if it does not exist.
+        
+        Repeat fetches send If-None-Match; a 304 reuses the cached entry and does
+        not count against the rate limit.
+        """
+        headers = {'If-None-Match': self.contents_etag} if self.contents_etag else {}
+        response = self.request('GET', self.contents_url(), headers=headers, params={'ref': self.branch})
+        
+        if response.status_code == 304:
+            return self.contents_cache
+        
+        if response.status_code == 404:
+            # File doesn't exist yet
+            self.contents_etag = None
+            self.contents_cache = None
+            return None
+        
+        if response.status_code == 200:
+            self.contents_cache = response.json()
+            self.contents_etag = response.headers.get('ETag')
+            return self.contents_cache
+        
+        raise RuntimeError(f"GitHub API response: {response.status_code}")
+    
     def get_file_content(self):
         """Get current content of jobs file from GitHub"""
         if not self.is_configured():
             return []
         
         try:
-            url = f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}/contents/{self.file_path}"
-            headers = {
-                'Authorization': f'token {self.token}',
-                'Accept': 'application/vnd.github.v3+json'
-            }
-            
-            response = requests.get(url, headers=headers)
-            
-            if response.status_code == 404:
-                # File doesn't exist yet
+            entry = self.get_contents()
+            if entry is None:
                 return []
             
-            if response.status_code == 200:
-                content_data = response.json()
-                content = base64.b64decode(content_data['content']).decode('utf-8')
-                return json.loads(content)
-            
-            logging.warning(f"GitHub API response: {response.status_code}")
-            return []
+            content = base64.b64decode(entry['content']).decode('utf-8')
+            return json.loads(content)
         
         except Exception as e:
             logging.error(f"Error getting GitHub file content: {str(e)}")
@@ -68,47 +168,78 @@ class GitHubService:
             logging.error(f"Error saving job to GitHub: {str(e)}")
             return False
     
+    def publish_jobs(self, jobs_data):
+        """Replace the jobs file with a full snapshot, skipping the push if nothing changed"""
+        if not self.is_configured():
+            logging.warning("GitHub not configured, skipping publish")
+            return False
+        
+        return self.update_jobs_file(jobs_data)
+    
     def update_jobs_file(self, jobs_data):
         """Update the jobs file in GitHub"""
         if not self.is_configured():
             return False
         
         try:
-            url = f"{self.base_url}/repos/{self.repo_owner}/{self.repo_name}/contents/{self.file_path}"
-            headers = {
-                'Authorization': f'token {self.token}',
-                'Accept': 'application/vnd.github.v3+json'
-            }
-            
-            # Get current file SHA if it exists
-            sha = None
-            response = requests.get(url, headers=headers)
-            if response.status_code == 200:
-                sha = response.json()['sha']
+            url = self.contents_url()
             
             # Prepare new content
             new_content = json.dumps(jobs_data, indent=2, ensure_ascii=False)
-            encoded_content = base64.b64encode(new_content.encode('utf-8')).decode('utf-8')
-            
-            # Prepare update data
-            update_data = {
-                'message': f'Update jobs data - {datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")}',
-                'content': encoded_content,
-                'branch': 'main'
-            }
+            content_hash = hashlib.sha256(new_content.encode('utf-8')).hexdigest()
             
-            if sha:
-                update_data['sha'] = sha
+            if content_hash == self.last_content_hash:
+                logging.info("Jobs data unchanged, skipping GitHub update")
+                return True
             
-            # Update file
-            response = requests.put(url, headers=headers, json=update_data)
+            encoded_content = base64.b64encode(new_content.encode('utf-8')).decode('utf-8')
             
-            if response.status_code in [200, 201]:
-                logging.info("Jobs data successfully saved to GitHub")
-                return True
-            else:
+            for attempt in range(self.max_conflict_retries + 1):
+                # Only look up the SHA when we have no cached one (or it went stale)
+                sha = self.last_sha
+                if sha is None:
+                    remote = self.get_contents()
+                    if remote is not None:
+                        sha = remote['sha']
+                        remote_content = base64.b64decode(remote['content'])
+                        if hashlib.sha256(remote_content).hexdigest() == content_hash:
+                            self.last_sha = sha
+                            self.last_content_hash = content_hash
+                            logging.info("GitHub already has these jobs, skipping update")
+                            return True
+                
+                # Prepare update data
+                update_data = {
+                    'message': f'Update jobs data - {datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")}',
+                    'content': encoded_content,
+                    'branch': self.branch
+                }
+                
+                if sha:
+                    update_data['sha'] = sha
+                
+                # Update file
+                response = self.request('PUT', url, json=update_data)
+                
+                if response.status_code in [200, 201]:
+                    self.last_sha = response.json()['content']['sha']
+                    self.last_content_hash = content_hash
+                    logging.info("Jobs data successfully saved to GitHub")
+                    return True
+                
+                if response.status_code in [409, 422]:
+                    # Someone else committed the file; our snapshot comes from the
+                    # database, so re-read the SHA and push it on top
+                    logging.warning(f"GitHub SHA conflict ({response.status_code}), retrying with fresh SHA")
+                    self.last_sha = None
+                    self.last_content_hash = None
+                    continue
+                
                 logging.error(f"GitHub update failed: {response.status_code} - {response.text}")
                 return False
+            
+            logging.error("GitHub update failed: too many SHA conflicts")
+            return False
         
         except Exception as e:
             logging.error(f"Error updating GitHub file: {str(e)}")
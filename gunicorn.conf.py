@@ -0,0 +1,55 @@
+"""Production gunicorn settings, loaded automatically by `gunicorn` from this directory.
+
+Everything can be overridden from the environment:
+
+    GUNICORN_WORKER_CLASS   sync, gthread (default) or gevent
+    GUNICORN_WORKERS        worker processes (default 2 * CPUs + 1)
+    GUNICORN_THREADS        threads per gthread worker (default 4)
+    GUNICORN_CONNECTIONS    concurrent connections per gevent worker (default 200)
+    GUNICORN_MAX_REQUESTS   recycle a worker after this many requests (default 1000)
+    GUNICORN_TIMEOUT        seconds before a silent worker is killed (default 30)
+    PORT                    listen port (default 5000)
+    LOG_LEVEL               gunicorn and application log level (default info)
+"""
+import os
+import multiprocessing
+
+wsgi_app = 'main:app'
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', '4'))
+worker_connections = int(os.environ.get('GUNICORN_CONNECTIONS', '200'))
+
+# Import the app (models, migrations, services) once in the master and fork it
+preload_app = True
+
+# Recycle workers periodically, staggered so they do not all restart at once
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = max(max_requests // 10, 1)
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = 30
+keepalive = 5
+
+loglevel = os.environ.get('LOG_LEVEL', 'info').lower()
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-')
+errorlog = '-'
+
+def when_ready(server):
+    # The preloaded app is already imported here. In-process events only reach
+    # clients of the worker that published them
+    from routes import events
+    if server.cfg.workers > 1 and not events.backend.shared:
+        server.log.warning(f"Job events are kept in-process but {server.cfg.workers} workers are running; "
+                           "open pages only see changes made through their own worker. "
+                           "Set EVENTS_URL (or CACHE_URL) to a redis:// URL to share them")
+
+def post_fork(server, worker):
+    # Connections opened by the master while preloading must not be shared
+    # between forked workers; each worker opens its own pool on first use
+    from app import app, db
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=False)
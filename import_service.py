@@ -0,0 +1,245 @@
+import io
+import os
+import csv
+import json
+import time
+import logging
+from datetime import datetime
+from openpyxl import load_workbook
+from app import db
+from models import Job
+from lookup_service import lookups
+
+class JobImportError(Exception):
+    """Raised when an upload cannot be read at all (as opposed to a bad row)"""
+    pass
+
+class JobImporter:
+    """Bulk-loads jobs from CSV, XLSX, JSON or JSON Lines files.
+
+    Rows are parsed one at a time, validated with the same rules as the job
+    form, de-duplicated on (title, company, location) against both the file and
+    the database, and inserted in multi-row batches inside one transaction.
+    """
+
+    FORMATS = ('csv', 'xlsx', 'json', 'jsonl')
+    MAX_REPORTED_ERRORS = 1000
+    READ_CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, batch_size=500, facets=None):
+        self.batch_size = batch_size
+        # FacetService whose counts are adjusted in the import transaction
+        self.facets = facets
+
+    def detect_format(self, filename, declared=None):
+        fmt = (declared or os.path.splitext(filename or '')[1].lstrip('.')).lower()
+        if fmt == 'ndjson':
+            fmt = 'jsonl'
+        if fmt not in self.FORMATS:
+            raise JobImportError(f"Unsupported import format: {fmt or 'unknown'}")
+        return fmt
+
+    def import_file(self, file_obj, fmt):
+        """Import every row of ``file_obj`` and return a summary with per-row errors"""
+        started = time.perf_counter()
+        result = {
+            'format': fmt,
+            'total_rows': 0,
+            'inserted': 0,
+            'duplicates': 0,
+            'invalid': 0,
+            'errors': [],
+            'job_ids': []
+        }
+        seen = set()
+        batch = []
+
+        try:
+            for row_number, data in self.iter_rows(file_obj, fmt):
+                result['total_rows'] += 1
+
+                values, error = self._prepare(data)
+                if error:
+                    self._record_error(result, row_number, error)
+                    result['invalid'] += 1
+                    continue
+
+                key = self._dedupe_key(values)
+                if key in seen:
+                    self._record_error(result, row_number, 'Duplicate of an earlier row')
+                    result['duplicates'] += 1
+                    continue
+                seen.add(key)
+
+                batch.append((row_number, values))
+                if len(batch) >= self.batch_size:
+                    self._flush(batch, result)
+                    batch = []
+
+            self._flush(batch, result)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        result['errors'].sort(key=lambda error: error['row'])
+        elapsed = time.perf_counter() - started
+        result['elapsed_seconds'] = round(elapsed, 3)
+        result['rows_per_second'] = round(result['total_rows'] / elapsed, 1) if elapsed else None
+        logging.info(f"Imported {result['inserted']} of {result['total_rows']} jobs "
+                     f"({result['rows_per_second']} rows/sec)")
+        return result
+
+    def iter_rows(self, file_obj, fmt):
+        """Yield (row_number, dict) pairs without loading the whole file"""
+        if fmt == 'csv':
+            return self._iter_csv(file_obj)
+        if fmt == 'xlsx':
+            return self._iter_xlsx(file_obj)
+        if fmt == 'jsonl':
+            return self._iter_jsonl(file_obj)
+        return self._iter_json(file_obj)
+
+    def _iter_csv(self, file_obj):
+        text = io.TextIOWrapper(file_obj, encoding='utf-8-sig', newline='')
+        reader = csv.reader(text)
+        header = self._normalise_header(next(reader, []))
+        for row in reader:
+            if any(cell.strip() for cell in row):
+                yield reader.line_num, self._row_dict(header, row)
+
+    def _iter_xlsx(self, file_obj):
+        try:
+            workbook = load_workbook(file_obj, read_only=True, data_only=True)
+        except Exception as e:
+            raise JobImportError(f"Could not read XLSX file: {str(e)}")
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = self._normalise_header(next(rows, ()))
+            for row_number, row in enumerate(rows, 2):
+                if any(cell not in (None, '') for cell in row):
+                    yield row_number, self._row_dict(header, row)
+        finally:
+            workbook.close()
+
+    def _iter_jsonl(self, file_obj):
+        text = io.TextIOWrapper(file_obj, encoding='utf-8-sig')
+        for row_number, line in enumerate(text, 1):
+            if line.strip():
+                try:
+                    yield row_number, json.loads(line)
+                except ValueError as e:
+                    yield row_number, JobImportError(f"Invalid JSON: {str(e)}")
+
+    def _iter_json(self, file_obj):
+        """Incrementally decode a top-level JSON array of job objects"""
+        text = io.TextIOWrapper(file_obj, encoding='utf-8-sig')
+        decoder = json.JSONDecoder()
+        buffer = ''
+        position = 0
+        started = False
+        row_number = 0
+        eof = False
+
+        while True:
+            # Skip separators between array elements
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+            if position < len(buffer) and not started:
+                if buffer[position] != '[':
+                    raise JobImportError("JSON import must be an array of job objects")
+                started = True
+                position += 1
+                continue
+            if position < len(buffer) and buffer[position] == ']':
+                return
+
+            try:
+                item, end = decoder.raw_decode(buffer, position)
+            except ValueError:
+                if eof:
+                    if buffer[position:].strip():
+                        raise JobImportError("Truncated or invalid JSON array")
+                    return
+                chunk = text.read(self.READ_CHUNK_SIZE)
+                eof = not chunk
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+
+            row_number += 1
+            position = end
+            yield row_number, item
+
+    def _normalise_header(self, header):
+        # Spreadsheet headers such as "Job Type" or "Application URL" map to job fields
+        fields = []
+        for name in header:
+            field = str(name or '').strip().lower().replace(' ', '_')
+            fields.append(field if field in Job.FIELDS else None)
+        return fields
+
+    def _row_dict(self, header, row):
+        return {field: value for field, value in zip(header, row) if field and value not in (None, '')}
+
+    def _prepare(self, data):
+        if isinstance(data, Exception):
+            return None, str(data)
+        if not isinstance(data, dict):
+            return None, 'Row is not an object'
+
+        data = {key: value.strip() if isinstance(value, str) else value for key, value in data.items()}
+        error = Job.validate(data)
+        if error:
+            return None, error
+
+        try:
+            values = Job.values_from_dict(data)
+        except ValueError as e:
+            return None, f'Invalid deadline: {str(e)}'
+
+        for field, value in values.items():
+            column_type = Job.__table__.c[field].type
+            # Spreadsheet cells may hold numbers in text columns
+            if value is not None and column_type.python_type is str and not isinstance(value, str):
+                value = values[field] = str(value)
+            length = getattr(column_type, 'length', None)
+            if length and isinstance(value, str) and len(value) > length:
+                return None, f'{field.title()} is longer than {length} characters'
+        values['posted_date'] = datetime.utcnow()
+        values['is_active'] = True
+        return values, None
+
+    def _dedupe_key(self, values):
+        return (values['title'], values['company'], values['location'])
+
+    def _flush(self, batch, result):
+        if not batch:
+            return
+
+        # Drop rows that already exist in the database
+        keys = {self._dedupe_key(values) for _, values in batch}
+        existing = set(db.session.execute(
+            db.select(Job.title, Job.company, Job.location)
+            .where(db.tuple_(Job.title, Job.company, Job.location).in_(list(keys)))
+        ).all())
+
+        rows = []
+        for row_number, values in batch:
+            if self._dedupe_key(values) in existing:
+                self._record_error(result, row_number, 'Job already exists')
+                result['duplicates'] += 1
+            else:
+                rows.append(values)
+
+        if rows:
+            lookups.ensure(db.session, [(kind, values[kind]) for values in rows for kind in lookups.KINDS])
+            ids = db.session.scalars(db.insert(Job).returning(Job.id), rows).all()
+            if self.facets is not None:
+                self.facets.update(db.session, added=[pair for values in rows for pair in self.facets.pairs(values)])
+            result['job_ids'].extend(ids)
+            result['inserted'] += len(rows)
+
+    def _record_error(self, result, row_number, error):
+        if len(result['errors']) < self.MAX_REPORTED_ERRORS:
+            result['errors'].append({'row': row_number, 'error': error})
@@ -0,0 +1,183 @@
+import os
+import re
+import csv
+import math
+from collections import namedtuple
+from sqlalchemy import false
+
+GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gazetteer.csv')
+
+City = namedtuple('City', ['id', 'name', 'state', 'state_code', 'latitude', 'longitude'])
+
+LOCATION_SEPARATORS = re.compile(r'[,/(|;]|\s-\s')
+NON_WORD = re.compile(r'[^\w\s]', re.UNICODE)
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE_LATITUDE = 111.32
+
+def location_key(text):
+    """Lowercase words of a place name with punctuation dropped: "Hubli-Dharwad." -> "hubli dharwad" """
+    return ' '.join(NON_WORD.sub(' ', str(text or '')).lower().split())
+
+def distance_km(lat1, lng1, lat2, lng2):
+    """Great-circle (haversine) distance"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+def bounding_box(latitude, longitude, radius_km):
+    """(min_lat, max_lat, min_lng, max_lng) enclosing the circle of ``radius_km`` around a point"""
+    dlat = radius_km / KM_PER_DEGREE_LATITUDE
+    # Degrees of longitude shrink towards the poles; widen the box at the circle's widest latitude
+    widest = min(abs(latitude) + dlat, 89.0)
+    dlng = radius_km / (KM_PER_DEGREE_LATITUDE * math.cos(math.radians(widest)))
+    return latitude - dlat, latitude + dlat, longitude - dlng, longitude + dlng
+
+class Gazetteer:
+    """Indian cities with canonical ids, states and coordinates, read from gazetteer.csv.
+
+    Ids are stored in ``job.city_id``; never renumber a city, only append.
+    """
+
+    def __init__(self, path=GAZETTEER_PATH):
+        self.cities = {}
+        self.by_name = {}
+        self.states = {}
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                city = City(int(row['id']), row['city'], row['state'], row['state_code'],
+                            float(row['latitude']), float(row['longitude']))
+                self.cities[city.id] = city
+                names = [city.name] + [alias for alias in row['aliases'].split('|') if alias]
+                for name in names:
+                    self.by_name.setdefault(location_key(name), city)
+                self.states[location_key(city.state)] = city.state_code
+                self.states[city.state_code.lower()] = city.state_code
+        # Longest place name, in words, tried when scanning free text
+        self.max_name_words = max(len(name.split()) for name in self.by_name)
+
+    def lookup(self, name):
+        """The city for a name, alias or id, or None"""
+        name = str(name).strip()
+        if name.isdigit():
+            return self.cities.get(int(name))
+        return self.by_name.get(location_key(name))
+
+    def state_code(self, name):
+        return self.states.get(location_key(name))
+
+    def match(self, location):
+        """The gazetteer city a free-text location refers to, or None.
+
+        Comma/slash separated parts are tried in order, most specific first
+        ("Thane West, Mumbai" is Thane): the whole part, then runs of words
+        within it, longest first ("Whitefield Bangalore", "Remote - Pune").
+        """
+        for part in LOCATION_SEPARATORS.split(str(location or '')):
+            words = location_key(part).split()
+            for size in range(min(self.max_name_words, len(words)), 0, -1):
+                for start in range(len(words) - size + 1):
+                    city = self.by_name.get(' '.join(words[start:start + size]))
+                    if city is not None:
+                        return city
+        return None
+
+    def within(self, latitude, longitude, radius_km):
+        """Ids of the cities within ``radius_km`` of a point"""
+        return [
+            city.id for city in self.cities.values()
+            if distance_km(latitude, longitude, city.latitude, city.longitude) <= radius_km
+        ]
+
+class LocationService:
+    """Structured locations for jobs: canonical city/state from the gazetteer, and city/state/radius filters"""
+
+    DEFAULT_RADIUS_KM = 25
+    MAX_RADIUS_KM = 500
+
+    def __init__(self, gazetteer=None):
+        self.gazetteer = gazetteer or Gazetteer()
+
+    def normalise(self, location):
+        """Column values for a job's location; all None when the city is not in the gazetteer"""
+        city = self.gazetteer.match(location)
+        if city is None:
+            return {'city_id': None, 'state_code': None, 'latitude': None, 'longitude': None}
+        return {
+            'city_id': city.id,
+            'state_code': city.state_code,
+            'latitude': city.latitude,
+            'longitude': city.longitude
+        }
+
+    def parse_filter(self, args):
+        """Location filter from request args (``city``, ``state``, ``near`` + ``radius_km``), or None.
+
+        Raises ValueError for a ``near`` point that cannot be placed or a bad radius.
+        """
+        place = {}
+        if args.get('city'):
+            city = self.gazetteer.lookup(args['city'])
+            place['city_id'] = city.id if city else None
+        if args.get('state'):
+            place['state_code'] = self.gazetteer.state_code(args['state'])
+        if args.get('near'):
+            place['near'] = self._point(args['near'])
+            radius = args.get('radius_km', self.DEFAULT_RADIUS_KM)
+            try:
+                radius = float(radius)
+            except (TypeError, ValueError):
+                raise ValueError('radius_km must be a number')
+            if not 0 < radius <= self.MAX_RADIUS_KM:
+                raise ValueError(f'radius_km must be between 0 and {self.MAX_RADIUS_KM}')
+            place['radius_km'] = radius
+        return place or None
+
+    def apply(self, query, job, place):
+        """Filter ``query`` on the ``job`` model's location columns"""
+        if not place:
+            return query
+        if 'city_id' in place:
+            if place['city_id'] is None:
+                return query.filter(false())
+            query = query.filter(job.city_id == place['city_id'])
+        if 'state_code' in place:
+            if place['state_code'] is None:
+                return query.filter(false())
+            query = query.filter(job.state_code == place['state_code'])
+        if 'near' in place:
+            latitude, longitude = place['near']
+            radius = place['radius_km']
+            min_lat, max_lat, min_lng, max_lng = bounding_box(latitude, longitude, radius)
+            # The box is a range scan on the (latitude, longitude) index; the exact
+            # distance check only runs on the few gazetteer cities, which trims its corners
+            city_ids = self.gazetteer.within(latitude, longitude, radius)
+            if not city_ids:
+                return query.filter(false())
+            query = query.filter(
+                job.latitude.between(min_lat, max_lat),
+                job.longitude.between(min_lng, max_lng),
+                job.city_id.in_(city_ids)
+            )
+        return query
+
+    def _point(self, near):
+        """(latitude, longitude) for a city name/id or a "lat,lng" pair"""
+        parts = near.split(',')
+        if len(parts) == 2:
+            try:
+                latitude, longitude = float(parts[0]), float(parts[1])
+            except ValueError:
+                pass
+            else:
+                if not (-90 <= latitude <= 90 and -180 <= longitude <= 180):
+                    raise ValueError('near coordinates are out of range')
+                return latitude, longitude
+        city = self.gazetteer.lookup(near)
+        if city is None:
+            raise ValueError(f'Unknown city: {near}')
+        return city.latitude, city.longitude
+
+locations = LocationService()
@@ -0,0 +1,169 @@
+import time
+import logging
+import threading
+from sqlalchemy import types, table, column, select, insert, event, inspect
+from sqlalchemy.dialects import sqlite, postgresql
+from sqlalchemy.orm import Session
+
+class LookupMap:
+    """In-process translation between lookup names and their integer codes.
+
+    Job rows store ``category``, ``job_type`` and ``experience`` as small
+    integers referencing the ``lookup_<kind>`` tables; the API keeps using the
+    names. The tables are tiny and only grow, so every process caches them in
+    full and reloads only on a miss. Every row read shares the cached name
+    strings instead of holding copies of its own.
+    """
+
+    KINDS = ('category', 'job_type', 'experience')
+
+    # Inserted first so the usual values get the smallest codes
+    DEFAULTS = {
+        'category': ['government', 'it', 'banking', 'healthcare', 'other'],
+        'job_type': ['Full-time', 'Part-time', 'Contract', 'Freelance'],
+        'experience': ['Entry Level', 'Mid Level', 'Senior Level', 'Executive'],
+    }
+
+    def __init__(self):
+        self.codes = {kind: {} for kind in self.KINDS}
+        self.names = {kind: {} for kind in self.KINDS}
+        self.lock = threading.Lock()
+        # Unknown filter values must not turn every request into a reload
+        self.reload_interval = 1.0
+        self.loaded_at = None
+
+    def table(self, kind):
+        return table(f'lookup_{kind}', column('id'), column('name'))
+
+    def code(self, kind, name):
+        """Code for ``name``, or None if it is not in the lookup table"""
+        code = self.codes[kind].get(name)
+        if code is None and self._reload():
+            code = self.codes[kind].get(name)
+        return code
+
+    def name(self, kind, code):
+        name = self.names[kind].get(code)
+        if name is None and self._reload(force=True):
+            name = self.names[kind].get(code)
+            if name is None:
+                logging.warning(f"Unknown {kind} code {code}")
+        return name
+
+    def ensure(self, session, values):
+        """Give every (kind, name) in ``values`` a code, inserting new names in the session's transaction"""
+        missing = {(kind, name) for kind, name in values if name is not None and name not in self.codes[kind]}
+        if not missing:
+            return
+        self._reload(force=True)
+
+        dialect = session.get_bind().dialect.name
+        pending = session.info.setdefault('lookup_pending', [])
+        for kind, name in sorted(missing):
+            if name in self.codes[kind]:
+                continue
+            lookup = self.table(kind)
+            if dialect in ('sqlite', 'postgresql'):
+                # Another worker may be adding the same name
+                statement = (sqlite if dialect == 'sqlite' else postgresql).insert(lookup) \
+                    .values(name=name).on_conflict_do_nothing(index_elements=['name'])
+            else:
+                statement = insert(lookup).values(name=name)
+            session.execute(statement)
+            code = session.execute(select(lookup.c.id).where(lookup.c.name == name)).scalar_one()
+            self._add(kind, {code: name})
+            pending.append((kind, name))
+
+    def seed(self, conn):
+        """Insert the default names that are not there yet (run by migrations)"""
+        for kind, names in self.DEFAULTS.items():
+            lookup = self.table(kind)
+            existing = set(conn.execute(select(lookup.c.name)).scalars())
+            for name in names:
+                if name not in existing:
+                    conn.execute(insert(lookup).values(name=name))
+
+    def discard(self, values):
+        """Forget names whose insert was rolled back"""
+        with self.lock:
+            for kind, name in values:
+                code = self.codes[kind].pop(name, None)
+                self.names[kind].pop(code, None)
+
+    def load(self, conn):
+        """Read every code through ``conn``, e.g. within the transaction that inserted them"""
+        loaded = {}
+        for kind in self.KINDS:
+            lookup = self.table(kind)
+            loaded[kind] = dict(conn.execute(select(lookup.c.id, lookup.c.name)).all())
+        for kind, names in loaded.items():
+            self._add(kind, names)
+
+    def _reload(self, force=False):
+        now = time.monotonic()
+        if not force and self.loaded_at is not None and now - self.loaded_at < self.reload_interval:
+            return False
+        from app import db
+        with db.engine.connect() as conn:
+            self.load(conn)
+        self.loaded_at = now
+        return True
+
+    def _add(self, kind, names):
+        # Merged rather than replaced, so codes inserted by an open transaction survive a reload
+        with self.lock:
+            for code, name in names.items():
+                self.codes[kind][name] = code
+                self.names[kind][code] = name
+
+lookups = LookupMap()
+
+class LookupCode(types.TypeDecorator):
+    """A short name stored as a small integer code from the ``lookup_<kind>`` table"""
+
+    impl = types.SmallInteger
+    cache_ok = True
+
+    def __init__(self, kind, length=50):
+        super().__init__()
+        self.kind = kind
+        # Checked by the importer like a String(length) column
+        self.length = length
+
+    def process_bind_param(self, value, dialect):
+        # Unknown names become NULL: filters match nothing and writes hit NOT NULL
+        return lookups.code(self.kind, value) if value is not None else None
+
+    def process_literal_param(self, value, dialect):
+        code = self.process_bind_param(value, dialect)
+        return 'NULL' if code is None else str(int(code))
+
+    def process_result_value(self, value, dialect):
+        return lookups.name(self.kind, value) if value is not None else None
+
+    @property
+    def python_type(self):
+        return str
+
+@event.listens_for(Session, 'before_flush')
+def ensure_lookup_codes(session, flush_context, instances):
+    """Register new lookup names of objects about to be written"""
+    values = []
+    for obj in list(session.new) + list(session.dirty):
+        mapped_table = getattr(obj, '__table__', None)
+        if mapped_table is None:
+            continue
+        state = inspect(obj)
+        for col in mapped_table.columns:
+            if isinstance(col.type, LookupCode):
+                # Only assigned values; column defaults are seeded names
+                values.extend((col.type.kind, name) for name in state.attrs[col.key].history.added)
+    lookups.ensure(session, values)
+
+@event.listens_for(Session, 'after_commit')
+def keep_lookup_codes(session):
+    session.info.pop('lookup_pending', None)
+
+@event.listens_for(Session, 'after_rollback')
+def discard_lookup_codes(session):
+    lookups.discard(session.info.pop('lookup_pending', []))
@@ -1,4 +1,7 @@
+import os
 from app import app
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000, debug=True)
+    # Development server only; production runs `gunicorn` with gunicorn.conf.py
+    app.run(host='0.0.0.0', port=int(os.environ.get('PORT', '5000')),
+            debug=os.environ.get('FLASK_DEBUG', '1') == '1')
@@ -0,0 +1,208 @@
+import os
+import hmac
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from flask import g, request, has_request_context
+from sqlalchemy import event
+
+# Seconds; the upper bounds of the latency histograms
+DURATION_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+@contextmanager
+def phase(name):
+    """Add the time spent in the block to the current request's ``name`` phase.
+
+    Phases show up in the Server-Timing header and the phase histogram; outside
+    a request the block just runs.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        if has_request_context():
+            phases = g.setdefault('metrics_phases', {})
+            phases[name] = phases.get(name, 0) + time.perf_counter() - started
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus exposition layout"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += value
+        self.count += 1
+
+class Metrics:
+    """Per-route request timings, SQL counts and response sizes.
+
+    Values live in process memory, so each gunicorn worker reports its own
+    series; Prometheus aggregates them across scrape targets. Timings of
+    streamed responses stop when the first chunk is handed to the server.
+    """
+
+    HELP = {
+        'http_requests_total': ('counter', 'Requests handled, by route, method and status'),
+        'http_request_duration_seconds': ('histogram', 'Time spent in the view and hooks'),
+        'http_response_size_bytes': ('histogram', 'Response body size when known up front'),
+        'http_request_phase_seconds': ('histogram', 'Time per request spent in a named phase (db, build, encode)'),
+        'db_queries_total': ('counter', 'SQL statements executed'),
+        'db_query_duration_seconds': ('histogram', 'SQL statement execution time'),
+        'db_slow_queries_total': ('counter', 'SQL statements slower than SLOW_QUERY_MS'),
+        'jobs_expired_total': ('counter', 'Jobs deactivated because their deadline passed'),
+        'jobs_archived_total': ('counter', 'Expired jobs moved to the archive table'),
+        'jobs_expiry_run_seconds': ('histogram', 'Duration of an expiry sweep'),
+    }
+
+    def __init__(self):
+        self.enabled = os.getenv('METRICS_ENABLED', '1') == '1'
+        self.server_timing = os.getenv('SERVER_TIMING', '1') == '1'
+        self.slow_query_seconds = float(os.getenv('SLOW_QUERY_MS', '200')) / 1000
+        self.token = os.getenv('METRICS_TOKEN', '')
+        # Internal counts and timings; only readable by anyone when explicitly opted in
+        self.public = os.getenv('METRICS_PUBLIC', '0') == '1'
+        self.counters = {}
+        self.histograms = {}
+        self.lock = threading.Lock()
+
+    def init_app(self, app, *engines):
+        if not self.enabled:
+            return
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        for engine in engines:
+            self.instrument_engine(engine)
+
+    def instrument_engine(self, engine):
+        """Count and time every statement run on ``engine``, logging slow ones"""
+        event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+    def inc(self, name, labels, value=1):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name, labels, value, buckets=DURATION_BUCKETS):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    def authorized(self):
+        """Whether the request carries the METRICS_TOKEN bearer token, or METRICS_PUBLIC=1 is set"""
+        if self.public:
+            return True
+        if not self.token:
+            return False
+        return hmac.compare_digest(request.headers.get('Authorization', ''), f"Bearer {self.token}")
+
+    def render(self):
+        """Every series in the Prometheus text exposition format"""
+        with self.lock:
+            counters = sorted(self.counters.items())
+            histograms = sorted(
+                (key, (list(h.buckets), list(h.counts), h.total, h.count))
+                for key, h in self.histograms.items()
+            )
+
+        lines = []
+        described = set()
+
+        def describe(name):
+            if name not in described:
+                described.add(name)
+                kind, text = self.HELP.get(name, ('untyped', name))
+                lines.append(f"# HELP {name} {text}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), value in counters:
+            describe(name)
+            lines.append(f"{name}{self._labels(labels)} {value}")
+
+        for (name, labels), (buckets, counts, total, count) in histograms:
+            describe(name)
+            for bound, bucket_count in zip(buckets, counts):
+                lines.append(f"{name}_bucket{self._labels(labels + (('le', str(bound)),))} {bucket_count}")
+            lines.append(f"{name}_bucket{self._labels(labels + (('le', '+Inf'),))} {count}")
+            lines.append(f"{name}_sum{self._labels(labels)} {total:.6f}")
+            lines.append(f"{name}_count{self._labels(labels)} {count}")
+
+        return '\n'.join(lines) + '\n'
+
+    def _labels(self, labels):
+        if not labels:
+            return ''
+        pairs = []
+        for key, value in labels:
+            value = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+            pairs.append(f'{key}="{value}"')
+        return '{' + ','.join(pairs) + '}'
+
+    def _route(self):
+        if not has_request_context():
+            return 'background'
+        return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+    def _before_request(self):
+        g.metrics_started = time.perf_counter()
+        g.metrics_queries = 0
+        g.metrics_phases = {}
+
+    def _after_request(self, response):
+        started = g.get('metrics_started')
+        if started is None:
+            return response
+
+        elapsed = time.perf_counter() - started
+        route = self._route()
+        phases = g.get('metrics_phases', {})
+
+        self.inc('http_requests_total', {'route': route, 'method': request.method, 'status': response.status_code})
+        self.observe('http_request_duration_seconds', {'route': route}, elapsed)
+        if response.content_length is not None:
+            self.observe('http_response_size_bytes', {'route': route}, response.content_length, SIZE_BUCKETS)
+        for name, seconds in phases.items():
+            self.observe('http_request_phase_seconds', {'route': route, 'phase': name}, seconds)
+
+        if self.server_timing:
+            entries = [f'{name};dur={seconds * 1000:.2f}' for name, seconds in phases.items()]
+            if 'db' in phases:
+                entries[list(phases).index('db')] += f';desc="queries={g.metrics_queries}"'
+            entries.append(f'total;dur={elapsed * 1000:.2f}')
+            response.headers['Server-Timing'] = ', '.join(entries)
+
+        return response
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('metrics_query_started', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        stack = conn.info.get('metrics_query_started')
+        if not stack:
+            return
+        elapsed = time.perf_counter() - stack.pop()
+        route = self._route()
+
+        self.inc('db_queries_total', {'route': route})
+        self.observe('db_query_duration_seconds', {'route': route}, elapsed)
+
+        if has_request_context() and 'metrics_started' in g:
+            g.metrics_queries += 1
+            g.metrics_phases['db'] = g.metrics_phases.get('db', 0) + elapsed
+
+        if elapsed >= self.slow_query_seconds:
+            self.inc('db_slow_queries_total', {'route': route})
+            # Parameters are left out: they can hold password hashes and user input
+            logging.warning(f"Slow query ({elapsed * 1000:.1f} ms) in {route}: {' '.join(statement.split())[:1000]}")
@@ -0,0 +1,435 @@
+import logging
+from contextlib import contextmanager
+from datetime import datetime
+import click
+from sqlalchemy import (MetaData, Table, Column, Index, ForeignKey, Integer, String, Text, Boolean, DateTime,
+                        text, select, bindparam, table, column)
+from app import app, db
+from db_config import lift_statement_timeout
+from models import Job
+from search_service import SearchService
+from facet_service import FacetService
+from changelog_service import ChangeLog
+from lookup_service import lookups
+from location_service import locations
+from salary_service import salaries
+
+# Kept out of db.metadata so the bookkeeping table is never touched by create_all
+schema_metadata = MetaData()
+schema_migrations = Table(
+    'schema_migrations', schema_metadata,
+    Column('version', Integer, primary_key=True),
+    Column('description', String(200), nullable=False),
+    Column('applied_at', DateTime, nullable=False)
+)
+
+# Tables as the migration that added them first created them; migrations never
+# build DDL from the current models, so a database of any age upgrades step by step
+frozen_metadata = MetaData()
+
+user_table = Table(
+    'user', frozen_metadata,
+    Column('id', Integer, primary_key=True),
+    Column('username', String(64), unique=True, nullable=False),
+    Column('email', String(120), unique=True, nullable=False),
+    Column('password_hash', String(256)),
+    Column('is_admin', Boolean),
+    Column('created_at', DateTime)
+)
+
+job_table = Table(
+    'job', frozen_metadata,
+    Column('id', Integer, primary_key=True),
+    Column('title', String(200), nullable=False),
+    Column('company', String(200), nullable=False),
+    Column('location', String(200), nullable=False),
+    Column('category', String(50), nullable=False),
+    Column('job_type', String(50), nullable=False),
+    Column('experience', String(50), nullable=False),
+    Column('salary', String(100)),
+    Column('description', Text, nullable=False),
+    Column('requirements', Text),
+    Column('application_url', String(500)),
+    Column('contact_email', String(120)),
+    Column('posted_date', DateTime),
+    Column('deadline', DateTime),
+    Column('is_active', Boolean),
+    Column('created_by', Integer, ForeignKey('user.id'))
+)
+
+outbox_event_table = Table(
+    'outbox_event', frozen_metadata,
+    Column('id', Integer, primary_key=True),
+    Column('kind', String(50), nullable=False),
+    Column('payload', Text, nullable=False),
+    Column('status', String(20), nullable=False),
+    Column('attempts', Integer, nullable=False),
+    Column('next_attempt_at', DateTime, nullable=False),
+    Column('last_error', Text),
+    Column('created_at', DateTime),
+    Index('ix_outbox_event_status_due', 'status', 'next_attempt_at')
+)
+
+job_facet_table = Table(
+    'job_facet', frozen_metadata,
+    Column('facet', String(20), primary_key=True),
+    Column('value', String(200), primary_key=True),
+    Column('count', Integer, nullable=False)
+)
+
+job_archive_table = Table(
+    'job_archive', frozen_metadata,
+    Column('id', Integer, primary_key=True),
+    Column('title', String(200), nullable=False),
+    Column('company', String(200), nullable=False),
+    Column('location', String(200), nullable=False),
+    Column('category', String(50), nullable=False),
+    Column('job_type', String(50), nullable=False),
+    Column('experience', String(50), nullable=False),
+    Column('salary', String(100)),
+    Column('description', Text, nullable=False),
+    Column('requirements', Text),
+    Column('application_url', String(500)),
+    Column('contact_email', String(120)),
+    Column('posted_date', DateTime),
+    Column('deadline', DateTime),
+    Column('created_by', Integer),
+    Column('archived_at', DateTime, nullable=False, index=True)
+)
+
+job_change_table = Table(
+    'job_change', frozen_metadata,
+    Column('id', Integer, primary_key=True),
+    Column('job_id', Integer, nullable=False),
+    Column('op', String(10), nullable=False),
+    Column('changed_at', DateTime, nullable=False, index=True)
+)
+
+def create_tables(conn, *tables):
+    for frozen in tables:
+        frozen.create(bind=conn, checkfirst=True)
+
+def create_base_tables(conn):
+    # Databases from before the migration runner already have these
+    create_tables(conn, user_table, job_table)
+
+def create_search_index(conn):
+    if conn.dialect.name == 'sqlite':
+        has_fts5 = conn.execute(text("SELECT 1 FROM pragma_module_list WHERE name = 'fts5'")).first()
+        if not has_fts5:
+            logging.warning("SQLite was built without FTS5, search will use LIKE")
+            return
+    SearchService().create_index(conn)
+
+def create_indexes(conn, indexes):
+    """Create (name, table, columns) indexes that do not exist yet"""
+    for name, table_name, columns in indexes:
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table_name} ({', '.join(columns)})"))
+
+LISTING_INDEXES = [
+    ('ix_job_active_category_posted', 'job', ('is_active', 'category', 'posted_date', 'id')),
+    ('ix_job_active_posted', 'job', ('is_active', 'posted_date', 'id')),
+    ('ix_job_active_deadline', 'job', ('is_active', 'deadline')),
+]
+
+def create_listing_indexes(conn):
+    create_indexes(conn, LISTING_INDEXES)
+
+def create_outbox(conn):
+    create_tables(conn, outbox_event_table)
+
+def create_duplicate_index(conn):
+    create_indexes(conn, [('ix_job_title_company_location', 'job', ('title', 'company', 'location'))])
+
+def create_facet_counts(conn):
+    # Filled by migration 10, which rebuilds every count once cities are normalised
+    create_tables(conn, job_facet_table)
+
+def create_archive(conn):
+    create_tables(conn, job_archive_table)
+
+def create_change_log(conn):
+    conn.execute(text("ALTER TABLE job ADD COLUMN updated_at TIMESTAMP"))
+    conn.execute(text("UPDATE job SET updated_at = posted_date"))
+    create_tables(conn, job_change_table)
+    create_indexes(conn, [('ix_job_updated_at', 'job', ('updated_at',))])
+    # After the backfill, so it is not logged as a change to every job
+    ChangeLog().create_triggers(conn)
+
+@contextmanager
+def change_log_paused(conn):
+    """Rewrite job rows without logging them, for changes that are invisible through the API"""
+    postgres = conn.dialect.name == 'postgresql'
+    if postgres:
+        conn.execute(text("ALTER TABLE job DISABLE TRIGGER job_change_log"))
+    else:
+        conn.execute(text("DROP TRIGGER IF EXISTS job_change_au"))
+    yield
+    if postgres:
+        conn.execute(text("ALTER TABLE job ENABLE TRIGGER job_change_log"))
+    else:
+        ChangeLog().create_triggers(conn)
+
+LOOKUP_KINDS = ('category', 'job_type', 'experience')
+
+lookup_tables = [
+    Table(
+        f'lookup_{kind}', frozen_metadata,
+        Column('id', Integer, primary_key=True),
+        Column('name', String(50), unique=True, nullable=False)
+    )
+    for kind in LOOKUP_KINDS
+]
+
+LOOKUP_INDEXES = [
+    ('ix_job_active_category_posted', 'job', ('is_active', 'category_id', 'posted_date', 'id')),
+    ('ix_job_job_type', 'job', ('job_type_id',)),
+    ('ix_job_experience', 'job', ('experience_id',)),
+]
+
+def create_lookup_tables(conn):
+    create_tables(conn, *lookup_tables)
+    lookups.seed(conn)
+
+    # Rewriting the codes is not a change to any job, so keep it out of the change log
+    with change_log_paused(conn):
+        conn.execute(text("DROP INDEX IF EXISTS ix_job_active_category_posted"))
+
+        for table_name in ('job', 'job_archive'):
+            for kind in LOOKUP_KINDS:
+                conn.execute(text(
+                    f"INSERT INTO lookup_{kind} (name) SELECT DISTINCT {kind} FROM {table_name} "
+                    f"WHERE {kind} IS NOT NULL AND {kind} NOT IN (SELECT name FROM lookup_{kind})"
+                ))
+                conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {kind}_id SMALLINT REFERENCES lookup_{kind} (id)"))
+                conn.execute(text(
+                    f"UPDATE {table_name} SET {kind}_id = "
+                    f"(SELECT id FROM lookup_{kind} WHERE lookup_{kind}.name = {table_name}.{kind})"
+                ))
+                conn.execute(text(f"ALTER TABLE {table_name} DROP COLUMN {kind}"))
+                if conn.dialect.name == 'postgresql':
+                    conn.execute(text(f"ALTER TABLE {table_name} ALTER COLUMN {kind}_id SET NOT NULL"))
+
+        create_indexes(conn, LOOKUP_INDEXES)
+
+LOCATION_COLUMNS = [('city_id', 'SMALLINT'), ('state_code', 'VARCHAR(2)'),
+                    ('latitude', 'FLOAT'), ('longitude', 'FLOAT')]
+
+LOCATION_INDEXES = [
+    ('ix_job_active_city_posted', 'job', ('is_active', 'city_id', 'posted_date', 'id')),
+    ('ix_job_state_code', 'job', ('state_code',)),
+    ('ix_job_latitude_longitude', 'job', ('latitude', 'longitude')),
+]
+
+# The job columns the location backfill reads and writes; updated_at is left alone
+location_job = table('job', column('location'), *(column(name) for name, _ in LOCATION_COLUMNS))
+
+def create_location_columns(conn):
+    with change_log_paused(conn):
+        for name, column_type in LOCATION_COLUMNS:
+            conn.execute(text(f"ALTER TABLE job ADD COLUMN {name} {column_type}"))
+        backfill_locations(conn)
+        create_indexes(conn, LOCATION_INDEXES)
+    # City facets are now normalised through the gazetteer. Lookup codes added by
+    # migration 9 in this same transaction are not visible to other connections yet
+    lookups.load(conn)
+    FacetService().rebuild(conn)
+
+def backfill_locations(conn, batch_size=500):
+    """Fill the structured location columns, one UPDATE per batch of distinct location strings"""
+    names = [name for name, _ in LOCATION_COLUMNS]
+    update = (location_job.update()
+              .where(location_job.c.location == bindparam('match_location'))
+              .values({name: bindparam(name) for name in names}))
+    distinct = conn.execute(select(location_job.c.location).distinct()).scalars().all()
+    for start in range(0, len(distinct), batch_size):
+        params = [{'match_location': location, **locations.normalise(location)}
+                  for location in distinct[start:start + batch_size]]
+        conn.execute(update, params)
+    return len(distinct)
+
+SALARY_INDEXES = [
+    ('ix_job_active_salary_max', 'job', ('is_active', 'salary_max', 'id')),
+    ('ix_job_active_salary_min', 'job', ('is_active', 'salary_min', 'id')),
+]
+
+# The job columns the salary backfill reads and writes; updated_at is left alone
+salary_job = table('job', column('id'), column('salary'), column('salary_min'), column('salary_max'))
+
+def create_salary_columns(conn):
+    with change_log_paused(conn):
+        for name in ('salary_min', 'salary_max'):
+            conn.execute(text(f"ALTER TABLE job ADD COLUMN {name} INTEGER"))
+        backfill_salaries(conn)
+        create_indexes(conn, SALARY_INDEXES)
+
+def backfill_salary_batch(conn, after_id, batch_size=500):
+    """Re-parse the salaries of up to ``batch_size`` jobs with ids above ``after_id``.
+
+    Only rows whose parsed range changed are written. Returns (last id seen,
+    rows updated); the id is None once every job has been visited.
+    """
+    rows = conn.execute(
+        select(salary_job.c.id, salary_job.c.salary, salary_job.c.salary_min, salary_job.c.salary_max)
+        .where(salary_job.c.id > after_id)
+        .order_by(salary_job.c.id)
+        .limit(batch_size)
+    ).all()
+    if not rows:
+        return None, 0
+
+    params = []
+    for row in rows:
+        values = salaries.normalise(row.salary)
+        if (values['salary_min'], values['salary_max']) != (row.salary_min, row.salary_max):
+            params.append({'match_id': row.id, **values})
+    if params:
+        conn.execute(
+            salary_job.update()
+            .where(salary_job.c.id == bindparam('match_id'))
+            .values(salary_min=bindparam('salary_min'), salary_max=bindparam('salary_max')),
+            params
+        )
+    return rows[-1].id, len(params)
+
+def backfill_salaries(conn, batch_size=500):
+    """Fill salary_min/salary_max for every job on one connection; returns rows updated"""
+    after_id, updated = 0, 0
+    while after_id is not None:
+        after_id, changed = backfill_salary_batch(conn, after_id, batch_size)
+        updated += changed
+    return updated
+
+def create_archive_job_id(conn):
+    # job_archive.id used to be the job's id, which SQLite hands out again once the
+    # job is deleted; existing rows keep it as their key and copy it to job_id
+    conn.execute(text("ALTER TABLE job_archive ADD COLUMN job_id INTEGER"))
+    conn.execute(text("UPDATE job_archive SET job_id = id"))
+    if conn.dialect.name == 'postgresql':
+        conn.execute(text("ALTER TABLE job_archive ALTER COLUMN job_id SET NOT NULL"))
+        # The serial sequence was never used, so move it past the copied ids
+        conn.execute(text(
+            "SELECT setval(pg_get_serial_sequence('job_archive', 'id'), COALESCE(MAX(id), 0) + 1, false) "
+            "FROM job_archive"
+        ))
+    create_indexes(conn, [('ix_job_archive_job_id', 'job_archive', ('job_id',))])
+
+# Append new migrations to the end; never renumber or edit applied ones
+MIGRATIONS = [
+    (1, 'Create base tables', create_base_tables),
+    (2, 'Full-text search index on job', create_search_index),
+    (3, 'Composite indexes for job listings and expiry', create_listing_indexes),
+    (4, 'Outbox table for background side effects', create_outbox),
+    (5, 'Index for duplicate detection on bulk import', create_duplicate_index),
+    (6, 'Facet counts table', create_facet_counts),
+    (7, 'Archive table for expired jobs', create_archive),
+    (8, 'Job updated_at column and change log', create_change_log),
+    (9, 'Lookup tables and integer codes for category, job type and experience', create_lookup_tables),
+    (10, 'Structured job location columns from the gazetteer', create_location_columns),
+    (11, 'Numeric salary range columns parsed from salary', create_salary_columns),
+    (12, 'Surrogate key for job_archive', create_archive_job_id),
+]
+
+def applied_versions(conn):
+    return {row.version for row in conn.execute(schema_migrations.select())}
+
+def upgrade():
+    """Apply every pending migration to the configured database"""
+    engine = db.engine
+    applied = []
+
+    with engine.begin() as conn:
+        if conn.dialect.name == 'postgresql':
+            # Serialise concurrent upgrades from several workers
+            conn.execute(text("SELECT pg_advisory_xact_lock(7316001)"))
+        # Index builds and backfills on large tables outlast the web request limit
+        lift_statement_timeout(conn)
+
+        schema_migrations.create(bind=conn, checkfirst=True)
+        done = applied_versions(conn)
+
+        for version, description, migrate in MIGRATIONS:
+            if version in done:
+                continue
+            logging.info(f"Applying migration {version}: {description}")
+            migrate(conn)
+            conn.execute(schema_migrations.insert().values(
+                version=version,
+                description=description,
+                applied_at=datetime.utcnow()
+            ))
+            applied.append(version)
+
+    return applied
+
+# Listing queries and the index each one is expected to use
+def hot_path_queries():
+    return {
+        'ix_job_active_posted': Job.query.filter_by(is_active=True)
+            .order_by(Job.posted_date.desc(), Job.id.desc()).limit(20),
+        'ix_job_active_category_posted': Job.query.filter_by(is_active=True, category='it')
+            .order_by(Job.posted_date.desc(), Job.id.desc()).limit(20),
+        'ix_job_active_city_posted': Job.query.filter_by(is_active=True, city_id=3)
+            .order_by(Job.posted_date.desc(), Job.id.desc()).limit(20),
+        'ix_job_active_salary_max': salaries.order(Job.query.filter(
+            Job.is_active == True,  # noqa: E712
+            Job.salary_max >= 1000000
+        ), Job, 'salary').limit(20),
+        'ix_job_active_salary_min': Job.query.filter(
+            Job.is_active == True,  # noqa: E712
+            Job.salary_min <= 600000
+        ),
+        'ix_job_active_deadline': Job.query.filter(
+            Job.is_active == True,  # noqa: E712
+            Job.deadline < db.func.current_timestamp()
+        ),
+    }
+
+def explain(query):
+    """Return the database's query plan for a Job query as a list of lines"""
+    dialect = db.engine.dialect
+    sql = str(query.statement.compile(dialect=dialect, compile_kwargs={'literal_binds': True}))
+
+    if dialect.name == 'sqlite':
+        rows = db.session.execute(text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        return [row[-1] for row in rows]
+
+    if dialect.name == 'postgresql':
+        # Small tables would otherwise be sequentially scanned regardless of indexes
+        db.session.execute(text("SET LOCAL enable_seqscan = off"))
+        rows = db.session.execute(text(f"EXPLAIN {sql}")).all()
+        return [row[0] for row in rows]
+
+    raise RuntimeError(f"EXPLAIN is not supported for {dialect.name}")
+
+def check_indexes():
+    """Map each expected index to (used, plan) for the hot-path listing queries"""
+    results = {}
+    try:
+        for index_name, query in hot_path_queries().items():
+            plan = explain(query)
+            results[index_name] = (any(index_name in line for line in plan), plan)
+    finally:
+        db.session.rollback()
+    return results
+
+@app.cli.command('db-upgrade')
+def db_upgrade_command():
+    """Apply pending database migrations."""
+    applied = upgrade()
+    if applied:
+        click.echo(f"Applied migrations: {', '.join(str(v) for v in applied)}")
+    else:
+        click.echo("Database is up to date")
+
+@app.cli.command('db-explain')
+def db_explain_command():
+    """Check that the listing queries use their indexes."""
+    ok = True
+    for index_name, (used, plan) in check_indexes().items():
+        click.echo(f"{'OK  ' if used else 'MISS'} {index_name}")
+        for line in plan:
+            click.echo(f"     {line}")
+        ok = ok and used
+    if not ok:
+        raise SystemExit(1)
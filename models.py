@@ -1,5 +1,8 @@
 from app import db
 from flask_login import UserMixin
+from lookup_service import LookupCode
+from location_service import locations
+from salary_service import salaries
 from datetime import datetime
 import json
 
@@ -21,13 +24,37 @@ class User(UserMixin, db.Model):
         }
 
 class Job(db.Model):
+    __table_args__ = (
+        # Public listings: WHERE is_active [AND category] ORDER BY posted_date DESC, id DESC
+        db.Index('ix_job_active_category_posted', 'is_active', 'category', 'posted_date', 'id'),
+        db.Index('ix_job_active_posted', 'is_active', 'posted_date', 'id'),
+        db.Index('ix_job_job_type', 'job_type'),
+        db.Index('ix_job_experience', 'experience'),
+        # City filter: WHERE is_active AND city_id = ? ORDER BY posted_date DESC, id DESC
+        db.Index('ix_job_active_city_posted', 'is_active', 'city_id', 'posted_date', 'id'),
+        db.Index('ix_job_state_code', 'state_code'),
+        # Radius search: bounding box on the coordinates
+        db.Index('ix_job_latitude_longitude', 'latitude', 'longitude'),
+        # Salary filters and sorts: WHERE is_active AND salary_max >= ? ORDER BY salary_max DESC, id DESC
+        db.Index('ix_job_active_salary_max', 'is_active', 'salary_max', 'id'),
+        db.Index('ix_job_active_salary_min', 'is_active', 'salary_min', 'id'),
+        # Expiry sweeps: WHERE is_active AND deadline < start of today
+        db.Index('ix_job_active_deadline', 'is_active', 'deadline'),
+        # Duplicate detection on bulk import
+        db.Index('ix_job_title_company_location', 'title', 'company', 'location'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(200), nullable=False)
     company = db.Column(db.String(200), nullable=False)
     location = db.Column(db.String(200), nullable=False)
-    category = db.Column(db.String(50), nullable=False)
-    job_type = db.Column(db.String(50), nullable=False, default='Full-time')
-    experience = db.Column(db.String(50), nullable=False, default='Entry Level')
+    # Integer codes into the lookup tables, read and written as names (see lookup_service)
+    category = db.Column('category_id', LookupCode('category'), db.ForeignKey('lookup_category.id'),
+                         key='category', nullable=False)
+    job_type = db.Column('job_type_id', LookupCode('job_type'), db.ForeignKey('lookup_job_type.id'),
+                         key='job_type', nullable=False, default='Full-time')
+    experience = db.Column('experience_id', LookupCode('experience'), db.ForeignKey('lookup_experience.id'),
+                           key='experience', nullable=False, default='Entry Level')
     salary = db.Column(db.String(100))
     description = db.Column(db.Text, nullable=False)
     requirements = db.Column(db.Text)
@@ -37,8 +64,77 @@ class Job(db.Model):
     deadline = db.Column(db.DateTime)
     is_active = db.Column(db.Boolean, default=True)
     created_by = db.Column(db.Integer, db.ForeignKey('user.id'))
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)
+    # Derived from location through the gazetteer (see location_service); NULL when the city is unknown
+    city_id = db.Column(db.SmallInteger)
+    state_code = db.Column(db.String(2))
+    latitude = db.Column(db.Float)
+    longitude = db.Column(db.Float)
+    # Annual rupees parsed from salary (see salary_service); NULL when it has no usable figure
+    salary_min = db.Column(db.Integer)
+    salary_max = db.Column(db.Integer)
 
-    def to_dict(self):
+    # Fields exposed through the API, in serialisation order
+    FIELDS = ('id', 'title', 'company', 'location', 'category', 'job_type',
+              'experience', 'salary', 'description', 'requirements',
+              'application_url', 'contact_email', 'posted_date', 'deadline',
+              'is_active', 'updated_at')
+
+    REQUIRED_FIELDS = ('title', 'company', 'location', 'category', 'description')
+
+    @classmethod
+    def validate(cls, data):
+        """Return the error for the first missing required field, or None if the data is valid"""
+        for field in cls.REQUIRED_FIELDS:
+            if not data.get(field):
+                return f'{field.title()} is required'
+        return None
+
+    @classmethod
+    def values_from_dict(cls, data):
+        """Column values for a new job built from submitted data, with the usual defaults"""
+        deadline = data.get('deadline')
+        if deadline and not isinstance(deadline, datetime):
+            deadline = datetime.fromisoformat(str(deadline))
+        return {
+            'title': data['title'],
+            'company': data['company'],
+            'location': data['location'],
+            **locations.normalise(data['location']),
+            'category': data['category'],
+            'job_type': data.get('job_type') or 'Full-time',
+            'experience': data.get('experience') or 'Entry Level',
+            'salary': data.get('salary', ''),
+            **salaries.normalise(data.get('salary')),
+            'description': data['description'],
+            'requirements': data.get('requirements', ''),
+            'application_url': data.get('application_url', ''),
+            'contact_email': data.get('contact_email', ''),
+            'deadline': deadline or None
+        }
+
+    @classmethod
+    def columns(cls, fields):
+        """Column attributes for a list of field names, for selecting plain tuples"""
+        # Labelled, as the lookup columns are named <field>_id in the database
+        return [getattr(cls, name).label(name) for name in fields]
+
+    @classmethod
+    def parse_fields(cls, fields):
+        """Parse a comma-separated ``fields=`` projection, raising ValueError on unknown names"""
+        if not fields:
+            return None
+        names = [name.strip() for name in fields.split(',') if name.strip()]
+        unknown = [name for name in names if name not in cls.FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        # id is always returned so clients can fetch the full job later
+        return ['id'] + [name for name in cls.FIELDS if name in names and name != 'id']
+
+    def to_dict(self, fields=None):
+        if fields:
+            # Only touch the projected attributes so deferred columns stay unloaded
+            return {name: self._field_value(name) for name in fields}
         return {
             'id': self.id,
             'title': self.title,
@@ -54,5 +150,102 @@ class Job(db.Model):
             'contact_email': self.contact_email,
             'posted_date': self.posted_date.isoformat() if self.posted_date else None,
             'deadline': self.deadline.isoformat() if self.deadline else None,
-            'is_active': self.is_active
+            'is_active': self.is_active,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+
+    def _field_value(self, name):
+        value = getattr(self, name)
+        return value.isoformat() if isinstance(value, datetime) else value
+
+@db.event.listens_for(Job.location, 'set')
+def locate_job(job, value, oldvalue, initiator):
+    """Keep the structured location columns in step with the free-text location"""
+    for name, column_value in locations.normalise(value).items():
+        setattr(job, name, column_value)
+
+@db.event.listens_for(Job.salary, 'set')
+def price_job(job, value, oldvalue, initiator):
+    """Keep the numeric salary range in step with the salary string"""
+    for name, column_value in salaries.normalise(value).items():
+        setattr(job, name, column_value)
+
+class JobArchive(db.Model):
+    """Expired jobs moved out of the job table to keep listing queries and indexes small"""
+    id = db.Column(db.Integer, primary_key=True)
+    # The id the job had in the job table; SQLite hands a deleted job's id to the next new job,
+    # so the same job_id can be archived more than once
+    job_id = db.Column(db.Integer, nullable=False, index=True)
+    title = db.Column(db.String(200), nullable=False)
+    company = db.Column(db.String(200), nullable=False)
+    location = db.Column(db.String(200), nullable=False)
+    category = db.Column('category_id', LookupCode('category'), db.ForeignKey('lookup_category.id'),
+                         key='category', nullable=False)
+    job_type = db.Column('job_type_id', LookupCode('job_type'), db.ForeignKey('lookup_job_type.id'),
+                         key='job_type', nullable=False)
+    experience = db.Column('experience_id', LookupCode('experience'), db.ForeignKey('lookup_experience.id'),
+                           key='experience', nullable=False)
+    salary = db.Column(db.String(100))
+    description = db.Column(db.Text, nullable=False)
+    requirements = db.Column(db.Text)
+    application_url = db.Column(db.String(500))
+    contact_email = db.Column(db.String(120))
+    posted_date = db.Column(db.DateTime)
+    deadline = db.Column(db.DateTime)
+    created_by = db.Column(db.Integer)
+    archived_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+class LookupCategory(db.Model):
+    """Job categories; Job.category stores the id"""
+    __tablename__ = 'lookup_category'
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), unique=True, nullable=False)
+
+class LookupJobType(db.Model):
+    __tablename__ = 'lookup_job_type'
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), unique=True, nullable=False)
+
+class LookupExperience(db.Model):
+    __tablename__ = 'lookup_experience'
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(50), unique=True, nullable=False)
+
+class JobChange(db.Model):
+    """Change log of the job table, written by database triggers; deletes are kept as tombstones"""
+    id = db.Column(db.Integer, primary_key=True)  # the sync cursor
+    job_id = db.Column(db.Integer, nullable=False)
+    op = db.Column(db.String(10), nullable=False)  # 'upsert' or 'delete'
+    changed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+class JobFacet(db.Model):
+    """Number of active jobs per facet value, maintained by the job write routes"""
+    facet = db.Column(db.String(20), primary_key=True)
+    value = db.Column(db.String(200), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+
+class OutboxEvent(db.Model):
+    """A side effect (GitHub/Excel sync) recorded in the same transaction as the job change"""
+    __table_args__ = (
+        db.Index('ix_outbox_event_status_due', 'status', 'next_attempt_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'attempts': self.attempts,
+            'next_attempt_at': self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            'last_error': self.last_error,
+            'created_at': self.created_at.isoformat() if self.created_at else None
         }
@@ -0,0 +1,151 @@
+import os
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from app import db
+from models import OutboxEvent
+
+class OutboxWorker:
+    """Runs side effects recorded in the outbox table outside the request cycle.
+
+    Routes call ``enqueue`` before committing, so an event exists if and only if
+    the job change it describes was committed. Events are claimed with a lease
+    so several processes can poll the same table without running an event twice;
+    failures are retried with exponential backoff until ``max_attempts``.
+    """
+
+    def __init__(self):
+        self.mode = os.getenv('OUTBOX_WORKER', 'thread')
+        self.poll_interval = float(os.getenv('OUTBOX_POLL_INTERVAL', '5'))
+        self.max_attempts = int(os.getenv('OUTBOX_MAX_ATTEMPTS', '8'))
+        self.base_delay = float(os.getenv('OUTBOX_RETRY_DELAY', '10'))
+        self.max_delay = float(os.getenv('OUTBOX_MAX_RETRY_DELAY', '3600'))
+        self.lease = timedelta(seconds=int(os.getenv('OUTBOX_LEASE_SECONDS', '300')))
+        self.batch_size = 50
+        self.handlers = {}
+        self.app = None
+        self.thread = None
+        self.thread_pid = None
+        self.wakeup = threading.Event()
+        self.start_lock = threading.Lock()
+
+    def init_app(self, app):
+        self.app = app
+        if self.mode == 'thread':
+            app.before_request(self.ensure_started)
+
+        @app.cli.command('outbox-worker')
+        def outbox_worker_command():
+            """Process outbox events in the foreground (use with OUTBOX_WORKER=off)."""
+            self.run_forever()
+
+    def register(self, kind, handler):
+        """Register ``handler(payload)`` for an event kind; it must raise or return False on failure"""
+        self.handlers[kind] = handler
+
+    def enqueue(self, kind, payload, delay=0, coalesce=False):
+        """Add an event to the current session; it is stored when the caller commits.
+
+        ``delay`` postpones the first attempt by that many seconds. With ``coalesce``
+        nothing is added while another event of the same kind is still pending, so
+        a burst of changes within the delay window is handled by one event.
+        """
+        if coalesce:
+            pending = db.session.query(OutboxEvent.id).filter_by(kind=kind, status='pending').first()
+            if pending:
+                return
+        db.session.add(OutboxEvent(
+            kind=kind,
+            payload=json.dumps(payload, default=str),
+            next_attempt_at=datetime.utcnow() + timedelta(seconds=delay)
+        ))
+
+    def notify(self):
+        """Wake the worker so freshly committed events run without waiting for the next poll"""
+        self.wakeup.set()
+
+    def ensure_started(self):
+        # Threads do not survive fork, so check per process
+        if self.thread is not None and self.thread_pid == os.getpid() and self.thread.is_alive():
+            return
+        with self.start_lock:
+            if self.thread is not None and self.thread_pid == os.getpid() and self.thread.is_alive():
+                return
+            self.thread = threading.Thread(target=self.run_forever, name='outbox-worker', daemon=True)
+            self.thread_pid = os.getpid()
+            self.thread.start()
+
+    def run_forever(self):
+        logging.info(f"Outbox worker started in process {os.getpid()}")
+        while True:
+            try:
+                with self.app.app_context():
+                    processed = self.process_due()
+            except Exception as e:
+                logging.error(f"Outbox worker error: {str(e)}")
+                processed = 0
+            if processed < self.batch_size:
+                self.wakeup.wait(self.poll_interval)
+                self.wakeup.clear()
+
+    def process_due(self):
+        """Run every event that is due now; returns how many were attempted"""
+        try:
+            now = datetime.utcnow()
+            due_ids = [row.id for row in db.session.query(OutboxEvent.id).filter(
+                OutboxEvent.status.in_(('pending', 'processing')),
+                OutboxEvent.next_attempt_at <= now
+            ).order_by(OutboxEvent.id).limit(self.batch_size)]
+
+            processed = 0
+            for event_id in due_ids:
+                event = self._claim(event_id)
+                if event is not None:
+                    self._dispatch(event)
+                    processed += 1
+            return processed
+        finally:
+            db.session.remove()
+
+    def _claim(self, event_id):
+        now = datetime.utcnow()
+        claimed = OutboxEvent.query.filter(
+            OutboxEvent.id == event_id,
+            OutboxEvent.status.in_(('pending', 'processing')),
+            OutboxEvent.next_attempt_at <= now
+        ).update({'status': 'processing', 'next_attempt_at': now + self.lease},
+                 synchronize_session=False)
+        db.session.commit()
+        return db.session.get(OutboxEvent, event_id) if claimed else None
+
+    def _dispatch(self, event):
+        event_id, kind = event.id, event.kind
+        handler = self.handlers.get(kind)
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for {kind}")
+            if handler(json.loads(event.payload)) is False:
+                raise RuntimeError(f"{kind} handler reported failure")
+        except Exception as e:
+            # The handler may have left the transaction aborted or half-written;
+            # record the failure in a fresh one so the attempt is always counted
+            db.session.rollback()
+            event = db.session.get(OutboxEvent, event_id)
+            if event is None:
+                return
+            event.attempts += 1
+            event.last_error = str(e)
+            if event.attempts >= self.max_attempts:
+                event.status = 'failed'
+                logging.error(f"Outbox event {event.id} ({event.kind}) failed permanently: {str(e)}")
+            else:
+                delay = min(self.base_delay * 2 ** (event.attempts - 1), self.max_delay)
+                event.status = 'pending'
+                event.next_attempt_at = datetime.utcnow() + timedelta(seconds=delay)
+                logging.warning(f"Outbox event {event.id} ({event.kind}) failed, retrying in {delay:.0f}s: {str(e)}")
+            db.session.commit()
+            return
+
+        db.session.delete(event)
+        db.session.commit()
@@ -0,0 +1,31 @@
+import base64
+from datetime import datetime
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+def encode_cursor(key, job_id):
+    """Encode the (sort key, id) of the last row on a page as an opaque cursor.
+
+    The key is the posted_date for the default order, or a salary for the salary sorts.
+    """
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    raw = f"{'' if key is None else key}|{job_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor, parse_key=datetime.fromisoformat):
+    """Decode a cursor back into (sort key, id), raising ValueError if malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+        key, job_id = raw.split('|', 1)
+        return parse_key(key), int(job_id)
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+def page_size(limit):
+    """Clamp a requested page size to the allowed range"""
+    if not limit or limit < 1:
+        return DEFAULT_PAGE_SIZE
+    return min(limit, MAX_PAGE_SIZE)
@@ -1,17 +1,200 @@
 import os
 import json
 import logging
-from datetime import datetime
-from flask import render_template, request, jsonify, session, redirect, url_for, flash
-from werkzeug.security import generate_password_hash, check_password_hash
+import tempfile
+import click
+from datetime import datetime, timezone
+from flask import render_template, request, jsonify, session, g, redirect, url_for, flash, Response, stream_with_context
+from werkzeug.security import generate_password_hash
 from app import app, db
 from models import User, Job
 from github_service import GitHubService
 from excel_service import ExcelService
+from search_service import SearchService
+from cache_service import ResponseCache
+from outbox_service import OutboxWorker
+from import_service import JobImporter, JobImportError
+from snapshot_service import SnapshotBuilder
+from metrics_service import Metrics
+from facet_service import FacetService
+from expiry_service import ExpiryService
+from events_service import EventBroker
+from changelog_service import ChangeLog, JobMirror
+from db_config import read_replica, lift_statement_timeout
+from auth_service import AuthService, AuthBusy, DEFAULT_ADMIN, DEFAULT_ADMIN_PASSWORD
+from session_service import ServerSessionInterface
+from location_service import locations
+from salary_service import salaries
+from migrations import backfill_salary_batch
+import pagination
+import serializer
 
 # Initialize services
 github_service = GitHubService()
 excel_service = ExcelService()
+search_service = SearchService()
+response_cache = ResponseCache()
+outbox = OutboxWorker()
+facet_service = FacetService()
+job_importer = JobImporter(facets=facet_service)
+expiry_service = ExpiryService(facets=facet_service)
+events = EventBroker()
+changelog = ChangeLog()
+github_mirror = JobMirror(changelog)
+metrics = Metrics()
+auth = AuthService(response_cache.backend)
+
+def publish_jobs_to_github(payload):
+    """Regenerate the GitHub Pages jobs file, reading only the jobs changed since the last publish"""
+    github_mirror.sync(db.session)
+    return github_service.publish_jobs(github_mirror.active_jobs())
+
+def queue_github_publish():
+    """Schedule a GitHub publish, coalescing with one that is already waiting"""
+    if github_service.is_configured():
+        outbox.enqueue('github.publish', {}, delay=github_service.publish_window, coalesce=True)
+
+# Enough for a listing card; the full job is fetched on demand
+EVENT_FIELDS = ['id', 'title', 'company', 'location', 'category', 'job_type', 'experience',
+                'salary', 'posted_date', 'is_active']
+
+def publish_job_event(kind, job):
+    """Tell connected pages about a committed job change"""
+    data = job.to_dict(fields=EVENT_FIELDS)
+    data['description'] = (job.description or '')[:160]
+    events.publish(kind, data)
+
+outbox.register('github.publish', publish_jobs_to_github)
+# Events queued before publishing was batched
+outbox.register('github.save_job', publish_jobs_to_github)
+def save_imported_jobs_to_excel(payload):
+    jobs = Job.query.filter(Job.id.in_(payload['ids'])).order_by(Job.id).all()
+    return excel_service.save_jobs([job.to_dict() for job in jobs])
+
+def schedule_expiry(delay=None):
+    """Queue the next expiry sweep unless one is already waiting"""
+    if expiry_service.interval > 0:
+        delay = expiry_service.interval if delay is None else delay
+        outbox.enqueue('jobs.expire', {}, delay=delay, coalesce=True)
+
+def expire_jobs(payload=None):
+    """Deactivate and archive expired jobs, then refresh everything derived from the listings"""
+    result = expiry_service.run()
+    metrics.inc('jobs_expired_total', {}, result['expired'])
+    metrics.inc('jobs_archived_total', {}, result['archived'])
+    metrics.observe('jobs_expiry_run_seconds', {}, result['elapsed_seconds'])
+    
+    if result['expired'] or result['archived']:
+        queue_github_publish()
+        response_cache.invalidate()
+    if payload is not None:
+        schedule_expiry()
+    lift_statement_timeout(db.session.connection())
+    changelog.prune(db.session)
+    db.session.commit()
+    if result['expired']:
+        events.publish('jobs.changed', {'reason': 'expiry', 'count': result['expired']})
+    return result
+
+outbox.register('excel.save_job', excel_service.save_job)
+outbox.register('excel.save_jobs', save_imported_jobs_to_excel)
+outbox.register('jobs.expire', expire_jobs)
+outbox.init_app(app)
+
+with app.app_context():
+    search_service.init_db(db.engine)
+    metrics.init_app(app, *db.engines.values())
+    try:
+        schedule_expiry(delay=0)
+        db.session.commit()
+    except Exception as e:
+        # Tables may not exist yet when running `db-upgrade` on a fresh database
+        logging.warning(f"Could not schedule job expiry: {str(e)}")
+        db.session.rollback()
+    finally:
+        db.session.remove()
+
+def import_jobs(file_obj, fmt):
+    """Bulk-import jobs and queue the same side effects as create_job"""
+    result = job_importer.import_file(file_obj, fmt)
+    
+    if result['job_ids']:
+        queue_github_publish()
+        outbox.enqueue('excel.save_jobs', {'ids': result['job_ids']})
+        db.session.commit()
+        response_cache.invalidate()
+        outbox.notify()
+        events.publish('jobs.changed', {'reason': 'import', 'count': len(result['job_ids'])})
+    
+    return result
+
+@app.cli.command('import-jobs')
+@click.argument('path')
+@click.option('--format', 'fmt', default=None, help='csv, xlsx, json or jsonl (default: from extension)')
+def import_jobs_command(path, fmt):
+    """Bulk-import jobs from a CSV, XLSX, JSON or JSON Lines file."""
+    with open(path, 'rb') as f:
+        result = import_jobs(f, job_importer.detect_format(path, fmt))
+    for error in result['errors']:
+        print(f"Row {error['row']}: {error['error']}")
+    print(f"Inserted {result['inserted']} of {result['total_rows']} rows "
+          f"({result['duplicates']} duplicates, {result['invalid']} invalid) "
+          f"in {result['elapsed_seconds']}s, {result['rows_per_second']} rows/sec")
+
+@app.cli.command('build-snapshot')
+@click.option('--output', default=None, help='Output directory (default: STATIC_SNAPSHOT_DIR or site-data)')
+def build_snapshot_command(output):
+    """Generate the precompressed data files for the static site."""
+    manifest = SnapshotBuilder(output).build(iter_active_jobs())
+    print(f"Snapshot of {manifest['total']} jobs in {len(manifest['categories'])} categories")
+
+@app.cli.command('rebuild-facets')
+def rebuild_facets_command():
+    """Recompute the facet counts from the job table."""
+    with db.engine.begin() as conn:
+        lift_statement_timeout(conn)
+        rows = facet_service.rebuild(conn)
+    response_cache.invalidate()
+    print(f"Rebuilt {rows} facet counts")
+
+@app.cli.command('expire-jobs')
+def expire_jobs_command():
+    """Deactivate jobs past their deadline and archive long-expired ones now."""
+    result = expire_jobs()
+    print(f"Expired {result['expired']} and archived {result['archived']} jobs "
+          f"in {result['batches']} batches ({result['elapsed_seconds']}s)")
+
+@app.cli.command('backfill-salaries')
+@click.option('--batch-size', default=500, show_default=True, help='Jobs read and committed per batch')
+def backfill_salaries_command(batch_size):
+    """Re-parse job salaries into salary_min/salary_max, e.g. after the parser changed."""
+    # One transaction per batch, so live writers are never blocked for long
+    after_id, updated, batches = 0, 0, 0
+    while True:
+        with db.engine.begin() as conn:
+            lift_statement_timeout(conn)
+            after_id, changed = backfill_salary_batch(conn, after_id, batch_size)
+        if after_id is None:
+            break
+        updated += changed
+        batches += 1
+    if updated:
+        response_cache.invalidate()
+    print(f"Updated the salary range of {updated} jobs in {batches} batches")
+
+@app.cli.command('compact-ledger')
+def compact_ledger_command():
+    """Fold the jobs.jsonl journal into the jobs.json and jobs.xlsx snapshots."""
+    compacted = excel_service.compact()
+    print(f"Compacted {compacted} journal entries")
+
+@app.cli.command('cleanup-sessions')
+def cleanup_sessions_command():
+    """Delete expired server-side sessions."""
+    if not isinstance(app.session_interface, ServerSessionInterface):
+        print("SESSION_URL is not set, sessions are stored in cookies")
+        return
+    print(f"Deleted {app.session_interface.cleanup()} expired sessions")
 
 @app.route('/')
 def index():
@@ -25,49 +208,220 @@ def serve_css():
 def serve_js():
     return app.send_static_file('script.js')
 
+@app.route('/metrics')
+def get_metrics():
+    if not metrics.enabled:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    
+    # Closed by default: the METRICS_TOKEN bearer token or an admin session
+    if not metrics.authorized() and auth.current() is None:
+        return jsonify({'error': 'Metrics token or admin login required'}), 401
+    
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/api/jobs')
+@read_replica
 def get_jobs():
     try:
         category = request.args.get('category', 'all')
         search = request.args.get('search', '')
         limit = request.args.get('limit', type=int)
+        cursor = request.args.get('cursor')
+        # city=, state= or near= with radius_km=; a bad near/radius raises ValueError (400)
+        place = locations.parse_filter(request.args)
+        # min_salary=/max_salary= in rupees a year, and sort=salary|salary_asc
+        salary = salaries.parse_filter(request.args)
+        sort = salaries.parse_sort(request.args.get('sort'))
         
-        query = Job.query.filter_by(is_active=True)
-        
-        if category != 'all':
-            query = query.filter_by(category=category)
-        
-        if search:
-            query = query.filter(
-                db.or_(
-                    Job.title.contains(search),
-                    Job.company.contains(search),
-                    Job.location.contains(search),
-                    Job.description.contains(search)
-                )
+        try:
+            fields = Job.parse_fields(request.args.get('fields'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        fields = fields or list(Job.FIELDS)
+        
+        # stream=1 sends a large unpaginated list as it is read, bypassing the cache
+        if request.args.get('stream') == '1' and cursor is None:
+            rows = listing_query(category, search, limit, fields, place, salary, sort).yield_per(1000)
+            return Response(
+                stream_with_context(serializer.stream_array(rows, fields)),
+                mimetype='application/json'
             )
         
-        query = query.order_by(Job.posted_date.desc())
-        
-        if limit:
-            query = query.limit(limit)
-        
-        jobs = query.all()
-        return jsonify([job.to_dict() for job in jobs])
+        cache_params = {
+            'category': category,
+            'search': search_service.tokenize(search),
+            'place': place,
+            'salary': salary,
+            'sort': sort,
+            'limit': limit,
+            'cursor': cursor,
+            'fields': fields
+        }
+        return response_cache.json_response(
+            'jobs', cache_params,
+            lambda: list_jobs(category, search, limit, cursor, fields, place, salary, sort)
+        )
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     except Exception as e:
         logging.error(f"Error fetching jobs: {str(e)}")
         return jsonify({'error': 'Failed to fetch jobs'}), 500
 
+def jobs_query(category, search, rank=True, place=None, salary=None):
+    """Active jobs filtered by category, location, salary and full-text search"""
+    query = Job.query.filter_by(is_active=True)
+    
+    if category != 'all':
+        query = query.filter_by(category=category)
+    
+    query = locations.apply(query, Job, place)
+    query = salaries.apply(query, Job, salary)
+    
+    if search:
+        query = search_service.apply(query, search, rank=rank)
+    
+    return query
+
+def listing_query(category, search, limit, fields, place=None, salary=None, sort=None):
+    """Job listing selecting plain column tuples instead of ORM objects; newest first unless sorted by salary"""
+    if sort:
+        # An explicit sort replaces the search ranking
+        query = salaries.order(jobs_query(category, search, rank=False, place=place, salary=salary), Job, sort)
+    else:
+        query = jobs_query(category, search, place=place, salary=salary).order_by(Job.posted_date.desc())
+    
+    if limit:
+        query = query.limit(limit)
+    
+    return query.with_entities(*Job.columns(fields))
+
+def list_jobs(category, search, limit, cursor, fields, place=None, salary=None, sort=None):
+    """Build the /api/jobs payload: a plain list, or a page when a cursor is given"""
+    # Passing cursor (empty for the first page) switches to keyset pagination
+    if cursor is not None:
+        query = jobs_query(category, search, rank=False, place=place, salary=salary)
+        return paginate_jobs(query, cursor, limit, fields, sort)
+    
+    return serializer.rows_to_dicts(listing_query(category, search, limit, fields, place, salary, sort), fields)
+
+def paginate_jobs(query, cursor, limit, fields, sort=None):
+    """Return one page of jobs ordered by (posted_date, id) descending, or by (salary, id) for a salary sort"""
+    size = pagination.page_size(limit)
+    
+    if sort:
+        key = salaries.sort_key(Job, sort)[0]
+        if cursor:
+            query = query.filter(salaries.after(Job, sort, *pagination.decode_cursor(cursor, salaries.parse_cursor_key)))
+        query = salaries.order(query, Job, sort)
+    else:
+        key = Job.posted_date
+        if cursor:
+            posted_date, job_id = pagination.decode_cursor(cursor)
+            query = query.filter(db.tuple_(Job.posted_date, Job.id) < (posted_date, job_id))
+        query = query.order_by(Job.posted_date.desc(), Job.id.desc())
+    
+    # The cursor columns are selected last, whether or not they are projected
+    columns = Job.columns(fields) + [key, Job.id]
+    rows = (query.with_entities(*columns)
+                 .limit(size + 1)
+                 .all())
+    
+    next_cursor = None
+    if len(rows) > size:
+        rows = rows[:size]
+        next_cursor = pagination.encode_cursor(rows[-1][-2], rows[-1][-1])
+    
+    return {
+        'jobs': serializer.rows_to_dicts(rows, fields),
+        'next_cursor': next_cursor
+    }
+
+@app.route('/api/jobs/facets')
+@read_replica
+def get_job_facets():
+    try:
+        search = request.args.get('search', '')
+        terms = search_service.tokenize(search)
+        
+        # Without a search the maintained counts are read as they are
+        query = jobs_query('all', search, rank=False) if terms else None
+        return response_cache.json_response(
+            'facets', {'search': terms},
+            lambda: facet_service.counts(db.session, query)
+        )
+    
+    except Exception as e:
+        logging.error(f"Error fetching facets: {str(e)}")
+        return jsonify({'error': 'Failed to fetch facets'}), 500
+
+@app.route('/api/jobs/changes')
+def get_job_changes():
+    try:
+        since = request.args.get('since')
+        limit = request.args.get('limit', type=int)
+        
+        # The cursor is the `next` of the previous response; a timestamp starts from that time
+        if since is not None and not since.isdigit():
+            try:
+                moment = datetime.fromisoformat(since)
+                # changed_at is naive UTC; "Z" and "+05:30" timestamps are converted to it
+                if moment.tzinfo is not None:
+                    moment = moment.astimezone(timezone.utc).replace(tzinfo=None)
+            except (ValueError, OverflowError):
+                return jsonify({'error': 'since must be a cursor or an ISO 8601 timestamp'}), 400
+            since = changelog.cursor_at(db.session, moment)
+        elif since is not None:
+            since = int(since)
+        
+        return Response(serializer.dumps(changelog.changes(db.session, since, limit)), mimetype='application/json')
+    
+    except Exception as e:
+        logging.error(f"Error fetching job changes: {str(e)}")
+        return jsonify({'error': 'Failed to fetch changes'}), 500
+
 @app.route('/api/jobs/<int:job_id>')
+@read_replica
 def get_job(job_id):
     try:
-        job = Job.query.get_or_404(job_id)
-        return jsonify(job.to_dict())
+        return response_cache.json_response(
+            'job', {'id': job_id},
+            lambda: Job.query.get_or_404(job_id).to_dict()
+        )
     except Exception as e:
         logging.error(f"Error fetching job {job_id}: {str(e)}")
         return jsonify({'error': 'Job not found'}), 404
 
+@app.route('/api/events/stream')
+def stream_events():
+    # Browsers send Last-Event-ID themselves when an EventSource reconnects
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('last_event_id')
+    
+    if not events.open_stream():
+        response = jsonify({'error': 'Too many open event streams, poll /api/events instead'})
+        response.headers['Retry-After'] = '60'
+        return response, 503
+    
+    response = Response(events.stream(last_event_id), mimetype='text/event-stream')
+    # The server closes every response, even when the generator never ran
+    response.call_on_close(events.close_stream)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/api/events')
+def poll_events():
+    try:
+        after = request.args.get('after')
+        wait = min(max(request.args.get('wait', 0, type=float), 0), 25)
+        return jsonify(events.poll(after, wait))
+    
+    except Exception as e:
+        logging.error(f"Error polling events: {str(e)}")
+        return jsonify({'error': 'Failed to fetch events'}), 500
+
 @app.route('/api/admin/login', methods=['POST'])
 def admin_login():
     try:
@@ -78,17 +432,13 @@ def admin_login():
         if not username or not password:
             return jsonify({'error': 'Username and password are required'}), 400
         
-        # Default admin credentials
-        if username == 'admin' and password == 'admin123':
-            session['admin_logged_in'] = True
-            session['admin_username'] = username
-            return jsonify({'success': True, 'message': 'Login successful'})
+        try:
+            principal = auth.authenticate(username, password)
+        except AuthBusy:
+            return jsonify({'error': 'Too many login attempts, try again shortly'}), 503, {'Retry-After': '1'}
         
-        # Check database for admin users
-        user = User.query.filter_by(username=username).first()
-        if user and user.is_admin and check_password_hash(user.password_hash, password):
-            session['admin_logged_in'] = True
-            session['admin_username'] = username
+        if principal:
+            auth.login(principal)
             return jsonify({'success': True, 'message': 'Login successful'})
         
         return jsonify({'error': 'Invalid credentials'}), 401
@@ -99,54 +449,35 @@ def admin_login():
 
 @app.route('/api/admin/logout', methods=['POST'])
 def admin_logout():
-    session.pop('admin_logged_in', None)
-    session.pop('admin_username', None)
+    auth.logout()
     return jsonify({'success': True, 'message': 'Logged out successfully'})
 
 @app.route('/api/admin/jobs', methods=['POST'])
+@auth.admin_required
 def create_job():
     try:
-        if not session.get('admin_logged_in'):
-            return jsonify({'error': 'Admin authentication required'}), 401
-        
         data = request.get_json()
         
         # Validate required fields
-        required_fields = ['title', 'company', 'location', 'category', 'description']
-        for field in required_fields:
-            if not data.get(field):
-                return jsonify({'error': f'{field.title()} is required'}), 400
+        error = Job.validate(data)
+        if error:
+            return jsonify({'error': error}), 400
         
         # Create new job
-        job = Job(
-            title=data['title'],
-            company=data['company'],
-            location=data['location'],
-            category=data['category'],
-            job_type=data.get('job_type', 'Full-time'),
-            experience=data.get('experience', 'Entry Level'),
-            salary=data.get('salary', ''),
-            description=data['description'],
-            requirements=data.get('requirements', ''),
-            application_url=data.get('application_url', ''),
-            contact_email=data.get('contact_email', ''),
-            deadline=datetime.fromisoformat(data['deadline']) if data.get('deadline') else None
-        )
+        job = Job(**Job.values_from_dict(data))
         
         db.session.add(job)
-        db.session.commit()
+        db.session.flush()
+        facet_service.update(db.session, added=facet_service.pairs(job))
         
-        # Save to GitHub Pages (if configured)
-        try:
-            github_service.save_job(job.to_dict())
-        except Exception as e:
-            logging.warning(f"GitHub save failed: {str(e)}")
+        # GitHub Pages (if configured) and Excel are updated by the outbox worker
+        queue_github_publish()
+        outbox.enqueue('excel.save_job', job.to_dict())
         
-        # Save to Excel (fallback)
-        try:
-            excel_service.save_job(job.to_dict())
-        except Exception as e:
-            logging.warning(f"Excel save failed: {str(e)}")
+        db.session.commit()
+        response_cache.invalidate()
+        outbox.notify()
+        publish_job_event('job.created', job)
         
         return jsonify({
             'success': True, 
@@ -159,14 +490,39 @@ def create_job():
         db.session.rollback()
         return jsonify({'error': 'Failed to create job'}), 500
 
+@app.route('/api/admin/jobs/import', methods=['POST'])
+@auth.admin_required
+def bulk_import_jobs():
+    try:
+        upload = request.files.get('file')
+        if upload is None:
+            return jsonify({'error': 'File is required'}), 400
+        
+        try:
+            fmt = job_importer.detect_format(upload.filename, request.form.get('format'))
+            result = import_jobs(upload.stream, fmt)
+        except JobImportError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        del result['job_ids']
+        return jsonify({
+            'success': True,
+            'message': f"Imported {result['inserted']} of {result['total_rows']} jobs",
+            'result': result
+        })
+    
+    except Exception as e:
+        logging.error(f"Bulk import error: {str(e)}")
+        db.session.rollback()
+        return jsonify({'error': 'Failed to import jobs'}), 500
+
 @app.route('/api/admin/jobs/<int:job_id>', methods=['PUT'])
+@auth.admin_required
 def update_job(job_id):
     try:
-        if not session.get('admin_logged_in'):
-            return jsonify({'error': 'Admin authentication required'}), 401
-        
         job = Job.query.get_or_404(job_id)
         data = request.get_json()
+        previous_facets = facet_service.pairs(job)
         
         # Update job fields
         for field in ['title', 'company', 'location', 'category', 'job_type', 
@@ -181,7 +537,12 @@ def update_job(job_id):
         if 'is_active' in data:
             job.is_active = data['is_active']
         
+        facet_service.update(db.session, removed=previous_facets, added=facet_service.pairs(job))
+        queue_github_publish()
         db.session.commit()
+        response_cache.invalidate()
+        outbox.notify()
+        publish_job_event('job.updated', job)
         
         return jsonify({
             'success': True,
@@ -195,14 +556,17 @@ def update_job(job_id):
         return jsonify({'error': 'Failed to update job'}), 500
 
 @app.route('/api/admin/jobs/<int:job_id>', methods=['DELETE'])
+@auth.admin_required
 def delete_job(job_id):
     try:
-        if not session.get('admin_logged_in'):
-            return jsonify({'error': 'Admin authentication required'}), 401
-        
         job = Job.query.get_or_404(job_id)
+        facet_service.update(db.session, removed=facet_service.pairs(job))
         db.session.delete(job)
+        queue_github_publish()
         db.session.commit()
+        response_cache.invalidate()
+        outbox.notify()
+        events.publish('job.deleted', {'id': job_id})
         
         return jsonify({'success': True, 'message': 'Job deleted successfully'})
     
@@ -211,20 +575,63 @@ def delete_job(job_id):
         db.session.rollback()
         return jsonify({'error': 'Failed to delete job'}), 500
 
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+def iter_active_jobs():
+    """Yield active jobs as dicts straight from a server-side cursor, without ORM objects"""
+    statement = (db.select(*Job.columns(Job.FIELDS))
+                 .where(Job.is_active == True)  # noqa: E712
+                 .order_by(Job.id)
+                 .execution_options(stream_results=True, yield_per=1000))
+    
+    for row in db.session.execute(statement):
+        job = row._asdict()
+        for field in ('posted_date', 'deadline', 'updated_at'):
+            if job[field]:
+                job[field] = job[field].isoformat()
+        yield job
+
+def stream_file(path):
+    """Yield a file in chunks"""
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(EXPORT_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+def remove_file(path):
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
 @app.route('/api/export/excel')
+@auth.admin_required
 def export_excel():
     try:
-        if not session.get('admin_logged_in'):
-            return jsonify({'error': 'Admin authentication required'}), 401
-        
-        jobs = Job.query.filter_by(is_active=True).all()
-        file_path = excel_service.export_all_jobs([job.to_dict() for job in jobs])
-        
-        return jsonify({
-            'success': True,
-            'message': 'Excel file generated successfully',
-            'file_path': file_path
-        })
+        export_file = tempfile.NamedTemporaryFile(suffix='.xlsx', delete=False)
+        try:
+            with export_file:
+                count = excel_service.write_export(iter_active_jobs(), export_file)
+        except Exception:
+            os.unlink(export_file.name)
+            raise
+        
+        download_name = f'jobs_export_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
+        logging.info(f"Exported {count} jobs to {download_name}")
+        
+        response = Response(
+            stream_file(export_file.name),
+            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            headers={
+                'Content-Disposition': f'attachment; filename="{download_name}"',
+                'Content-Length': str(os.path.getsize(export_file.name))
+            }
+        )
+        # Runs even when the body is never iterated (HEAD, client gone before the first chunk)
+        response.call_on_close(lambda: remove_file(export_file.name))
+        return response
     
     except Exception as e:
         logging.error(f"Excel export error: {str(e)}")
@@ -232,11 +639,9 @@ def export_excel():
 
 # User Management Routes
 @app.route('/api/admin/users', methods=['GET'])
+@auth.admin_required
 def get_users():
     try:
-        if not session.get('admin_logged_in'):
-            return jsonify({'error': 'Admin authentication required'}), 401
-        
         users = User.query.all()
         return jsonify([user.to_dict() for user in users])
     
@@ -245,11 +650,9 @@ def get_users():
         return jsonify({'error': 'Failed to fetch users'}), 500
 
 @app.route('/api/admin/users', methods=['POST'])
+@auth.admin_required
 def create_user():
     try:
-        if not session.get('admin_logged_in'):
-            return jsonify({'error': 'Admin authentication required'}), 401
-        
         data = request.get_json()
         
         # Validate required fields
@@ -275,6 +678,8 @@ def create_user():
         
         db.session.add(user)
         db.session.commit()
+        # The name may have been cached as unknown
+        auth.invalidate(user.username)
         
         return jsonify({
             'success': True,
@@ -288,13 +693,12 @@ def create_user():
         return jsonify({'error': 'Failed to create user'}), 500
 
 @app.route('/api/admin/users/<int:user_id>', methods=['PUT'])
+@auth.admin_required
 def update_user(user_id):
     try:
-        if not session.get('admin_logged_in'):
-            return jsonify({'error': 'Admin authentication required'}), 401
-        
         user = User.query.get_or_404(user_id)
         data = request.get_json()
+        previous_username = user.username
         
         # Update user fields
         if 'username' in data and data['username'] != user.username:
@@ -314,6 +718,7 @@ def update_user(user_id):
             user.is_admin = data['is_admin']
         
         db.session.commit()
+        auth.invalidate(previous_username, user.username)
         
         return jsonify({
             'success': True,
@@ -327,11 +732,9 @@ def update_user(user_id):
         return jsonify({'error': 'Failed to update user'}), 500
 
 @app.route('/api/admin/users/<int:user_id>', methods=['DELETE'])
+@auth.admin_required
 def delete_user(user_id):
     try:
-        if not session.get('admin_logged_in'):
-            return jsonify({'error': 'Admin authentication required'}), 401
-        
         user = User.query.get_or_404(user_id)
         
         # Prevent deleting the last admin user
@@ -341,11 +744,12 @@ def delete_user(user_id):
                 return jsonify({'error': 'Cannot delete the last admin user'}), 400
         
         # Don't allow deleting currently logged in user
-        if user.username == session.get('admin_username'):
+        if user.username == g.admin.username:
             return jsonify({'error': 'Cannot delete currently logged in user'}), 400
         
         db.session.delete(user)
         db.session.commit()
+        auth.invalidate(user.username)
         
         return jsonify({'success': True, 'message': 'User deleted successfully'})
     
@@ -355,11 +759,9 @@ def delete_user(user_id):
         return jsonify({'error': 'Failed to delete user'}), 500
 
 @app.route('/api/admin/change-password', methods=['POST'])
+@auth.admin_required
 def change_password():
     try:
-        if not session.get('admin_logged_in'):
-            return jsonify({'error': 'Admin authentication required'}), 401
-        
         data = request.get_json()
         current_password = data.get('current_password')
         new_password = data.get('new_password')
@@ -367,11 +769,9 @@ def change_password():
         if not current_password or not new_password:
             return jsonify({'error': 'Current and new passwords are required'}), 400
         
-        username = session.get('admin_username')
-        
         # Check if using default admin
-        if username == 'admin':
-            if current_password != 'admin123':
+        if g.admin is DEFAULT_ADMIN:
+            if current_password != DEFAULT_ADMIN_PASSWORD:
                 return jsonify({'error': 'Current password is incorrect'}), 400
             
             # Create a proper admin user in database
@@ -388,16 +788,21 @@ def change_password():
             else:
                 existing_user.password_hash = generate_password_hash(new_password)
                 db.session.commit()
+            auth.invalidate(DEFAULT_ADMIN.username)
             
             return jsonify({'success': True, 'message': 'Password changed successfully'})
         
         # For database users
-        user = User.query.filter_by(username=username).first()
-        if not user or not check_password_hash(user.password_hash, current_password):
-            return jsonify({'error': 'Current password is incorrect'}), 400
+        try:
+            if not auth.verify_password(g.admin.password_hash, current_password):
+                return jsonify({'error': 'Current password is incorrect'}), 400
+        except AuthBusy:
+            return jsonify({'error': 'Too many password checks in progress, try again shortly'}), 503, {'Retry-After': '1'}
         
+        user = db.session.get(User, g.admin.id)
         user.password_hash = generate_password_hash(new_password)
         db.session.commit()
+        auth.invalidate(user.username)
         
         return jsonify({'success': True, 'message': 'Password changed successfully'})
     
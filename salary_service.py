@@ -0,0 +1,169 @@
+import re
+from sqlalchemy import and_, or_, tuple_
+
+# Amount with an optional Indian unit: "12,00,000", "8.5 LPA", "1.2 Cr", "40k"
+AMOUNT = re.compile(
+    r'(\d[\d,]*(?:\.\d+)?)\s*(lpa|lakhs?|lacs?|lac|l|crores?|cr|k|thousand)?(?![a-z])'
+)
+RANGE_SEPARATOR = re.compile(r'\s*(?:-|–|—|to)\s*₹?\s*')
+CURRENCY = re.compile(r'₹|\brs\.?|\binr\b')
+# Numbers that are not pay: "Pay Level 7", "2 years exp", "5+ yrs"
+PAY_LEVEL = re.compile(r'\blevel\s*[-:]?\s*$')
+YEARS = re.compile(r'\s*\+?\s*(?:years?|yrs?)\b')
+
+UNITS = {
+    'lpa': 100000, 'lakh': 100000, 'lakhs': 100000, 'lac': 100000, 'lacs': 100000, 'l': 100000,
+    'crore': 10000000, 'crores': 10000000, 'cr': 10000000,
+    'k': 1000, 'thousand': 1000,
+}
+
+# Government pay levels and scales are quoted per month
+MONTHLY = re.compile(r'per\s+month|/\s*(?:month|mon|mo|m)\b|\bmonthly\b|\bp\.?\s*m\b|\bper\s+mensem\b|\ba\s+month\b'
+                     r'|\bpay\s+(?:level|scale|matrix|band)\b')
+ANNUAL = re.compile(r'per\s+(?:annum|year)|/\s*(?:annum|year|yr|a|y)\b|\bp\.?\s*a\b|\bannual(?:ly)?\b|\byearly\b'
+                    r'|\bctc\b|\blpa\b|\ba\s+year\b')
+# Pay quoted per hour, day or week is not converted; those jobs stay out of salary filters
+OTHER_PERIOD = re.compile(r'per\s+(?:hour|day|week)|/\s*(?:hr|hour|day|week)\b|\bhourly\b|\bdaily\b|\bweekly\b')
+
+# Stored in 32-bit integer columns
+MAX_AMOUNT = 2 ** 31 - 1
+
+def parse_salary(text):
+    """(min, max) annual salary in rupees for a display string, or None if it has no usable figure.
+
+    "₹12,00,000 - ₹18,00,000 per annum" -> (1200000, 1800000)
+    "12-18 LPA" -> (1200000, 1800000)
+    "₹25,000 - ₹35,000 per month" -> (300000, 420000)
+    A single figure gives the same min and max. Pay levels and years of
+    experience are skipped: "Level 10 pay matrix ₹56,100" -> (673200, 673200).
+    """
+    # Currency marks become a plain "₹" so they can tell pay apart from other numbers
+    text = CURRENCY.sub(' ₹', str(text or '').lower())
+    if OTHER_PERIOD.search(text):
+        return None
+    figures = salary_figures(text)
+    if not figures:
+        return None
+
+    # The first figure marked as money ("₹44,900", "6 LPA") wins over bare numbers before it
+    amounts = next((figure for figure in figures if any(is_money(text, match) for match in figure)), figures[0])
+
+    units = [match.group(2) for match in amounts]
+    # "12-18 LPA", "5 - 7 lakhs": a bare number in a range takes the other one's unit
+    if len(units) == 2:
+        units = [unit or units[1 - i] for i, unit in enumerate(units)]
+    values = [float(match.group(1).replace(',', '')) * UNITS.get(unit, 1)
+              for match, unit in zip(amounts, units)]
+
+    if MONTHLY.search(text):
+        monthly = True
+    elif ANNUAL.search(text) or any(units):
+        monthly = False
+    elif max(values) < 1000:
+        # "5-7" with no unit or period: more likely years of experience than rupees
+        return None
+    else:
+        # Bare rupee figures starting below a lakh ("₹45,000") are monthly pay in practice
+        monthly = min(values) < 100000
+
+    annual = sorted(int(round(value * (12 if monthly else 1))) for value in values)
+    low, high = annual[0], annual[-1]
+    if low <= 0 or high > MAX_AMOUNT:
+        return None
+    return low, high
+
+def salary_figures(text):
+    """The amounts in ``text`` that may be pay, as a list of ranges of one or two AMOUNT matches"""
+    matches = [match for match in AMOUNT.finditer(text)
+               if not PAY_LEVEL.search(text, 0, match.start()) and not YEARS.match(text, match.end())]
+    figures = []
+    while matches:
+        figure = matches[:1]
+        if len(matches) > 1 and RANGE_SEPARATOR.fullmatch(text[matches[0].end():matches[1].start()]):
+            figure.append(matches[1])
+        figures.append(figure)
+        matches = matches[len(figure):]
+    return figures
+
+def is_money(text, match):
+    """Whether an AMOUNT match carries a unit or follows a currency mark"""
+    return bool(match.group(2)) or text[:match.start()].rstrip().endswith('₹')
+
+class SalaryService:
+    """Numeric salary ranges for jobs, parsed from the display string, and the salary filters and sorts"""
+
+    # sort= values and the (column, descending) each orders by; jobs without a salary come last
+    SORTS = {
+        'salary': ('salary_max', True),
+        'salary_asc': ('salary_min', False),
+    }
+
+    def normalise(self, salary):
+        """Column values for a job's salary string; both None when it cannot be parsed"""
+        parsed = parse_salary(salary)
+        if parsed is None:
+            return {'salary_min': None, 'salary_max': None}
+        return {'salary_min': parsed[0], 'salary_max': parsed[1]}
+
+    def parse_filter(self, args):
+        """Salary filter from request args (``min_salary``, ``max_salary`` in rupees a year), or None.
+
+        Raises ValueError for a value that is not a non-negative whole number.
+        """
+        salary = {}
+        for name in ('min_salary', 'max_salary'):
+            value = args.get(name)
+            if value in (None, ''):
+                continue
+            try:
+                salary[name] = int(value)
+            except ValueError:
+                raise ValueError(f'{name} must be a whole number of rupees')
+            if salary[name] < 0:
+                raise ValueError(f'{name} must not be negative')
+        return salary or None
+
+    def parse_sort(self, sort):
+        """The salary sort named by ``sort=``, or None for the default newest-first order"""
+        if sort in (None, '', 'newest'):
+            return None
+        if sort not in self.SORTS:
+            raise ValueError(f"Unknown sort: {sort} (use newest, {', '.join(self.SORTS)})")
+        return sort
+
+    def apply(self, query, job, salary):
+        """Keep jobs whose salary range overlaps the requested one"""
+        if not salary:
+            return query
+        if 'min_salary' in salary:
+            query = query.filter(job.salary_max >= salary['min_salary'])
+        if 'max_salary' in salary:
+            query = query.filter(job.salary_min <= salary['max_salary'])
+        return query
+
+    def sort_key(self, job, sort):
+        """(column, descending) for a salary sort"""
+        name, descending = self.SORTS[sort]
+        return getattr(job, name), descending
+
+    def order(self, query, job, sort):
+        """Order ``query`` by a salary sort, ties broken by id, with jobs without a salary last"""
+        key, descending = self.sort_key(job, sort)
+        if descending:
+            return query.order_by(key.desc().nulls_last(), job.id.desc())
+        return query.order_by(key.asc().nulls_last(), job.id.asc())
+
+    def parse_cursor_key(self, value):
+        """The salary in a page cursor; empty for a job without one"""
+        return int(value) if value else None
+
+    def after(self, job, sort, salary, job_id):
+        """Filter for the jobs that follow (salary, job_id) in the order of ``order()``"""
+        key, descending = self.sort_key(job, sort)
+        if salary is None:
+            # Already among the jobs without a salary, which are ordered by id alone
+            return and_(key.is_(None), job.id < job_id if descending else job.id > job_id)
+        position = tuple_(key, job.id)
+        return or_(position < (salary, job_id) if descending else position > (salary, job_id), key.is_(None))
+
+salaries = SalaryService()
@@ -3,6 +3,9 @@ let currentJobs = [];
 let filteredJobs = [];
 let isAdminLoggedIn = false;
 let currentJobDetails = null;
+let recentJobs = [];
+let lastEventId = null;
+let eventPollTimer = null;
 
 // DOM elements
 const sections = document.querySelectorAll('.section');
@@ -20,6 +23,8 @@ document.addEventListener('DOMContentLoaded', function() {
 function initializeApp() {
     setupEventListeners();
     loadRecentJobs();
+    loadFacets();
+    setupLiveUpdates();
     showSection('home');
 }
 
@@ -256,6 +261,7 @@ async function loadRecentJobs() {
         const jobs = await response.json();
         
         if (response.ok) {
+            recentJobs = jobs;
             displayRecentJobs(jobs);
         } else {
             console.error('Failed to load recent jobs:', jobs.error);
@@ -273,10 +279,13 @@ async function loadJobs() {
         const searchTerm = document.getElementById('job-search')?.value || '';
         const category = document.getElementById('category-filter')?.value || 'all';
         
-        const params = new URLSearchParams();
+        const params = new URLSearchParams({
+            fields: 'id,title,company,location,category,job_type,experience,salary,description,posted_date'
+        });
         if (searchTerm) params.append('search', searchTerm);
         if (category !== 'all') params.append('category', category);
         
+        loadFacets(searchTerm);
         const response = await fetch(`/api/jobs?${params.toString()}`);
         const jobs = await response.json();
         
@@ -295,6 +304,117 @@ async function loadJobs() {
     }
 }
 
+async function loadFacets(searchTerm = '') {
+    try {
+        const params = new URLSearchParams();
+        if (searchTerm) params.append('search', searchTerm);
+        
+        const response = await fetch(`/api/jobs/facets?${params.toString()}`);
+        if (!response.ok) return;
+        const facets = await response.json();
+        
+        // Show job counts next to each category in the filter, and unfiltered ones on the home page cards
+        document.querySelectorAll('#category-filter option').forEach(option => {
+            if (!option.dataset.label) option.dataset.label = option.textContent;
+            const count = option.value === 'all' ? facets.total : (facets.category[option.value] || 0);
+            option.textContent = `${option.dataset.label} (${count})`;
+        });
+        
+        if (searchTerm) return;
+        document.querySelectorAll('.category-card[data-category]').forEach(card => {
+            let badge = card.querySelector('.job-count');
+            if (!badge) {
+                badge = document.createElement('span');
+                badge.className = 'job-count';
+                card.querySelector('h3')?.after(badge);
+            }
+            const count = facets.category[card.getAttribute('data-category')] || 0;
+            badge.textContent = `${count} ${count === 1 ? 'job' : 'jobs'}`;
+        });
+    } catch (error) {
+        console.error('Error loading facets:', error);
+    }
+}
+
+// Live updates: apply pushed job changes instead of re-fetching the lists
+function setupLiveUpdates() {
+    if (!window.EventSource) {
+        startEventPolling();
+        return;
+    }
+    
+    const source = new EventSource('/api/events/stream');
+    ['job.created', 'job.updated', 'job.deleted', 'jobs.changed', 'reset'].forEach(type => {
+        source.addEventListener(type, e => {
+            lastEventId = e.lastEventId || lastEventId;
+            handleJobEvent(type, JSON.parse(e.data));
+        });
+    });
+    
+    source.onerror = () => {
+        // CLOSED means the server refused the stream (e.g. too many open); fall back to polling
+        if (source.readyState === EventSource.CLOSED) {
+            startEventPolling();
+        }
+    };
+}
+
+function startEventPolling() {
+    if (eventPollTimer) return;
+    
+    const poll = async () => {
+        try {
+            const params = new URLSearchParams();
+            if (lastEventId) params.append('after', lastEventId);
+            const response = await fetch(`/api/events?${params.toString()}`);
+            if (!response.ok) return;
+            
+            const result = await response.json();
+            if (result.reset) {
+                handleJobEvent('reset', {});
+            }
+            result.events.forEach(event => handleJobEvent(event.type, event.data));
+            lastEventId = result.last_event_id;
+        } catch (error) {
+            console.error('Error polling job events:', error);
+        }
+    };
+    
+    poll();
+    eventPollTimer = setInterval(poll, 30000);
+}
+
+const refreshFacetsSoon = debounce(() => loadFacets(document.getElementById('job-search')?.value || ''), 1000);
+
+function handleJobEvent(type, job) {
+    if (type === 'jobs.changed' || type === 'reset') {
+        // Bulk changes (imports, expiry) or missed events: reload once
+        loadRecentJobs();
+        refreshFacetsSoon();
+        return;
+    }
+    
+    const replace = list => {
+        const others = list.filter(item => item.id !== job.id);
+        if (type === 'job.deleted' || !job.is_active) return others;
+        if (type === 'job.created') return [job, ...others];
+        return list.map(item => item.id === job.id ? { ...item, ...job } : item);
+    };
+    
+    recentJobs = replace(recentJobs).slice(0, 6);
+    displayRecentJobs(recentJobs);
+    
+    // New jobs only join the full list when they match its filters
+    const category = document.getElementById('category-filter')?.value || 'all';
+    const searchTerm = document.getElementById('job-search')?.value || '';
+    if (type !== 'job.created' || (!searchTerm && (category === 'all' || category === job.category))) {
+        currentJobs = replace(currentJobs);
+        applyFilters();
+    }
+    
+    refreshFacetsSoon();
+}
+
 function applyFilters() {
     let filtered = [...currentJobs];
     
@@ -648,14 +768,28 @@ async function loadAdminJobs() {
     if (!isAdminLoggedIn) return;
     
     try {
-        const response = await fetch('/api/jobs');
-        const jobs = await response.json();
+        // Page through the listing with only the columns the admin cards show
+        const jobs = [];
+        let cursor = '';
+        do {
+            const params = new URLSearchParams({
+                cursor: cursor,
+                limit: 100,
+                fields: 'id,title,company,location,category,posted_date'
+            });
+            const response = await fetch(`/api/jobs?${params.toString()}`);
+            const page = await response.json();
+            
+            if (!response.ok) {
+                console.error('Failed to load admin jobs:', page.error);
+                return;
+            }
+            
+            jobs.push(...page.jobs);
+            cursor = page.next_cursor;
+        } while (cursor);
         
-        if (response.ok) {
-            displayAdminJobs(jobs);
-        } else {
-            console.error('Failed to load admin jobs:', jobs.error);
-        }
+        displayAdminJobs(jobs);
     } catch (error) {
         console.error('Error loading admin jobs:', error);
     }
@@ -726,11 +860,23 @@ async function handleExcelExport() {
     try {
         showLoading();
         const response = await fetch('/api/export/excel');
-        const result = await response.json();
         
         if (response.ok) {
-            showToast('Excel file generated successfully!', 'success');
+            const blob = await response.blob();
+            const disposition = response.headers.get('Content-Disposition') || '';
+            const match = disposition.match(/filename="?([^"]+)"?/);
+            
+            const link = document.createElement('a');
+            link.href = URL.createObjectURL(blob);
+            link.download = match ? match[1] : 'jobs_export.xlsx';
+            document.body.appendChild(link);
+            link.click();
+            link.remove();
+            URL.revokeObjectURL(link.href);
+            
+            showToast('Excel file downloaded successfully!', 'success');
         } else {
+            const result = await response.json();
             showToast(result.error || 'Failed to export Excel file', 'error');
         }
     } catch (error) {
@@ -0,0 +1,139 @@
+import re
+import logging
+from sqlalchemy import text, func, table, column, literal_column
+from models import Job
+
+class SearchService:
+    """Full-text search over job postings using the database's native index.
+
+    SQLite gets an FTS5 external-content table kept in sync by triggers, and
+    PostgreSQL gets a generated tsvector column with a GIN index. Any other
+    backend (or a SQLite build without FTS5) falls back to LIKE matching.
+    """
+
+    FTS_TABLE = 'job_search'
+    TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+
+    SQLITE_SETUP = [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS job_search USING fts5(
+            title, company, location, description,
+            content='job', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS job_search_ai AFTER INSERT ON job BEGIN
+            INSERT INTO job_search(rowid, title, company, location, description)
+            VALUES (new.id, new.title, new.company, new.location, new.description);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS job_search_ad AFTER DELETE ON job BEGIN
+            INSERT INTO job_search(job_search, rowid, title, company, location, description)
+            VALUES ('delete', old.id, old.title, old.company, old.location, old.description);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS job_search_au
+        AFTER UPDATE OF title, company, location, description ON job BEGIN
+            INSERT INTO job_search(job_search, rowid, title, company, location, description)
+            VALUES ('delete', old.id, old.title, old.company, old.location, old.description);
+            INSERT INTO job_search(rowid, title, company, location, description)
+            VALUES (new.id, new.title, new.company, new.location, new.description);
+        END
+        """
+    ]
+
+    POSTGRES_SETUP = [
+        """
+        ALTER TABLE job ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(company, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(location, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(description, '')), 'C')
+        ) STORED
+        """,
+        "CREATE INDEX IF NOT EXISTS ix_job_search_vector ON job USING GIN (search_vector)"
+    ]
+
+    def __init__(self):
+        self.backend = None
+
+    def create_index(self, conn):
+        """Create the search index for the connection's database (run by migrations)"""
+        dialect = conn.dialect.name
+
+        if dialect == 'sqlite':
+            for statement in self.SQLITE_SETUP:
+                conn.execute(text(statement))
+            # Index rows that were inserted before the table existed
+            conn.execute(text("INSERT INTO job_search(job_search) VALUES ('rebuild')"))
+        elif dialect == 'postgresql':
+            for statement in self.POSTGRES_SETUP:
+                conn.execute(text(statement))
+
+    def init_db(self, engine):
+        """Detect which search index the migrations have installed"""
+        dialect = engine.dialect.name
+        self.backend = None
+
+        try:
+            with engine.connect() as conn:
+                if dialect == 'sqlite':
+                    found = conn.execute(
+                        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                        {'name': self.FTS_TABLE}
+                    ).first()
+                elif dialect == 'postgresql':
+                    found = conn.execute(
+                        text("SELECT 1 FROM information_schema.columns "
+                             "WHERE table_name = 'job' AND column_name = 'search_vector'")
+                    ).first()
+                else:
+                    found = None
+                if found:
+                    self.backend = dialect
+        except Exception as e:
+            logging.warning(f"Could not inspect search index: {str(e)}")
+
+        logging.info(f"Search backend: {self.backend or 'like'}")
+        return self.backend
+
+    def tokenize(self, search):
+        """Split a search string into lowercase word tokens"""
+        return [token.lower() for token in self.TOKEN_PATTERN.findall(search or '')]
+
+    def apply(self, query, search, rank=True):
+        """Restrict a Job query to postings matching every search term.
+
+        Each term is treated as a prefix, so "soft eng" matches "Software Engineer".
+        With ``rank`` the best matches come first; keyset pagination turns it off
+        because it needs a stable (posted_date, id) ordering.
+        """
+        terms = self.tokenize(search)
+        if not terms:
+            return query
+
+        if self.backend == 'sqlite':
+            fts = table(self.FTS_TABLE, column('rowid'), column('rank'))
+            match = ' '.join(f'"{term}"*' for term in terms)
+            query = (query.join(fts, fts.c.rowid == Job.id)
+                          .filter(literal_column(self.FTS_TABLE).match(match)))
+            return query.order_by(fts.c.rank) if rank else query
+
+        if self.backend == 'postgresql':
+            vector = literal_column('job.search_vector')
+            tsquery = func.to_tsquery('simple', ' & '.join(f'{term}:*' for term in terms))
+            query = query.filter(vector.op('@@')(tsquery))
+            return query.order_by(func.ts_rank(vector, tsquery).desc()) if rank else query
+
+        for term in terms:
+            query = query.filter(
+                Job.title.contains(term) |
+                Job.company.contains(term) |
+                Job.location.contains(term) |
+                Job.description.contains(term)
+            )
+        return query
@@ -0,0 +1,58 @@
+import os
+import json
+from datetime import date
+
+# Fastest available JSON encoder; JSON_BACKEND=json forces the standard library
+_preferred = os.getenv('JSON_BACKEND', 'auto')
+
+orjson = None
+msgspec_encoder = None
+
+if _preferred in ('auto', 'orjson'):
+    try:
+        import orjson
+    except ImportError:
+        orjson = None
+
+if orjson is None and _preferred in ('auto', 'msgspec'):
+    try:
+        import msgspec
+        msgspec_encoder = msgspec.json.Encoder()
+    except ImportError:
+        msgspec_encoder = None
+
+BACKEND = 'orjson' if orjson is not None else 'msgspec' if msgspec_encoder is not None else 'json'
+
+def _default(value):
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(data):
+    """Encode data as compact UTF-8 JSON bytes; datetimes become ISO 8601 strings"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    if msgspec_encoder is not None:
+        return msgspec_encoder.encode(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'), default=_default).encode('utf-8')
+
+def rows_to_dicts(rows, fields):
+    """Turn column tuples (from ``Query.with_entities``) into API dicts"""
+    return [dict(zip(fields, row)) for row in rows]
+
+def stream_array(rows, fields, chunk_size=500):
+    """Yield a JSON array of row dicts in encoded chunks, so large lists are never held whole"""
+    yield b'['
+    first = True
+    chunk = []
+    for row in rows:
+        chunk.append(dict(zip(fields, row)))
+        if len(chunk) >= chunk_size:
+            body = dumps(chunk)[1:-1]
+            yield body if first else b',' + body
+            first = False
+            chunk = []
+    if chunk:
+        body = dumps(chunk)[1:-1]
+        yield body if first else b',' + body
+    yield b']'
@@ -0,0 +1,275 @@
+import os
+import time
+import sqlite3
+import logging
+import secrets
+import threading
+from collections import OrderedDict
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+class ServerSession(CallbackDict, SessionMixin):
+    """Session data kept on the server; the cookie only carries a random id"""
+
+    def __init__(self, initial=None, sid=None, expires_at=None):
+        def on_update(self):
+            self.modified = True
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.expires_at = expires_at
+        self.new = sid is None
+        self.modified = False
+        self.rotate = False
+
+    def regenerate(self):
+        """Move the data to a fresh id when the privilege level changes (e.g. at login)"""
+        self.rotate = True
+        self.modified = True
+
+class MemorySessionStore:
+    """Sessions in an LRU dict, for a single process"""
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, sid):
+        """(data, expires_at) for a live session, else None"""
+        with self.lock:
+            entry = self.entries.get(sid)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self.entries[sid]
+                return None
+            self.entries.move_to_end(sid)
+            return entry
+
+    def set(self, sid, data, expires_at):
+        with self.lock:
+            self.entries[sid] = (data, expires_at)
+            self.entries.move_to_end(sid)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def touch(self, sid, expires_at):
+        with self.lock:
+            entry = self.entries.get(sid)
+            if entry is not None:
+                self.entries[sid] = (entry[0], expires_at)
+
+    def delete(self, sid):
+        with self.lock:
+            self.entries.pop(sid, None)
+
+    def cleanup(self, limit):
+        now = time.time()
+        with self.lock:
+            expired = [sid for sid, (_, expires_at) in self.entries.items() if expires_at <= now][:limit]
+            for sid in expired:
+                del self.entries[sid]
+        return len(expired)
+
+class SQLiteSessionStore:
+    """Sessions in a SQLite file shared by every worker on the host.
+
+    Kept apart from the application database so session writes never wait
+    on job transactions.
+    """
+
+    def __init__(self, path):
+        # Nothing is opened here: the app is imported before gunicorn forks its
+        # workers, and a SQLite connection must not be shared across processes
+        self.path = path
+        self.local = threading.local()
+
+    def _connection(self):
+        conn = getattr(self.local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS session ("
+                "id TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_session_expires_at ON session (expires_at)")
+            self.local.conn = conn
+        return conn
+
+    def get(self, sid):
+        row = self._connection().execute(
+            "SELECT data, expires_at FROM session WHERE id = ? AND expires_at > ?", (sid, time.time())
+        ).fetchone()
+        return tuple(row) if row else None
+
+    def set(self, sid, data, expires_at):
+        self._connection().execute(
+            "INSERT INTO session (id, data, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET data = excluded.data, expires_at = excluded.expires_at",
+            (sid, data, expires_at)
+        )
+
+    def touch(self, sid, expires_at):
+        self._connection().execute("UPDATE session SET expires_at = ? WHERE id = ?", (expires_at, sid))
+
+    def delete(self, sid):
+        self._connection().execute("DELETE FROM session WHERE id = ?", (sid,))
+
+    def cleanup(self, limit):
+        cursor = self._connection().execute(
+            "DELETE FROM session WHERE id IN (SELECT id FROM session WHERE expires_at <= ? LIMIT ?)",
+            (time.time(), limit)
+        )
+        return cursor.rowcount
+
+class RedisSessionStore:
+    """Sessions as Redis keys; Redis drops expired ones itself"""
+
+    def __init__(self, url, prefix='jobsindia:session:'):
+        import redis
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, sid):
+        pipe = self.client.pipeline()
+        pipe.get(self.prefix + sid)
+        pipe.pttl(self.prefix + sid)
+        data, ttl_ms = pipe.execute()
+        if data is None or ttl_ms < 0:
+            return None
+        return data.decode('utf-8'), time.time() + ttl_ms / 1000
+
+    def set(self, sid, data, expires_at):
+        self.client.set(self.prefix + sid, data, px=max(int((expires_at - time.time()) * 1000), 1))
+
+    def touch(self, sid, expires_at):
+        self.client.pexpireat(self.prefix + sid, int(expires_at * 1000))
+
+    def delete(self, sid):
+        self.client.delete(self.prefix + sid)
+
+    def cleanup(self, limit):
+        return 0
+
+class ServerSessionInterface(SessionInterface):
+    """Flask session interface backed by a session store.
+
+    ``SESSION_URL`` picks the store: ``memory`` (one process only),
+    ``sqlite:///path`` (shared by the workers on one host) or ``redis://``.
+    Sessions expire after ``SESSION_TTL`` idle seconds; the expiry slides
+    forward at most once per ``SESSION_REFRESH`` seconds, so most requests
+    only read the store. Expired rows are deleted in batches of
+    ``SESSION_CLEANUP_BATCH`` every ``SESSION_CLEANUP_INTERVAL`` seconds.
+    """
+
+    serializer = TaggedJSONSerializer()
+
+    def __init__(self, url):
+        self.store = self._create_store(url)
+        self.ttl = int(os.getenv('SESSION_TTL', str(7 * 24 * 3600)))
+        self.refresh = int(os.getenv('SESSION_REFRESH', '300'))
+        self.cleanup_interval = int(os.getenv('SESSION_CLEANUP_INTERVAL', '300'))
+        self.cleanup_batch = int(os.getenv('SESSION_CLEANUP_BATCH', '500'))
+        self.next_cleanup = time.monotonic() + self.cleanup_interval
+        self.cleanup_lock = threading.Lock()
+
+    def _create_store(self, url):
+        if url.startswith(('redis://', 'rediss://', 'unix://')):
+            try:
+                return RedisSessionStore(url)
+            except ImportError:
+                logging.warning("redis package not installed, keeping sessions in process memory")
+        elif url.startswith('sqlite:///'):
+            return SQLiteSessionStore(url[len('sqlite:///'):])
+        elif url != 'memory':
+            logging.warning(f"Unknown SESSION_URL {url!r}, keeping sessions in process memory")
+        return MemorySessionStore(int(os.getenv('SESSION_MAX_ENTRIES', '10000')))
+
+    def open_session(self, app, request):
+        sid = request.cookies.get(self.get_cookie_name(app))
+        if sid:
+            try:
+                entry = self.store.get(sid)
+            except Exception as e:
+                logging.error(f"Error loading session: {str(e)}")
+                entry = None
+            if entry is not None:
+                try:
+                    return ServerSession(self.serializer.loads(entry[0]), sid=sid, expires_at=entry[1])
+                except ValueError:
+                    logging.warning("Discarding unreadable session")
+        return ServerSession()
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        if not session:
+            if session.sid is not None:
+                # Emptied (logout): drop the stored session and the cookie
+                try:
+                    self.store.delete(session.sid)
+                except Exception as e:
+                    logging.error(f"Error deleting session: {str(e)}")
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        now = time.time()
+        expires_at = now + self.ttl
+        if session.modified:
+            if session.rotate and session.sid is not None:
+                try:
+                    self.store.delete(session.sid)
+                except Exception as e:
+                    logging.error(f"Error deleting session: {str(e)}")
+                session.sid = None
+            issue_cookie = session.sid is None
+            if issue_cookie:
+                session.sid = secrets.token_urlsafe(32)
+            try:
+                self.store.set(session.sid, self.serializer.dumps(dict(session)), expires_at)
+            except Exception as e:
+                # The response still goes out; the change is lost, as when loading fails
+                logging.error(f"Error saving session: {str(e)}")
+                return
+            if issue_cookie:
+                response.vary.add('Cookie')
+                response.set_cookie(
+                    name, session.sid, domain=domain, path=path,
+                    httponly=self.get_cookie_httponly(app),
+                    secure=self.get_cookie_secure(app),
+                    samesite=self.get_cookie_samesite(app)
+                )
+        elif session.expires_at is not None and session.expires_at - now < self.ttl - self.refresh:
+            try:
+                self.store.touch(session.sid, expires_at)
+            except Exception as e:
+                logging.error(f"Error refreshing session: {str(e)}")
+
+        self._maybe_cleanup()
+
+    def cleanup(self, limit=None):
+        """Delete expired sessions in batches; returns how many were removed"""
+        limit = limit or self.cleanup_batch
+        removed = 0
+        while True:
+            deleted = self.store.cleanup(limit)
+            removed += deleted
+            if deleted < limit:
+                return removed
+
+    def _maybe_cleanup(self):
+        # One request per interval pays for a single batch
+        if time.monotonic() < self.next_cleanup or not self.cleanup_lock.acquire(blocking=False):
+            return
+        try:
+            self.next_cleanup = time.monotonic() + self.cleanup_interval
+            self.store.cleanup(self.cleanup_batch)
+        except Exception as e:
+            logging.warning(f"Session cleanup failed: {str(e)}")
+        finally:
+            self.cleanup_lock.release()
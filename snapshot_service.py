@@ -0,0 +1,165 @@
+import os
+import gzip
+import json
+import hashlib
+import logging
+from datetime import datetime
+from search_service import SearchService
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip copies are written without it
+    brotli = None
+
+class SnapshotBuilder:
+    """Builds the precomputed data files the static GitHub Pages site loads.
+
+    Output layout (every file except manifest.json is content-hashed, so it can
+    be served with an immutable cache header):
+
+        manifest.json                       entry point (with the newest listing rows), always revalidated
+        listings/<category>.<hash>.json     compact listing rows per category
+        jobs/<id>.<hash>.json               full details for one job
+        search/tokens.<hash>.json           token -> [job ids] for client-side search
+
+    Each file also gets .gz (and .br when brotli is installed) siblings.
+    """
+
+    LISTING_FIELDS = ['id', 'title', 'company', 'location', 'category', 'posted_date', 'detail']
+    SEARCH_FIELDS = ('title', 'company', 'location', 'category', 'description')
+    # Newest rows inlined in the manifest for the home page, so it needs no shard
+    RECENT_COUNT = 6
+    HASH_LENGTH = 12
+
+    def __init__(self, output_dir=None):
+        self.output_dir = output_dir or os.getenv('STATIC_SNAPSHOT_DIR', 'site-data')
+        self.tokenizer = SearchService()
+
+    def build(self, jobs_data):
+        """Write a new snapshot for ``jobs_data`` (an iterable of job dicts) and return its manifest"""
+        listings = {}
+        tokens = {}
+        written = 0
+
+        for job in jobs_data:
+            detail_name, created = self._write_hashed('jobs', str(job['id']), job)
+            written += created
+            detail_hash = detail_name.rsplit('.', 2)[-2]
+
+            listings.setdefault(job['category'], []).append(
+                [job['id'], job['title'], job['company'], job['location'],
+                 job['category'], job['posted_date'], detail_hash]
+            )
+
+            for field in self.SEARCH_FIELDS:
+                for token in self.tokenizer.tokenize(job.get(field)):
+                    ids = tokens.setdefault(token, [])
+                    if not ids or ids[-1] != job['id']:
+                        ids.append(job['id'])
+
+        categories = {}
+        for category, rows in sorted(listings.items()):
+            rows.sort(key=lambda row: (row[5] or '', row[0]), reverse=True)
+            name, created = self._write_hashed('listings', category, rows)
+            written += created
+            categories[category] = {'file': name, 'count': len(rows)}
+
+        search_name, created = self._write_hashed('search', 'tokens', dict(sorted(tokens.items())))
+        written += created
+
+        recent = sorted((row for rows in listings.values() for row in rows),
+                        key=lambda row: (row[5] or '', row[0]), reverse=True)[:self.RECENT_COUNT]
+
+        manifest = {
+            'generated_at': datetime.utcnow().isoformat(),
+            'fields': self.LISTING_FIELDS,
+            'total': sum(entry['count'] for entry in categories.values()),
+            'categories': categories,
+            'recent': recent,
+            'search': search_name,
+            'detail_pattern': 'jobs/{id}.{detail}.json'
+        }
+
+        previous = self._read_manifest()
+        self._write_file('manifest.json', self._encode(manifest))
+        removed = self._remove_stale(manifest, previous)
+
+        logging.info(f"Snapshot built: {manifest['total']} jobs, {written} files written, {removed} removed")
+        return manifest
+
+    def _encode(self, data):
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def _write_hashed(self, folder, stem, data):
+        """Write data under a content-hashed name; returns (relative name, whether it was new)"""
+        body = self._encode(data)
+        digest = hashlib.sha256(body).hexdigest()[:self.HASH_LENGTH]
+        name = f"{folder}/{self._safe_stem(stem)}.{digest}.json"
+
+        # Same name means same content, so unchanged jobs cost nothing on rebuild
+        if os.path.exists(os.path.join(self.output_dir, name)):
+            return name, False
+
+        self._write_file(name, body)
+        return name, True
+
+    def _safe_stem(self, stem):
+        return ''.join(ch if ch.isalnum() or ch in '-_' else '_' for ch in str(stem)) or '_'
+
+    def _write_file(self, name, body):
+        path = os.path.join(self.output_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        variants = [(path, body), (path + '.gz', gzip.compress(body, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append((path + '.br', brotli.compress(body)))
+
+        for target, content in variants:
+            tmp_path = f"{target}.tmp.{os.getpid()}"
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, target)
+
+    def _read_manifest(self):
+        try:
+            with open(os.path.join(self.output_dir, 'manifest.json'), 'rb') as f:
+                return json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def _referenced_files(self, manifest):
+        names = {entry['file'] for entry in manifest.get('categories', {}).values()}
+        names.add(manifest.get('search'))
+        for entry in manifest.get('categories', {}).values():
+            with open(os.path.join(self.output_dir, entry['file']), 'rb') as f:
+                for row in json.loads(f.read()):
+                    names.add(f"jobs/{self._safe_stem(row[0])}.{row[-1]}.json")
+        return names
+
+    def _remove_stale(self, manifest, previous):
+        """Delete files referenced by neither this snapshot nor the one before it.
+
+        Keeping one generation back lets clients that loaded the old manifest
+        finish fetching its files.
+        """
+        keep = self._referenced_files(manifest)
+        if previous:
+            try:
+                keep |= self._referenced_files(previous)
+            except (OSError, ValueError):
+                pass
+
+        removed = 0
+        for folder in ('jobs', 'listings', 'search'):
+            directory = os.path.join(self.output_dir, folder)
+            if not os.path.isdir(directory):
+                continue
+            for filename in os.listdir(directory):
+                base = filename
+                for suffix in ('.gz', '.br'):
+                    if base.endswith(suffix):
+                        base = base[:-len(suffix)]
+                if f"{folder}/{base}" not in keep:
+                    os.unlink(os.path.join(directory, filename))
+                    removed += 1
+        return removed
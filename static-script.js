@@ -172,36 +172,140 @@ function updateActiveNavLink(sectionId) {
 }
 
 // Jobs functions
+// Precomputed data files written by `flask build-snapshot`; jobs.json is the fallback
+const SNAPSHOT_BASE = './site-data/';
+let snapshotManifest = null;
+let searchIndex = null;
+let searchIndexPromise = null;
+// Category shards are fetched when a filter first needs them
+const shardPromises = {};
+let recentJobs = [];
+
 async function loadJobsFromFile() {
     try {
-        const response = await fetch('./jobs.json');
-        const jobs = await response.json();
-        currentJobs = jobs;
-        displayRecentJobs(jobs.slice(0, 6));
-        applyFilters();
+        await loadSnapshotManifest();
     } catch (error) {
-        console.error('Error loading jobs:', error);
-        currentJobs = [];
-        displayRecentJobs([]);
+        console.warn('Snapshot unavailable, loading jobs.json:', error);
+        try {
+            snapshotManifest = null;
+            const response = await fetch('./jobs.json');
+            currentJobs = await response.json();
+        } catch (fallbackError) {
+            console.error('Error loading jobs:', fallbackError);
+            currentJobs = [];
+        }
+        recentJobs = [...currentJobs].sort((a, b) => new Date(b.posted_date) - new Date(a.posted_date)).slice(0, 6);
+    }
+    
+    displayRecentJobs(recentJobs);
+    if (document.getElementById('jobs')?.classList.contains('active')) {
+        applyFilters();
+    }
+}
+
+async function loadSnapshotManifest() {
+    const response = await fetch(`${SNAPSHOT_BASE}manifest.json`, { cache: 'no-cache' });
+    if (!response.ok) {
+        throw new Error(`manifest.json: ${response.status}`);
+    }
+    snapshotManifest = await response.json();
+    recentJobs = (snapshotManifest.recent || []).map(rowToJob);
+}
+
+function rowToJob(row) {
+    const job = {};
+    snapshotManifest.fields.forEach((field, index) => { job[field] = row[index]; });
+    return job;
+}
+
+function missingShards(category) {
+    const categories = category === 'all' ? Object.keys(snapshotManifest.categories) : [category];
+    return categories.filter(name => snapshotManifest.categories[name] && !(name in shardPromises));
+}
+
+function loadShards(categories) {
+    categories.forEach(name => {
+        shardPromises[name] = fetch(SNAPSHOT_BASE + snapshotManifest.categories[name].file)
+            .then(response => response.json())
+            .then(rows => {
+                currentJobs = currentJobs.concat(rows.map(rowToJob));
+            })
+            .catch(error => {
+                // Fetched again by the next filter change
+                delete shardPromises[name];
+                throw error;
+            });
+    });
+    return Promise.all(categories.map(name => shardPromises[name]));
+}
+
+function loadSearchIndex() {
+    if (!searchIndexPromise) {
+        searchIndexPromise = fetch(SNAPSHOT_BASE + snapshotManifest.search)
+            .then(response => response.json())
+            .then(index => {
+                searchIndex = index;
+                return index;
+            });
+    }
+    return searchIndexPromise;
+}
+
+function searchJobIds(searchTerm) {
+    // Every term must match the start of some indexed token (prefix search)
+    const terms = searchTerm.toLowerCase().match(/[\p{L}\p{N}_]+/gu) || [];
+    const tokens = Object.keys(searchIndex);
+    let matches = null;
+    
+    for (const term of terms) {
+        const ids = new Set();
+        tokens.forEach(token => {
+            if (token.startsWith(term)) {
+                searchIndex[token].forEach(id => ids.add(id));
+            }
+        });
+        matches = matches === null ? ids : new Set([...matches].filter(id => ids.has(id)));
     }
+    
+    return matches;
 }
 
 function applyFilters() {
+    const category = document.getElementById('category-filter')?.value || 'all';
+    if (snapshotManifest) {
+        const missing = missingShards(category);
+        if (missing.length) {
+            loadShards(missing).then(applyFilters).catch(error => console.error('Error loading jobs:', error));
+            return;
+        }
+    }
+    
     let filtered = [...currentJobs];
     
     // Apply search filter
     const searchTerm = document.getElementById('job-search')?.value.toLowerCase() || '';
     if (searchTerm) {
-        filtered = filtered.filter(job => 
-            job.title.toLowerCase().includes(searchTerm) ||
-            job.company.toLowerCase().includes(searchTerm) ||
-            job.location.toLowerCase().includes(searchTerm) ||
-            job.description.toLowerCase().includes(searchTerm)
-        );
+        if (snapshotManifest && !searchIndex) {
+            loadSearchIndex().then(applyFilters).catch(error => console.error('Error loading search index:', error));
+            return;
+        }
+        
+        if (snapshotManifest) {
+            const ids = searchJobIds(searchTerm);
+            if (ids !== null) {
+                filtered = filtered.filter(job => ids.has(job.id));
+            }
+        } else {
+            filtered = filtered.filter(job => 
+                job.title.toLowerCase().includes(searchTerm) ||
+                job.company.toLowerCase().includes(searchTerm) ||
+                job.location.toLowerCase().includes(searchTerm) ||
+                job.description.toLowerCase().includes(searchTerm)
+            );
+        }
     }
     
     // Apply category filter
-    const category = document.getElementById('category-filter')?.value || 'all';
     if (category !== 'all') {
         filtered = filtered.filter(job => job.category === category);
     }
@@ -248,9 +352,10 @@ function displayJobs(jobs) {
 
 function createJobCard(job, isRecent = false) {
     const postedDate = job.posted_date ? new Date(job.posted_date).toLocaleDateString() : 'Recently';
+    // Snapshot listing rows carry no description; it is loaded with the details
     const description = job.description ? 
         (job.description.length > 150 ? job.description.substring(0, 150) + '...' : job.description) 
-        : 'No description available';
+        : (job.detail ? '' : 'No description available');
     
     return `
         <div class="job-card" onclick="showJobDetails(${job.id})">
@@ -269,9 +374,9 @@ function createJobCard(job, isRecent = false) {
                 ${job.salary ? `<span><i class="fas fa-rupee-sign"></i> ${escapeHtml(job.salary)}</span>` : ''}
             </div>
             
-            <div class="job-description">
+            ${description ? `<div class="job-description">
                 ${escapeHtml(description)}
-            </div>
+            </div>` : ''}
             
             <div class="job-footer">
                 <span>Posted: ${postedDate}</span>
@@ -281,10 +386,22 @@ function createJobCard(job, isRecent = false) {
     `;
 }
 
-function showJobDetails(jobId) {
-    const job = currentJobs.find(j => j.id === jobId);
+async function showJobDetails(jobId) {
+    let job = currentJobs.find(j => j.id === jobId) || recentJobs.find(j => j.id === jobId);
     if (!job) return;
     
+    if (job.detail && !job.description) {
+        try {
+            const path = snapshotManifest.detail_pattern
+                .replace('{id}', job.id)
+                .replace('{detail}', job.detail);
+            const response = await fetch(SNAPSHOT_BASE + path);
+            job = await response.json();
+        } catch (error) {
+            console.error('Error loading job details:', error);
+        }
+    }
+    
     const postedDate = job.posted_date ? new Date(job.posted_date).toLocaleDateString() : 'Recently';
     const deadline = job.deadline ? new Date(job.deadline).toLocaleDateString() : 'Not specified';
     
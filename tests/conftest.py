@@ -0,0 +1,100 @@
+import os
+import sys
+import sqlite3
+import tempfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# The schema db.create_all() made before the migration runner existed
+BASELINE_SCHEMA = """
+CREATE TABLE user (
+    id INTEGER NOT NULL,
+    username VARCHAR(64) NOT NULL,
+    email VARCHAR(120) NOT NULL,
+    password_hash VARCHAR(256),
+    is_admin BOOLEAN,
+    created_at DATETIME,
+    PRIMARY KEY (id),
+    UNIQUE (username),
+    UNIQUE (email)
+);
+CREATE TABLE job (
+    id INTEGER NOT NULL,
+    title VARCHAR(200) NOT NULL,
+    company VARCHAR(200) NOT NULL,
+    location VARCHAR(200) NOT NULL,
+    category VARCHAR(50) NOT NULL,
+    job_type VARCHAR(50) NOT NULL,
+    experience VARCHAR(50) NOT NULL,
+    salary VARCHAR(100),
+    description TEXT NOT NULL,
+    requirements TEXT,
+    application_url VARCHAR(500),
+    contact_email VARCHAR(120),
+    posted_date DATETIME,
+    deadline DATETIME,
+    is_active BOOLEAN,
+    created_by INTEGER,
+    PRIMARY KEY (id),
+    FOREIGN KEY(created_by) REFERENCES user (id)
+);
+"""
+
+# (title, location, category, job_type, experience, salary, is_active)
+BASELINE_JOBS = [
+    ('Baseline Engineer', 'Bangalore, Karnataka', 'it', 'Full-time', 'Mid Level', '12-18 LPA', 1),
+    ('Baseline Teacher', 'Mysore', 'Teaching', 'Internship', 'Entry Level', 'Negotiable', 1),
+    ('Baseline Clerk', 'New Delhi', 'government', 'Full-time', 'Entry Level', '₹25,000 per month', 0),
+]
+
+def create_baseline_database(path):
+    conn = sqlite3.connect(path)
+    conn.executescript(BASELINE_SCHEMA)
+    conn.executemany(
+        "INSERT INTO job (title, company, location, category, job_type, experience, salary, description, "
+        "posted_date, is_active) VALUES (?, 'Acme', ?, ?, ?, ?, ?, 'Posted before migrations', "
+        "'2024-01-02 03:04:05.000000', ?)",
+        BASELINE_JOBS
+    )
+    conn.commit()
+    conn.close()
+
+# The app reads its settings and migrates at import, and keeps jobs.json/jobs.xlsx in the
+# working directory; start from a baseline database in a scratch directory so the whole
+# suite runs on a schema upgraded through every migration
+WORKDIR = tempfile.mkdtemp(prefix='jobsindia-tests-')
+os.chdir(WORKDIR)
+create_baseline_database(os.path.join(WORKDIR, 'jobs.db'))
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(WORKDIR, 'jobs.db')}"
+os.environ['AUTO_MIGRATE'] = '1'
+os.environ['OUTBOX_WORKER'] = 'off'
+os.environ.pop('SESSION_URL', None)
+os.environ.pop('DATABASE_REPLICA_URL', None)
+
+@pytest.fixture(scope='session')
+def app():
+    from app import app as flask_app
+    return flask_app
+
+@pytest.fixture(scope='session')
+def client(app):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['admin_logged_in'] = True
+        session['admin_username'] = 'admin'
+    return client
+
+@pytest.fixture(scope='session')
+def create_job(client):
+    """Post a job through the admin API and return its id"""
+    def create(**fields):
+        data = {'title': 'Test Job', 'company': 'Acme', 'location': 'Bengaluru, Karnataka',
+                'category': 'it', 'description': 'A test job'}
+        data.update(fields)
+        response = client.post('/api/admin/jobs', json=data)
+        assert response.status_code == 200, response.get_json()
+        return response.get_json()['job']['id']
+    return create
@@ -0,0 +1,24 @@
+import fcntl
+
+import pytest
+from werkzeug.security import generate_password_hash
+
+import app  # noqa: F401  models.py needs the app imported first
+from auth_service import AuthService, AuthBusy
+
+def test_password_checks_share_slots_across_workers(tmp_path, monkeypatch):
+    monkeypatch.setenv('AUTH_LOCK_DIR', str(tmp_path))
+    monkeypatch.setenv('AUTH_MAX_HASHES', '1')
+    monkeypatch.setenv('AUTH_HASH_WAIT', '0.2')
+    auth = AuthService()
+    password_hash = generate_password_hash('secret')
+    assert auth.verify_password(password_hash, 'secret')
+
+    # Another worker holding the only slot
+    with open(auth.hash_slots[0], 'w') as held:
+        fcntl.flock(held, fcntl.LOCK_EX)
+        with pytest.raises(AuthBusy):
+            AuthService().verify_password(password_hash, 'secret')
+        fcntl.flock(held, fcntl.LOCK_UN)
+
+    assert not auth.verify_password(password_hash, 'wrong')
@@ -0,0 +1,11 @@
+from routes import auth, response_cache
+
+def test_auth_invalidation_keeps_cached_job_responses():
+    key = response_cache.make_key('jobs_list', {})
+    response_cache.backend.set(key, b'etag\n{}', 60)
+
+    auth.invalidate('someone')
+    assert response_cache.backend.get(key) == b'etag\n{}'
+
+    response_cache.invalidate()
+    assert response_cache.backend.get(key) is None
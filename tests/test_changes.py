@@ -0,0 +1,23 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+IST = timezone(timedelta(hours=5, minutes=30))
+
+@pytest.mark.parametrize('zone', [None, timezone.utc, IST])
+def test_changes_since_timestamp(client, create_job, zone):
+    before = create_job(title='Changed before')
+    moment = datetime.now(timezone.utc)
+    after = create_job(title='Changed after')
+
+    since = moment.replace(tzinfo=None) if zone is None else moment.astimezone(zone)
+    response = client.get('/api/jobs/changes', query_string={'since': since.isoformat()})
+    assert response.status_code == 200, response.get_json()
+    changed = [job['id'] for job in response.get_json()['upserts']]
+    assert after in changed
+    assert before not in changed
+
+@pytest.mark.parametrize('since', ['yesterday', '-1', '0001-01-01T00:00:00+05:30'])
+def test_changes_since_invalid(client, since):
+    response = client.get('/api/jobs/changes', query_string={'since': since})
+    assert response.status_code == 400
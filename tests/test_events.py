@@ -0,0 +1,16 @@
+from routes import events
+
+def test_stream_slot_released_without_reading_the_stream(client):
+    for _ in range(events.max_streams + 1):
+        response = client.head('/api/events/stream')
+        assert response.status_code == 200
+        response.close()
+
+    # A client that disconnects before the first frame
+    response = client.get('/api/events/stream')
+    assert response.status_code == 200
+    response.close()
+
+    response = client.get('/api/events/stream')
+    assert response.status_code == 200
+    response.close()
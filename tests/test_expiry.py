@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app import db
+from models import Job, JobArchive
+from expiry_service import ExpiryService
+
+def test_job_stays_open_through_its_deadline_day(app, create_job):
+    now = datetime.utcnow().replace(hour=15, minute=30)
+    today = now.date()
+    due_today = create_job(title='Closes today', deadline=today.isoformat())
+    due_yesterday = create_job(title='Closed yesterday', deadline=(today - timedelta(days=1)).isoformat())
+
+    with app.app_context():
+        ExpiryService().run(now=now)
+        assert db.session.get(Job, due_today).is_active
+        assert not db.session.get(Job, due_yesterday).is_active
+
+        # Once the deadline day is over the job expires too
+        ExpiryService().run(now=now + timedelta(days=1))
+        db.session.expire_all()
+        assert not db.session.get(Job, due_today).is_active
+
+def test_archive_accepts_a_reused_job_id(app, create_job):
+    now = datetime.utcnow()
+    long_ago = (now - timedelta(days=365)).date().isoformat()
+
+    with app.app_context():
+        first = create_job(title='Archived first', deadline=long_ago)
+        ExpiryService().run(now=now)
+        assert db.session.get(Job, first) is None
+
+        # SQLite gives the next job the id of the archived one
+        second = create_job(title='Archived second', deadline=long_ago)
+        assert second == first
+        ExpiryService().run(now=now)
+        assert db.session.get(Job, second) is None
+
+        archived = db.session.scalars(select(JobArchive.title).where(JobArchive.job_id == first)
+                                      .order_by(JobArchive.id)).all()
+        assert archived == ['Archived first', 'Archived second']
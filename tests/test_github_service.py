@@ -0,0 +1,191 @@
+import re
+import json
+import base64
+import hashlib
+
+import pytest
+from requests.adapters import BaseAdapter
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+import github_service
+from github_service import GitHubService
+
+CONTENTS_PATH = re.compile(r'^/repos/[^/]+/[^/]+/contents/(?P<path>[^?]+)')
+
+class FakeGitHubContents(BaseAdapter):
+    """In-memory contents API for one repository, mounted on GitHubService.session.
+
+    SHAs, ETags, 409 conflicts and rate-limit headers behave like GitHub's, and
+    ``calls`` records (method, status) for every request.
+    """
+
+    def __init__(self, clock, rate_limit=5000):
+        super().__init__()
+        self.clock = clock
+        self.files = {}
+        self.calls = []
+        self.limit = rate_limit
+        self.remaining = rate_limit
+        self.reset_at = clock.time() + 3600
+
+    def commit_externally(self, path, content):
+        """Change a file as if someone else had committed it"""
+        self._store(path, content.encode('utf-8'))
+
+    def exhaust_rate_limit(self, reset_in):
+        self.remaining = 0
+        self.reset_at = self.clock.time() + reset_in
+
+    def send(self, request, **kwargs):
+        match = CONTENTS_PATH.match(request.path_url)
+        if not match:
+            return self._respond(request, 404, {'message': 'Not Found'})
+        path = match.group('path')
+
+        if self.clock.time() >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = self.clock.time() + 3600
+
+        current = self.files.get(path)
+        etag = f'"{current["sha"]}"' if current else None
+
+        # Conditional hits are free, as on GitHub
+        if request.method == 'GET' and etag and request.headers.get('If-None-Match') == etag:
+            return self._respond(request, 304, None, {'ETag': etag})
+
+        if self.remaining <= 0:
+            return self._respond(request, 403, {'message': 'API rate limit exceeded'})
+        self.remaining -= 1
+
+        if request.method == 'GET':
+            if current is None:
+                return self._respond(request, 404, {'message': 'Not Found'})
+            return self._respond(request, 200, self._entry(path, current), {'ETag': etag})
+
+        if request.method == 'PUT':
+            body = json.loads(request.body)
+            if current is not None and body.get('sha') != current['sha']:
+                return self._respond(request, 409, {'message': f'{path} does not match {body.get("sha")}'})
+            if current is None and body.get('sha'):
+                return self._respond(request, 422, {'message': 'sha was supplied for a new file'})
+            stored = self._store(path, base64.b64decode(body['content']))
+            return self._respond(request, 201 if current is None else 200, {'content': self._entry(path, stored)})
+
+        return self._respond(request, 405, {'message': 'Method not allowed'})
+
+    def close(self):
+        pass
+
+    def _store(self, path, content):
+        # Git blob SHA, like the real API
+        sha = hashlib.sha1(b'blob %d\0' % len(content) + content).hexdigest()
+        self.files[path] = {'content': content, 'sha': sha}
+        return self.files[path]
+
+    def _entry(self, path, stored):
+        return {
+            'path': path,
+            'sha': stored['sha'],
+            'encoding': 'base64',
+            'content': base64.b64encode(stored['content']).decode('ascii')
+        }
+
+    def _respond(self, request, status, body, headers=None):
+        self.calls.append((request.method, status))
+        response = Response()
+        response.status_code = status
+        response.request = request
+        response.url = request.url
+        response._content = json.dumps(body).encode('utf-8') if body is not None else b''
+        response.headers = CaseInsensitiveDict({
+            'Content-Type': 'application/json; charset=utf-8',
+            'X-RateLimit-Limit': str(self.limit),
+            'X-RateLimit-Remaining': str(max(self.remaining, 0)),
+            'X-RateLimit-Reset': str(int(self.reset_at)),
+            **(headers or {})
+        })
+        return response
+
+class FakeClock:
+    """Stands in for the time module, so rate-limit waits pass instantly"""
+
+    def __init__(self):
+        self.now = 1700000000.0
+        self.sleeps = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+JOBS = [{'id': 1, 'title': 'Engineer'}, {'id': 2, 'title': 'Clerk'}]
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(github_service, 'time', clock)
+    return clock
+
+@pytest.fixture
+def stub(clock):
+    return FakeGitHubContents(clock)
+
+@pytest.fixture
+def service(stub):
+    service = GitHubService()
+    service.token, service.repo_owner, service.repo_name = 'offline', 'example', 'jobs-site'
+    service.session.mount(service.base_url, stub)
+    return service
+
+def stored_jobs(stub, service):
+    return json.loads(stub.files[service.file_path]['content'])
+
+def test_unchanged_publish_and_repeat_read_reuse_what_is_known(service, stub):
+    assert service.publish_jobs(JOBS)
+    assert stub.calls == [('GET', 404), ('PUT', 201)]
+
+    stub.calls.clear()
+    assert service.publish_jobs(JOBS)
+    assert stub.calls == []
+
+    assert service.get_file_content() == JOBS
+    remaining = stub.remaining
+    assert service.get_file_content() == JOBS
+    assert stub.calls == [('GET', 200), ('GET', 304)]
+    assert stub.remaining == remaining
+
+def test_conflict_rereads_the_sha_and_retries(service, stub):
+    assert service.publish_jobs(JOBS)
+    stub.commit_externally(service.file_path, '[]')
+
+    stub.calls.clear()
+    assert service.publish_jobs(JOBS[:1])
+    assert stub.calls == [('PUT', 409), ('GET', 200), ('PUT', 200)]
+    assert stored_jobs(stub, service) == JOBS[:1]
+
+def test_rate_limit_is_waited_out(service, stub, clock):
+    assert service.publish_jobs(JOBS)
+    stub.exhaust_rate_limit(reset_in=2)
+
+    stub.calls.clear()
+    assert service.publish_jobs(JOBS[1:])
+    assert stub.calls == [('PUT', 403), ('PUT', 200)]
+    assert len(clock.sleeps) == 1 and 2 <= clock.sleeps[0] <= 4
+    assert stored_jobs(stub, service) == JOBS[1:]
+
+def test_long_rate_limit_gives_up_without_waiting(service, stub, clock):
+    assert service.publish_jobs(JOBS)
+    service.max_rate_limit_wait = 1
+    stub.exhaust_rate_limit(reset_in=30)
+
+    stub.calls.clear()
+    assert not service.publish_jobs(JOBS[1:])
+    assert stub.calls == [('PUT', 403)]
+    # Until the reset, later publishes fail without calling the API
+    assert not service.publish_jobs(JOBS[1:])
+    assert stub.calls == [('PUT', 403)]
+    assert clock.sleeps == []
+    assert stored_jobs(stub, service) == JOBS
@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+
+from app import db
+from conftest import BASELINE_JOBS
+import migrations
+
+def test_baseline_database_upgrades_to_head(app):
+    with app.app_context():
+        with db.engine.connect() as conn:
+            assert migrations.applied_versions(conn) == {version for version, _, _ in migrations.MIGRATIONS}
+
+        schema = inspect(db.engine)
+        for table in db.metadata.sorted_tables:
+            assert {column['name'] for column in schema.get_columns(table.name)} == {column.name for column in table.columns}
+            assert {index['name'] for index in schema.get_indexes(table.name)} == {index.name for index in table.indexes}
+
+        assert migrations.upgrade() == []
+
+def test_baseline_rows_are_converted(app, client):
+    jobs = {job['title']: job for job in client.get('/api/jobs', query_string={'search': 'Baseline'}).get_json()}
+    assert sorted(jobs) == sorted(title for title, *_, active in BASELINE_JOBS if active)
+
+    engineer = jobs['Baseline Engineer']
+    assert (engineer['category'], engineer['job_type'], engineer['experience']) == ('it', 'Full-time', 'Mid Level')
+    assert jobs['Baseline Teacher']['category'] == 'Teaching'
+    assert jobs['Baseline Teacher']['job_type'] == 'Internship'
+    # Backfilled from posted_date rather than the time of the upgrade
+    assert datetime.fromisoformat(engineer['updated_at']) == datetime(2024, 1, 2, 3, 4, 5)
+
+    with app.app_context():
+        row = db.session.execute(text(
+            "SELECT city_id, state_code, salary_min, salary_max FROM job WHERE title = 'Baseline Engineer'"
+        )).one()
+        assert row.city_id is not None and row.state_code == 'KA'
+        assert (row.salary_min, row.salary_max) == (1200000, 1800000)
+        clerk = db.session.execute(text("SELECT salary_min FROM job WHERE title = 'Baseline Clerk'")).scalar()
+        assert clerk == 300000
+
+    for filters, title in [({'category': 'Teaching'}, 'Baseline Teacher'), ({'city': 'Bengaluru'}, 'Baseline Engineer')]:
+        response = client.get('/api/jobs', query_string={'search': 'Baseline', **filters})
+        assert [job['title'] for job in response.get_json()] == [title]
+
+def test_facet_counts_rebuilt_from_baseline_rows(client):
+    facets = client.get('/api/jobs/facets').get_json()
+    assert facets['category']['Teaching'] == 1
+    assert facets['job_type']['Internship'] == 1
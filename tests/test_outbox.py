@@ -0,0 +1,32 @@
+import pytest
+
+from app import db
+from models import OutboxEvent
+from outbox_service import OutboxWorker
+
+def break_session(payload):
+    # A failed flush leaves the session unusable until it is rolled back
+    db.session.add(OutboxEvent(kind=None, payload='{}'))
+    db.session.flush()
+
+@pytest.mark.parametrize('handler', [break_session, lambda payload: False])
+def test_failed_event_is_rescheduled(app, handler):
+    worker = OutboxWorker()
+    worker.register('test.fails', handler)
+
+    with app.app_context():
+        worker.enqueue('test.fails', {'n': 1})
+        db.session.commit()
+        event_id = db.session.query(db.func.max(OutboxEvent.id)).filter_by(kind='test.fails').scalar()
+
+        worker._dispatch(worker._claim(event_id))
+        db.session.remove()
+
+        event = db.session.get(OutboxEvent, event_id)
+        assert event.status == 'pending'
+        assert event.attempts == 1
+        assert event.last_error
+        assert db.session.query(OutboxEvent).filter(OutboxEvent.kind.is_(None)).count() == 0
+
+        db.session.delete(event)
+        db.session.commit()
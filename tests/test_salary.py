@@ -0,0 +1,53 @@
+import pytest
+
+from salary_service import parse_salary
+
+def test_parse_salary():
+    assert parse_salary('₹12,00,000 - ₹18,00,000 per annum') == (1200000, 1800000)
+    assert parse_salary('12-18 LPA') == (1200000, 1800000)
+    assert parse_salary('₹25,000 - ₹35,000 per month') == (300000, 420000)
+    assert parse_salary('Negotiable') is None
+
+def test_parse_salary_skips_pay_levels_and_years():
+    assert parse_salary('Pay Level 7 (₹44,900 - ₹1,42,400)') == (538800, 1708800)
+    assert parse_salary('Level 10 pay matrix ₹56,100') == (673200, 673200)
+    assert parse_salary('2 years exp, 6 LPA') == (600000, 600000)
+    assert parse_salary('3+ yrs, 8 to 10 lakhs') == (800000, 1000000)
+    assert parse_salary('5-7 years') is None
+
+@pytest.fixture(scope='module')
+def salary_jobs(create_job):
+    return {name: create_job(title=f'Salarysort {name}', salary=salary)
+            for name, salary in [('low', '4 LPA'), ('none1', 'Negotiable'), ('high', '20 LPA'),
+                                 ('none2', ''), ('mid', '10 LPA'), ('none3', 'As per norms')]}
+
+def expected(ids, names):
+    return [ids[name] for name in names]
+
+@pytest.mark.parametrize('sort, order', [
+    ('salary', ['high', 'mid', 'low', 'none3', 'none2', 'none1']),
+    ('salary_asc', ['low', 'mid', 'high', 'none1', 'none2', 'none3']),
+])
+def test_salary_sort_lists_jobs_without_salary_last(client, salary_jobs, sort, order):
+    response = client.get('/api/jobs', query_string={'search': 'Salarysort', 'sort': sort, 'fields': 'title'})
+    assert [job['id'] for job in response.get_json()] == expected(salary_jobs, order)
+
+@pytest.mark.parametrize('sort, order', [
+    ('salary', ['high', 'mid', 'low', 'none3', 'none2', 'none1']),
+    ('salary_asc', ['low', 'mid', 'high', 'none1', 'none2', 'none3']),
+])
+@pytest.mark.parametrize('limit', [1, 2, 4])
+def test_salary_sort_pages_through_jobs_without_salary(client, salary_jobs, sort, order, limit):
+    seen, cursor = [], ''
+    while cursor is not None:
+        response = client.get('/api/jobs', query_string={'search': 'Salarysort', 'sort': sort,
+                                                         'limit': limit, 'cursor': cursor})
+        assert response.status_code == 200, response.get_json()
+        page = response.get_json()
+        seen += [job['id'] for job in page['jobs']]
+        cursor = page['next_cursor']
+    assert seen == expected(salary_jobs, order)
+
+def test_salary_filter_leaves_out_jobs_without_salary(client, salary_jobs):
+    response = client.get('/api/jobs', query_string={'search': 'Salarysort', 'min_salary': 500000})
+    assert sorted(job['id'] for job in response.get_json()) == sorted(expected(salary_jobs, ['mid', 'high']))
@@ -0,0 +1,49 @@
+import os
+
+from flask import Flask, session
+
+from session_service import ServerSessionInterface, SQLiteSessionStore
+
+class BrokenStore:
+    def get(self, sid):
+        raise OSError('store unavailable')
+
+    set = touch = delete = get
+
+    def cleanup(self, limit):
+        return 0
+
+def make_app(store):
+    app = Flask(__name__)
+    app.session_interface = ServerSessionInterface('memory')
+    app.session_interface.store = store
+
+    @app.route('/login')
+    def login():
+        session['admin_logged_in'] = True
+        return 'ok'
+
+    @app.route('/logout')
+    def logout():
+        session.clear()
+        return 'ok'
+
+    return app
+
+def test_store_errors_do_not_fail_the_request():
+    client = make_app(BrokenStore()).test_client()
+    response = client.get('/login')
+    assert response.status_code == 200
+    # Nothing was stored, so no cookie is handed out
+    assert 'Set-Cookie' not in response.headers
+
+    client.set_cookie('session', 'stale-id')
+    assert client.get('/logout').status_code == 200
+
+def test_sqlite_store_opens_nothing_until_used(tmp_path):
+    path = tmp_path / 'sessions.db'
+    store = SQLiteSessionStore(str(path))
+    assert not os.path.exists(path)
+
+    store.set('sid', '{}', 2e9)
+    assert store.get('sid') == ('{}', 2e9)